@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark für den JSON-Codec (orjson vs. Standardbibliothek)
+
+Erzeugt synthetische Artikel (Standard: 100.000) und misst für jedes
+verfügbare Backend:
+  - Kodieren eingerückt (JSON-Export) und kompakt (JSONL/Checkpoints)
+  - Dekodieren der ganzen Datei (Deduplicator/Merger, JSON)
+  - Dekodieren Zeile für Zeile (JSONL)
+  - Schreiben und Lesen einer Ergebnisdatei (JSON/JSONL) über
+    Exporter.result_writer() und FileHandler.iter_result_articles()
+    in einem temporären Verzeichnis, inkl. Datei-I/O
+
+Verwendung:
+    python benchmarks/json_codec_benchmark.py
+    python benchmarks/json_codec_benchmark.py --articles 20000 --repeat 5
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, Any, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils.exporter import Exporter
+from src.utils.file_handler import FileHandler
+from src.utils.json_codec import JsonCodec, orjson
+
+
+WORDS = ("patients implant periodontal bone loss study clinical outcome treatment "
+         "group years follow-up significant results analysis survival rate peri-implantitis "
+         "randomized controlled trial compared baseline months mean difference").split()
+
+
+def make_articles(count: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """Erzeugt synthetische Artikel mit realistischen Feldlängen"""
+    rnd = random.Random(seed)
+    articles = []
+    for i in range(count):
+        articles.append({
+            'authors': ', '.join(f"Author{rnd.randint(1, 5000)} {chr(65 + rnd.randint(0, 25))}"
+                                 for _ in range(rnd.randint(1, 6))),
+            'title': ' '.join(rnd.choice(WORDS) for _ in range(rnd.randint(6, 18))).capitalize(),
+            'year': str(rnd.randint(1990, 2026)),
+            'doi': f"10.{rnd.randint(1000, 9999)}/jcp.{i}",
+            'url': f"https://pubmed.ncbi.nlm.nih.gov/{30000000 + i}/",
+            'abstract': ' '.join(rnd.choice(WORDS) for _ in range(rnd.randint(120, 280)))
+        })
+    return articles
+
+
+def best_of(repeat: int, func: Callable[[], Any]) -> float:
+    """Kürzeste Laufzeit aus ``repeat`` Durchläufen in Sekunden"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def write_file(directory: Path, articles: List[Dict[str, Any]], output_format: str) -> Path:
+    """Schreibt die Artikel als Ergebnisdatei über den Exporter"""
+    writer = Exporter.result_writer(directory, "benchmark", {'database': 'benchmark'}, output_format)
+    for article in articles:
+        writer.write(article)
+    return writer.close()
+
+
+def read_file(path: Path, incremental: bool = False) -> int:
+    """Liest eine Ergebnisdatei vollständig (optional JSON inkrementell wie bei großen Dateien)"""
+    threshold = FileHandler.JSON_STREAM_THRESHOLD
+    if incremental:
+        FileHandler.JSON_STREAM_THRESHOLD = -1
+    try:
+        return sum(1 for _ in FileHandler.iter_result_articles(path))
+    finally:
+        FileHandler.JSON_STREAM_THRESHOLD = threshold
+
+
+def run(backend: str, articles: List[Dict[str, Any]], repeat: int) -> Dict[str, float]:
+    """Misst alle Operationen mit dem angegebenen Backend"""
+    JsonCodec.use(backend)
+    document = {'articles': articles, 'metadata': {'total_results': len(articles)}}
+    
+    document_text = JsonCodec.dumps(document)
+    lines = [JsonCodec.dumps(article) for article in articles]
+    
+    results = {
+        'dumps eingerückt (JSON-Export)': best_of(
+            repeat, lambda: [JsonCodec.dumps(article, indent=True) for article in articles]),
+        'dumps kompakt (JSONL/Checkpoint)': best_of(
+            repeat, lambda: [JsonCodec.dumps(article) for article in articles]),
+        'loads Datei (JSON)': best_of(
+            repeat, lambda: JsonCodec.loads(document_text)),
+        'loads zeilenweise (JSONL)': best_of(
+            repeat, lambda: [JsonCodec.loads(line) for line in lines]),
+    }
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        json_path = write_file(directory, articles, 'json')
+        jsonl_path = write_file(directory, articles, 'jsonl')
+        results.update({
+            'Datei schreiben (JSON)': best_of(
+                repeat, lambda: write_file(directory, articles, 'json')),
+            'Datei schreiben (JSONL)': best_of(
+                repeat, lambda: write_file(directory, articles, 'jsonl')),
+            'Datei lesen (JSON)': best_of(
+                repeat, lambda: read_file(json_path)),
+            'Datei lesen (JSON inkrementell)': best_of(
+                repeat, lambda: read_file(json_path, incremental=True)),
+            'Datei lesen (JSONL)': best_of(
+                repeat, lambda: read_file(jsonl_path)),
+        })
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Microbenchmark JSON-Codec (orjson vs. json)")
+    parser.add_argument('--articles', type=int, default=100000, help="Anzahl Artikel (Standard: 100000)")
+    parser.add_argument('--repeat', type=int, default=3, help="Wiederholungen pro Messung (Standard: 3)")
+    args = parser.parse_args()
+    
+    print(f"Erzeuge {args.articles} Artikel...")
+    articles = make_articles(args.articles)
+    JsonCodec.use('json')
+    size_mb = sum(len(JsonCodec.dumps(article).encode('utf-8')) for article in articles) / 1024 / 1024
+    print(f"Datenmenge (kompakt): {size_mb:.1f} MB\n")
+    
+    backends = ['json'] + (['orjson'] if orjson is not None else [])
+    if orjson is None:
+        print("⚠ orjson nicht installiert (pip install orjson) - nur Standardbibliothek gemessen\n")
+    
+    results = {backend: run(backend, articles, args.repeat) for backend in backends}
+    
+    header = f"{'Operation':<36}" + ''.join(f"{backend:>10}" for backend in backends)
+    if len(backends) > 1:
+        header += f"{'Faktor':>10}"
+    print(header)
+    print("-" * len(header))
+    for operation in results['json']:
+        row = f"{operation:<36}" + ''.join(f"{results[backend][operation]:>9.2f}s" for backend in backends)
+        if len(backends) > 1:
+            row += f"{results['json'][operation] / results['orjson'][operation]:>9.1f}x"
+        print(row)
+    
+    JsonCodec.use('auto')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -11,6 +11,8 @@ Usage:
 Options:
     --help              Zeigt diese Hilfe an
     --log-mode MODE     Logging-Modus: none, simple, detailed (Standard: simple)
+    --key-fields-only   Nur Schlüsselfelder laden (für sehr große Ergebnisdateien)
+    --fuzzy             Zusätzlich unscharfe Duplikate suchen (MinHash/LSH)
 """
 
 import sys
@@ -73,6 +75,20 @@ OPTIONEN:
                     mit (Autor, Titel (40 Zeichen), Jahr)
         
         Standard: simple
+    
+    --key-fields-only
+        Lädt nur Autoren, Titel, Jahr, DOI und URL. Abstracts werden nur
+        für Artikel mit Jahr-Konflikt, vollständige Datensätze erst beim
+        Export nachgeladen. Für Ergebnisdateien, die größer als der
+        Arbeitsspeicher sind (Standard: DEDUP_KEY_FIELDS_ONLY in .env).
+    
+    --fuzzy
+        Sucht nach der exakten Deduplizierung zusätzlich unscharfe
+        Duplikate: Titel, die sich nur in Satzzeichen, griechischen
+        Buchstaben (α/alpha) oder einem Untertitel unterscheiden.
+        Kandidaten werden per MinHash/LSH über Titel und Abstract gefunden
+        und über die Text-Ähnlichkeit bestätigt (Standard: DEDUP_FUZZY,
+        Parameter DEDUP_LSH_BANDS, DEDUP_LSH_ROWS, DEDUP_FUZZY_THRESHOLD).
 
 BEISPIELE:
     # Interaktive Verwendung mit einfachem Logging (Standard)
@@ -83,6 +99,12 @@ BEISPIELE:
     
     # Mit detailliertem Logging (inkl. Duplikate-Liste)
     python dedup.py --log-mode detailed
+    
+    # Sehr große Ergebnisdateien (z.B. unbegrenzter OpenAlex-Export)
+    python dedup.py --key-fields-only
+    
+    # Auch unscharfe Duplikate entfernen
+    python dedup.py --fuzzy
 
 ARBEITSWEISE:
     1. Auswahl der zu durchsuchenden Datenbanken (interaktiv)
@@ -238,6 +260,20 @@ def parse_arguments():
         help='Logging-Modus (none/simple/detailed, Standard: simple)'
     )
     
+    parser.add_argument(
+        '--key-fields-only',
+        action='store_true',
+        default=Settings.DEDUP_KEY_FIELDS_ONLY,
+        help='Nur Schlüsselfelder laden, Abstracts bei Bedarf nachladen (für sehr große Dateien)'
+    )
+    
+    parser.add_argument(
+        '--fuzzy',
+        action='store_true',
+        default=Settings.DEDUP_FUZZY,
+        help='Zusätzlich unscharfe Duplikate suchen (MinHash/LSH über Titel und Abstract)'
+    )
+    
     return parser.parse_args()
 
 
@@ -295,7 +331,7 @@ def main():
     
     # Schritt 2: Artikel laden
     print("Lade Artikel...")
-    all_articles = deduplicator.load_articles(json_files)
+    all_articles = deduplicator.load_articles(json_files, key_fields_only=args.key_fields_only)
     
     if not all_articles:
         print()
@@ -310,7 +346,7 @@ def main():
     
     # Schritt 3: Deduplizierung
     print("Deduplizierung läuft...")
-    unique_articles = deduplicator.deduplicate(all_articles)
+    unique_articles = deduplicator.deduplicate(all_articles, fuzzy=args.fuzzy)
     
     stats = deduplicator.get_stats()
     print(f"Duplikate entfernt: {stats['duplicates_removed']}")
@@ -7,8 +7,11 @@ vorformatierten Query-Strings aus Textdateien.
 
 Usage:
     python research.py
+    python research.py --resume    # Abgebrochene Suche ab Checkpoint fortsetzen
+    python research.py --update    # Nur neue/geänderte Artikel seit dem letzten Lauf
 """
 
+import argparse
 import sys
 from pathlib import Path
 
@@ -30,9 +33,29 @@ from src.utils.ui_helpers import (
 )
 
 
+def parse_arguments():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Medical Database Research Tool')
+    
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Abgebrochene Suche ab dem Checkpoint in output/<db>/ fortsetzen'
+    )
+    parser.add_argument(
+        '--update',
+        action='store_true',
+        help='Nur seit dem letzten Lauf neue/geänderte Artikel abrufen und mit dem vorherigen Export zusammenführen'
+    )
+    
+    return parser.parse_args()
+
+
 def main():
     """Hauptfunktion des Research Tools"""
     
+    args = parse_arguments()
+    
     # Header
     print_banner("MEDICAL DATABASE RESEARCH TOOL")
     print_section_header("Unterstützte Datenbanken:")
@@ -52,17 +75,20 @@ def main():
     logger = setup_logger()
     
     # Dateinamen vom Benutzer abfragen
-    filename = get_user_input("Geben Sie den Dateinamen ein (z.B. pubmed oder pubmed.txt): ")
+    filename = get_user_input("Geben Sie den Dateinamen ein (z.B. pubmed oder pubmed.txt, mehrere mit Komma): ")
     
     if not filename:
         print("Fehler: Kein Dateiname angegeben.")
         sys.exit(1)
     
+    # Mehrere Dateien werden gemeinsam (parallel) abgefragt
+    filenames = [name.strip() for name in filename.split(',') if name.strip()]
+    
     # Query Handler initialisieren
-    handler = QueryHandler(logger)
+    handler = QueryHandler(logger, resume=args.resume, update=args.update)
     
     # Query verarbeiten
-    success = handler.process_query_file(filename)
+    success = handler.process_query_files(filenames)
     
     if success:
         print_success_banner("SUCHE ERFOLGREICH ABGESCHLOSSEN")
@@ -74,6 +100,12 @@ def main():
 if __name__ == "__main__":
     try:
         main()
+    except KeyboardInterrupt:
+        if Settings.HARVEST_CHECKPOINTS:
+            print("\n\nAbgebrochen. Fortschritt ist gespeichert - mit 'python research.py --resume' fortsetzen.")
+        else:
+            print("\n\nAbgebrochen.")
+        sys.exit(130)
     except Exception as e:
         print(f"\nFehler: {e}")
         sys.exit(1)
@@ -1,6 +1,7 @@
 """Konfigurationseinstellungen für das Research Tool"""
 
 import os
+import tempfile
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -27,6 +28,77 @@ class Settings:
     BATCH_SIZE = 500
     MAX_RESULTS = 10000
     
+    # Deduplizierung: Ergebnisdateien parallel parsen (0 = Anzahl CPU-Kerne, 1 = seriell)
+    DEDUP_LOAD_WORKERS = int(os.getenv("DEDUP_LOAD_WORKERS", "0"))
+    # Nur Schlüsselfelder laden, abstract & Co. bei Bedarf aus den Dateien nachladen (für sehr große Dateien)
+    DEDUP_KEY_FIELDS_ONLY = os.getenv("DEDUP_KEY_FIELDS_ONLY", "0").lower() in ("1", "true", "yes")
+    # Unscharfe Duplikate (Satzzeichen, griechische Buchstaben, Untertitel) per MinHash/LSH suchen
+    DEDUP_FUZZY = os.getenv("DEDUP_FUZZY", "0").lower() in ("1", "true", "yes")
+    # LSH: bands * rows MinHash-Werte pro Artikel, Kandidaten ab Jaccard etwa (1/bands)^(1/rows)
+    DEDUP_LSH_BANDS = int(os.getenv("DEDUP_LSH_BANDS", "16"))
+    DEDUP_LSH_ROWS = int(os.getenv("DEDUP_LSH_ROWS", "4"))
+    # Mindest-Ähnlichkeit (Wort-Jaccard über Titel + Abstract-Anfang) für unscharfe Duplikate
+    DEDUP_FUZZY_THRESHOLD = float(os.getenv("DEDUP_FUZZY_THRESHOLD", "0.8"))
+    
+    # JSON-Ergebnisdateien ab dieser Größe inkrementell lesen statt als ganzes Dokument
+    JSON_STREAM_THRESHOLD_MB = float(os.getenv("JSON_STREAM_THRESHOLD_MB", "256"))
+    
+    # Format der Ergebnisdateien: "json" (ein Dokument), "jsonl" (ein Artikel pro Zeile + .meta.json)
+    # oder "parquet" (spaltenweise, benötigt pyarrow)
+    OUTPUT_FORMAT = os.getenv("OUTPUT_FORMAT", "json").lower()
+    
+    # Komprimierung der Exporte: "" (aus), "gzip" (.gz) oder "zstd" (.zst, benötigt zstandard)
+    # Parquet wird intern mit dem Verfahren komprimiert; Leser erkennen die Endung automatisch
+    OUTPUT_COMPRESSION = os.getenv("OUTPUT_COMPRESSION", "").lower()
+    OUTPUT_COMPRESSION_LEVEL = int(os.getenv("OUTPUT_COMPRESSION_LEVEL", "0"))  # 0 = Standard (gzip 6, zstd 3)
+    
+    # JSON-Codec: "auto" (orjson wenn installiert), "orjson" oder "json" (Standardbibliothek)
+    JSON_BACKEND = os.getenv("JSON_BACKEND", "auto").lower()
+    OUTPUT_JSON_COMPACT = os.getenv("OUTPUT_JSON_COMPACT", "0").lower() in ("1", "true", "yes")  # JSON ohne Einrückung
+    
+    # HTTP-Verbindungen (gemeinsamer Connection-Pool aller Adapter)
+    HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))  # Anzahl Host-Pools
+    HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "4"))  # Verbindungen pro Host
+    HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "10"))  # Sekunden
+    HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "30"))  # Sekunden
+    
+    # Rate Limiting: Token Bucket pro API-Host + Zugangsdaten, geteilt über Threads und Prozesse
+    RATE_LIMIT_DIR = Path(os.getenv("RATE_LIMIT_DIR", str(Path(tempfile.gettempdir()) / "med_db_research_rate_limits")))
+    RATE_LIMIT_BURST = float(os.getenv("RATE_LIMIT_BURST", "1"))  # Requests ohne Wartezeit
+    
+    # Retries pro Seite (Timeouts, Verbindungsfehler, 429/5xx) mit exponentiellem Backoff + Jitter
+    HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "5"))
+    HTTP_BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", "1"))  # Sekunden (1. Retry)
+    HTTP_BACKOFF_MAX = float(os.getenv("HTTP_BACKOFF_MAX", "60"))  # Obergrenze für den Backoff
+    HTTP_RETRY_AFTER_MAX = float(os.getenv("HTTP_RETRY_AFTER_MAX", "300"))  # Längeres Retry-After → kein Retry
+    
+    # HTTP-Response-Cache (gzip auf der Festplatte, LRU-Begrenzung, TTL pro Datenbank)
+    HTTP_CACHE = os.getenv("HTTP_CACHE", "0").lower() in ("1", "true", "yes")
+    HTTP_CACHE_DIR = Path(os.getenv("HTTP_CACHE_DIR", str(PROJECT_ROOT / "cache" / "http")))
+    HTTP_CACHE_MAX_MB = float(os.getenv("HTTP_CACHE_MAX_MB", "1024"))
+    HTTP_CACHE_OFFLINE = os.getenv("HTTP_CACHE_OFFLINE", "0").lower() in ("1", "true", "yes")  # Nur Cache, kein Netzwerk
+    HTTP_CACHE_TTL_HOURS = {  # 0 = Cache für diese Datenbank aus
+        "pubmed": float(os.getenv("HTTP_CACHE_TTL_PUBMED", "24")),
+        "europepmc": float(os.getenv("HTTP_CACHE_TTL_EUROPEPMC", "24")),
+        "openalex": float(os.getenv("HTTP_CACHE_TTL_OPENALEX", "24"))
+    }
+    
+    # Checkpoints für --resume: jede abgerufene Seite wird zusätzlich in
+    # output/<db>/checkpoint_<hash>.jsonl gespeichert (Platzbedarf ≈ Ergebnisgröße)
+    HARVEST_CHECKPOINTS = os.getenv("HARVEST_CHECKPOINTS", "1").lower() in ("1", "true", "yes")
+    
+    # PubMed History Server (esearch usehistory=y → efetch via WebEnv/query_key)
+    PUBMED_USE_HISTORY = os.getenv("PUBMED_USE_HISTORY", "1").lower() in ("1", "true", "yes")
+    PUBMED_HISTORY_BATCH_SIZE = min(int(os.getenv("PUBMED_HISTORY_BATCH_SIZE", "500")), 10000)  # efetch retmax
+    
+    # PubMed: Treffermengen > 10.000 in Publikationsdatum-Zeiträume aufteilen
+    PUBMED_DATE_SLICING = os.getenv("PUBMED_DATE_SLICING", "1").lower() in ("1", "true", "yes")
+    
+    # Europe PMC / OpenAlex: unbegrenzte Suchen in Jahres-Shards mit parallelen Cursor-Ketten
+    CURSOR_SHARDING = os.getenv("CURSOR_SHARDING", "1").lower() in ("1", "true", "yes")
+    CURSOR_SHARD_COUNT = int(os.getenv("CURSOR_SHARD_COUNT", "8"))  # Ziel-Anzahl Shards
+    CURSOR_SHARD_MIN_RESULTS = int(os.getenv("CURSOR_SHARD_MIN_RESULTS", "5000"))  # Ab dieser Trefferzahl
+    
     # Unterstützte Datenbanken
     SUPPORTED_DATABASES = {
         "pubmed": {
@@ -1,20 +1,33 @@
 """Query-Handler - Orchestriert den gesamten Workflow"""
 
+import asyncio
 import logging
-from typing import Optional
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Tuple, Callable, Iterable, Union
 from pathlib import Path
 from src.config.settings import Settings
 from src.utils.file_handler import FileHandler
-from src.utils.exporter import Exporter
+from src.utils.exporter import Exporter, ResultExport
 from src.core.query_splitter import QuerySplitter
 from src.utils.merger import ResultMerger
+from src.utils.checkpoint import HarvestCheckpoint
+from src.utils.delta import DeltaWatermark
 
 
 class QueryHandler:
     """Hauptklasse für Query-Verarbeitung"""
     
-    def __init__(self, logger: logging.Logger):
+    def __init__(self, logger: logging.Logger, resume: bool = False, update: bool = False):
+        """
+        Args:
+            logger: Logger-Instanz
+            resume: Vorhandene Checkpoints fortsetzen statt neu zu beginnen
+            update: Nur seit dem letzten Lauf neue/geänderte Artikel abrufen
+                    und mit dem vorherigen Export zusammenführen
+        """
         self.logger = logger
+        self.resume = resume
+        self.update = update
         self.file_handler = FileHandler()
         self.exporter = Exporter()
     
@@ -28,6 +41,223 @@ class QueryHandler:
         Returns:
             True bei Erfolg, False bei Fehler
         """
+        return self.process_query_files([filename])
+    
+    def process_query_files(self, filenames: List[str]) -> bool:
+        """
+        Verarbeitet mehrere Query-Dateien; alle Suchen laufen gemeinsam
+        auf einer Event-Loop (Datenbanken werden parallel abgefragt)
+        
+        Args:
+            filenames: Namen der Query-Dateien (z.B. ["pubmed", "europepmc"])
+            
+        Returns:
+            True wenn alle Dateien erfolgreich verarbeitet wurden
+        """
+        success = True
+        jobs = []
+        
+        for filename in filenames:
+            prepared = self._prepare_query(filename)
+            if not prepared:
+                success = False
+                continue
+            
+            db_name, query = prepared
+            
+            # Check for AND-logic (only for OpenAlex)
+            if QuerySplitter.has_and_logic(query) and db_name == 'openalex':
+                self.logger.info("AND-Logik erkannt - verwende zweistufigen Workflow (OpenAlex)")
+                print("\n⚡ AND-Logik erkannt - zweistufiger Workflow (OpenAlex)")
+                if self.update:
+                    print("  → --update wird für den zweistufigen Workflow nicht unterstützt - vollständige Suche")
+                success = self._process_and_query(filename, db_name, query) and success
+                continue
+            
+            # Datenbank-Adapter initialisieren
+            adapter = self._get_adapter(db_name)
+            if not adapter:
+                self.logger.error(f"Adapter für {db_name} konnte nicht initialisiert werden")
+                success = False
+                continue
+            
+            watermark = self._open_watermark(db_name, query)
+            search_query = query
+            if watermark:
+                search_query = adapter.delta_query(query, watermark.since)
+                print(f"Δ Update: nur Artikel seit {watermark.since.isoformat()} (letzter Lauf)")
+            
+            # Ohne --update wird jede Seite sofort exportiert, ein Delta wird
+            # gesammelt und anschließend mit dem vorherigen Export zusammengeführt
+            if watermark:
+                sink = []
+            else:
+                sink = self._open_export(db_name, db_name, query)
+                if sink is None:
+                    success = False
+                    continue
+            
+            jobs.append((db_name, query, search_query, adapter,
+                         self._open_checkpoint(db_name, search_query), watermark, sink))
+        
+        if not jobs:
+            return success
+        
+        print("\nStarte Suche...")
+        run_started = datetime.now()
+        outcomes = asyncio.run(self._search_all([
+            (adapter, search_query, checkpoint, sink.extend if watermark else sink.write_all)
+            for _, _, search_query, adapter, checkpoint, watermark, sink in jobs
+        ]))
+        
+        for (db_name, query, _, adapter, checkpoint, watermark, sink), outcome in zip(jobs, outcomes):
+            adapter.log_http_stats()
+            if watermark:
+                exported = self._export_delta(db_name, query, sink, watermark, run_started,
+                                              complete=not adapter.retry_stats['failed_requests'])
+                export_failed = bool(sink) and not exported
+            else:
+                json_file = self._finish_export(db_name, sink, outcome)
+                exported = json_file is not None
+                if exported and not adapter.retry_stats['failed_requests']:
+                    self._save_watermark(db_name, query, run_started, json_file, outcome)
+                export_failed = bool(sink.count) and not exported
+            self._finish_checkpoint(checkpoint, adapter, export_failed=export_failed)
+            success = exported and success
+        
+        return success
+    
+    def _open_watermark(self, db_name: str, query: str) -> Optional[DeltaWatermark]:
+        """
+        Lädt den Watermark des letzten Laufs (nur mit --update)
+        
+        Returns:
+            DeltaWatermark oder None (vollständige Suche)
+        """
+        if not self.update:
+            return None
+        
+        output_path = self.file_handler.ensure_output_directory(db_name)
+        watermark = DeltaWatermark(output_path, db_name, query, self.logger)
+        if watermark.load():
+            return watermark
+        
+        print("Δ Kein vorheriger Lauf für diese Query gefunden - vollständige Suche")
+        return None
+    
+    def _save_watermark(self, db_name: str, query: str, run_started: datetime,
+                        json_file: Path, total_results: int) -> None:
+        """Speichert den Watermark nach einem vollständigen, erfolgreich exportierten Lauf"""
+        output_path = self.file_handler.ensure_output_directory(db_name)
+        watermark = DeltaWatermark(output_path, db_name, query, self.logger)
+        try:
+            watermark.save(run_started, json_file, total_results)
+        except OSError as e:
+            self.logger.warning(f"Watermark konnte nicht gespeichert werden: {e}")
+    
+    def _export_delta(self, db_name: str, query: str, delta: List[Dict[str, Any]],
+                      watermark: DeltaWatermark, run_started: datetime, complete: bool) -> bool:
+        """
+        Führt das Delta mit dem vorherigen Export zusammen und exportiert das Ergebnis
+        
+        Args:
+            db_name: Datenbankname
+            query: Original-Query (ohne Datumseinschränkung)
+            delta: Seit dem letzten Lauf neue/geänderte Artikel
+            watermark: Watermark des letzten Laufs
+            run_started: Startzeitpunkt dieses Laufs
+            complete: Alle Seiten erfolgreich abgerufen (sonst Watermark nicht vorrücken)
+            
+        Returns:
+            True bei Erfolg, False bei Fehler
+        """
+        if not delta:
+            self.logger.info(f"Keine neuen Artikel seit {watermark.since} ({db_name})")
+            print(f"\n✓ Keine neuen Artikel seit dem letzten Lauf ({db_name}) - "
+                  f"vorheriger Export bleibt aktuell: {watermark.json_file.name}")
+            if complete:
+                self._save_watermark(db_name, query, run_started, watermark.json_file,
+                                     watermark.total_results)
+            return True
+        
+        try:
+            previous = watermark.load_previous_articles()
+        except (OSError, ValueError) as e:
+            self.logger.error(f"Vorheriger Export nicht lesbar: {e}")
+            print(f"❌ Vorheriger Export nicht lesbar ({watermark.json_file.name}) - "
+                  f"bitte ohne --update ausführen")
+            return False
+        
+        merged = DeltaWatermark.merge(previous, delta)
+        added = len(merged) - len(previous)
+        self.logger.info(f"Delta ({db_name}): {len(delta)} Artikel, {added} neu, "
+                         f"{len(delta) - added} aktualisiert")
+        print(f"\nΔ {len(delta)} Artikel seit dem letzten Lauf ({db_name}): "
+              f"{added} neu, {len(delta) - added} aktualisiert")
+        
+        json_file = self._export_results(db_name, query, merged)
+        if json_file is None:
+            return False
+        
+        if complete:
+            self._save_watermark(db_name, query, run_started, json_file, len(merged))
+        return True
+    
+    def _open_checkpoint(self, db_name: str, query: str) -> Optional[HarvestCheckpoint]:
+        """
+        Erstellt den Checkpoint einer Suche in output/<db>/
+        
+        Mit --resume wird ein vorhandener Checkpoint geladen, sonst wird
+        neu begonnen (ein alter Checkpoint derselben Query wird verworfen).
+        Mit HARVEST_CHECKPOINTS=0 gibt es keinen Checkpoint (None).
+        """
+        if not Settings.HARVEST_CHECKPOINTS:
+            if self.resume:
+                print(f"  → Checkpoints deaktiviert (HARVEST_CHECKPOINTS=0) - --resume wird ignoriert ({db_name})")
+            return None
+        
+        output_path = self.file_handler.ensure_output_directory(db_name)
+        checkpoint = HarvestCheckpoint(output_path, db_name, query, self.logger)
+        
+        if self.resume and checkpoint.load():
+            restored = sum(stream['articles'] for stream in checkpoint.streams.values())
+            print(f"↻ Checkpoint gefunden ({db_name}): {restored} Artikel bereits abgerufen - setze fort")
+            return checkpoint
+        
+        if checkpoint.exists():
+            self.logger.info(f"Vorhandener Checkpoint ({db_name}) wird verworfen (ohne --resume)")
+        checkpoint.reset()
+        return checkpoint
+    
+    def _finish_checkpoint(self, checkpoint: Optional[HarvestCheckpoint], adapter,
+                           export_failed: bool = False) -> None:
+        """
+        Entfernt den Checkpoint nach abgeschlossener Suche
+        
+        Bleibt bei fehlgeschlagenen Seiten oder Export-Fehlern erhalten,
+        damit --resume nur die fehlenden Seiten nachlädt.
+        """
+        if checkpoint is None:
+            return
+        
+        if not export_failed and not adapter.retry_stats['failed_requests']:
+            checkpoint.clear()
+            return
+        
+        checkpoint.close()
+        print(f"  → Checkpoint behalten ({checkpoint.state_file.name}) - "
+              f"mit 'python research.py --resume' fehlende Seiten nachladen")
+    
+    def _prepare_query(self, filename: str) -> Optional[Tuple[str, str]]:
+        """
+        Liest und validiert Query-Datei
+        
+        Args:
+            filename: Name der Query-Datei
+            
+        Returns:
+            (db_name, query) oder None bei Fehler
+        """
         self.logger.info(f"Starte Verarbeitung von: {filename}")
         
         # 1. Dateinamen normalisieren (stellt sicher dass .txt vorhanden ist)
@@ -38,13 +268,13 @@ class QueryHandler:
         if not db_name:
             self.logger.error(f"Ungültiger Dateiname: {filename}")
             print(f"Fehler: Ungültiger Dateiname")
-            return False
+            return None
         
         if not Settings.is_valid_database(db_name):
             self.logger.error(f"Unbekannte Datenbank: {db_name}")
             print(f"Fehler: Datenbank '{db_name}' wird nicht unterstützt")
             print(f"Unterstützte Datenbanken: {', '.join(Settings.SUPPORTED_DATABASES.keys())}")
-            return False
+            return None
         
         self.logger.info(f"Datenbank erkannt: {db_name}")
         print(f"\nDatenbank: {Settings.SUPPORTED_DATABASES[db_name]['name']}")
@@ -53,48 +283,126 @@ class QueryHandler:
         query = self.file_handler.read_query_file(normalized_filename)
         if not query:
             self.logger.error("Query konnte nicht gelesen werden")
-            return False
+            return None
         
         self.logger.info(f"Query gelesen: {query[:100]}...")
         print(f"Query: {query[:80]}{'...' if len(query) > 80 else ''}")
         
-        # 3. Check for AND-logic (only for OpenAlex)
-        if QuerySplitter.has_and_logic(query) and db_name == 'openalex':
-            self.logger.info("AND-Logik erkannt - verwende zweistufigen Workflow (OpenAlex)")
-            print("\n⚡ AND-Logik erkannt - zweistufiger Workflow (OpenAlex)")
-            return self._process_and_query(filename, db_name, query)
+        return db_name, query
+    
+    @staticmethod
+    async def _search_all(searches: List[Tuple[Any, str, Optional[HarvestCheckpoint],
+                                               Callable[[List[Dict[str, Any]]], Any]]]) -> List[Union[int, Exception]]:
+        """
+        Führt mehrere Suchen gleichzeitig auf einer Event-Loop aus
         
-        # 4. Normale Query-Verarbeitung
-        # Datenbank-Adapter initialisieren und Suche durchführen
-        adapter = self._get_adapter(db_name)
-        if not adapter:
-            self.logger.error(f"Adapter für {db_name} konnte nicht initialisiert werden")
-            return False
+        Jede abgerufene Seite wird sofort an den Verbraucher der Suche
+        übergeben (z.B. ResultExport.write_all) und nicht gesammelt.
         
-        print("\nStarte Suche...")
-        results = adapter.search(query, limit=None)
+        Args:
+            searches: Liste von (adapter, query, checkpoint, consume) Tupeln
+            
+        Returns:
+            Pro Suche die Anzahl übergebener Artikel bzw. der Fehler des
+            Verbrauchers (die übrigen Suchen laufen weiter), in derselben Reihenfolge
+        """
+        async def run(adapter, query: str, checkpoint: Optional[HarvestCheckpoint], consume) -> int:
+            count = 0
+            pages = adapter.async_search_iter(query, limit=None, checkpoint=checkpoint)
+            try:
+                async for page in pages:
+                    consume(page)
+                    count += len(page)
+            finally:
+                await pages.aclose()
+            return count
         
-        if not results:
-            self.logger.warning("Keine Ergebnisse gefunden")
-            print("Keine Ergebnisse gefunden.")
-            return False
+        return await asyncio.gather(*[
+            run(adapter, query, checkpoint, consume)
+            for adapter, query, checkpoint, consume in searches
+        ], return_exceptions=True)
+    
+    def _open_export(self, db_name: str, name: str, query: str) -> Optional[ResultExport]:
+        """
+        Öffnet den Export einer Suche in output/<db>/ (CSV + JSON/JSONL/Parquet)
+        
+        Args:
+            db_name: Datenbankname (Output-Verzeichnis)
+            name: Präfix der Dateinamen
+            query: Query-String für die Metadaten
+            
+        Returns:
+            ResultExport oder None bei Fehler
+        """
+        output_path = self.file_handler.ensure_output_directory(db_name)
+        try:
+            return self.exporter.open_stream(output_path, name, json_query=query)
+        except Exception as e:
+            self.logger.error(f"Export konnte nicht angelegt werden ({db_name}): {e}")
+            print(f"Fehler beim Export: {e}")
+            return None
+    
+    def _finish_export(self, db_name: str, export: ResultExport,
+                       outcome: Union[int, Exception]) -> Optional[Path]:
+        """
+        Schließt einen während der Suche geschriebenen Export ab
+        
+        Args:
+            db_name: Datenbankname
+            export: Export der Suche
+            outcome: Anzahl geschriebener Artikel oder Fehler beim Schreiben
+            
+        Returns:
+            Pfad zur JSON-Datei bei Erfolg, None bei Fehler
+        """
+        if isinstance(outcome, Exception):
+            export.discard()
+            self.logger.error(f"Export fehlgeschlagen ({db_name}): {outcome}")
+            print(f"Fehler beim Export: {outcome}")
+            return None
+        
+        if not outcome:
+            export.discard()
+            self.logger.warning(f"Keine Ergebnisse gefunden ({db_name})")
+            print(f"Keine Ergebnisse gefunden ({db_name}).")
+            return None
+        
+        self.logger.info(f"{outcome} Ergebnisse gefunden ({db_name})")
+        print(f"\n✓ {outcome} Artikel gefunden ({db_name})")
+        
+        try:
+            csv_file, json_file = export.close()
+        except Exception as e:
+            export.discard()
+            self.logger.error(f"Export fehlgeschlagen ({db_name}): {e}")
+            print(f"Fehler beim Export: {e}")
+            return None
         
-        self.logger.info(f"{len(results)} Ergebnisse gefunden")
-        print(f"\n✓ {len(results)} Artikel gefunden")
+        if csv_file and json_file:
+            self.logger.info("Export erfolgreich abgeschlossen")
+            return json_file
+        else:
+            self.logger.error("Export fehlgeschlagen")
+            return None
+    
+    def _export_results(self, db_name: str, query: str, results: Iterable[Dict[str, Any]]) -> Optional[Path]:
+        """
+        Exportiert Suchergebnisse einer Datenbank als CSV und JSON
         
-        # 5. Ergebnisse exportieren
+        Returns:
+            Pfad zur JSON-Datei bei Erfolg, None bei Fehler
+        """
         output_path = self.file_handler.ensure_output_directory(db_name)
         
         print("\nExportiere Ergebnisse...")
-        csv_file = self.exporter.export_to_csv(results, output_path, db_name)
-        json_file = self.exporter.export_to_json(results, output_path, db_name, query)
+        csv_file, json_file = self.exporter.export_stream(results, output_path, db_name, json_query=query)
         
         if csv_file and json_file:
             self.logger.info("Export erfolgreich abgeschlossen")
-            return True
+            return json_file
         else:
             self.logger.error("Export fehlgeschlagen")
-            return False
+            return None
     
     def _process_and_query(self, filename: str, db_name: str, query: str) -> bool:
         """
@@ -143,29 +451,54 @@ class QueryHandler:
         
         output_base = self.file_handler.ensure_output_directory(db_name)
         
-        # Step 1: Query A (unbegrenzt)
+        # Step 1+2: Query A und B (unbegrenzt) gleichzeitig auf einer Event-Loop;
+        # die Seiten beider Gruppen werden beim Eintreffen exportiert
         print(f"\n[1/3] Suche Gruppe A ({term_a_name})...")
-        results_a = adapter.search(group_a, limit=None)
-        if not results_a:
+        print(f"[2/3] Suche Gruppe B ({term_b_name})...")
+        export_a = self._open_export(db_name, term_a_name + "_A", group_a)
+        export_b = self._open_export(db_name, term_b_name + "_B", group_b)
+        if not export_a or not export_b:
+            for export in (export_a, export_b):
+                if export:
+                    export.discard()
+            return False
+        
+        checkpoint_a = self._open_checkpoint(db_name, group_a)
+        checkpoint_b = self._open_checkpoint(db_name, group_b)
+        outcome_a, outcome_b = asyncio.run(self._search_all([
+            (adapter, group_a, checkpoint_a, export_a.write_all),
+            (adapter, group_b, checkpoint_b, export_b.write_all)
+        ]))
+        adapter.log_http_stats()
+        
+        if not outcome_a:
+            export_a.discard()
+            export_b.discard()
+            self._finish_checkpoint(checkpoint_a, adapter)
+            self._finish_checkpoint(checkpoint_b, adapter)
             self.logger.warning("Keine Ergebnisse für Gruppe A")
             print("❌ Keine Ergebnisse für Gruppe A gefunden")
             return False
         
-        print(f"✓ {len(results_a)} Artikel gefunden")
-        file_a_csv = self.exporter.export_to_csv(results_a, output_base, term_a_name + "_A")
-        file_a_json = self.exporter.export_to_json(results_a, output_base, term_a_name + "_A", group_a)
+        if not isinstance(outcome_a, Exception):
+            print(f"✓ Gruppe A: {outcome_a} Artikel gefunden")
+        file_a_json = self._close_group_export(export_a, outcome_a)
+        self._finish_checkpoint(checkpoint_a, adapter, export_failed=not file_a_json)
         
-        # Step 2: Query B (unbegrenzt)
-        print(f"\n[2/3] Suche Gruppe B ({term_b_name})...")
-        results_b = adapter.search(group_b, limit=None)
-        if not results_b:
+        if not outcome_b:
+            export_b.discard()
+            self._finish_checkpoint(checkpoint_b, adapter)
             self.logger.warning("Keine Ergebnisse für Gruppe B")
             print("❌ Keine Ergebnisse für Gruppe B gefunden")
             return False
         
-        print(f"✓ {len(results_b)} Artikel gefunden")
-        file_b_csv = self.exporter.export_to_csv(results_b, output_base, term_b_name + "_B")
-        file_b_json = self.exporter.export_to_json(results_b, output_base, term_b_name + "_B", group_b)
+        if not isinstance(outcome_b, Exception):
+            print(f"✓ Gruppe B: {outcome_b} Artikel gefunden")
+        file_b_json = self._close_group_export(export_b, outcome_b)
+        self._finish_checkpoint(checkpoint_b, adapter, export_failed=not file_b_json)
+        
+        if not (file_a_json and file_b_json):
+            return False
         
         # Step 3: Merge results
         print(f"\n[3/3] Merge mit AND-Logik...")
@@ -195,6 +528,23 @@ class QueryHandler:
             print(f"\n❌ Merge-Fehler: {e}")
             return False
     
+    def _close_group_export(self, export: ResultExport, outcome: Union[int, Exception]) -> Optional[Path]:
+        """
+        Schließt den Export einer Gruppe des AND-Workflows ab
+        
+        Returns:
+            Pfad zur JSON-Datei (Eingabe für den Merge) oder None bei Fehler
+        """
+        try:
+            if isinstance(outcome, Exception):
+                raise outcome
+            return export.close()[1]
+        except Exception as e:
+            export.discard()
+            self.logger.error(f"Export fehlgeschlagen: {e}")
+            print(f"Fehler beim Export: {e}")
+            return None
+    
     def _get_adapter(self, db_name: str):
         """
         Initialisiert passenden Datenbank-Adapter
@@ -1,28 +1,282 @@
 """Basis-Adapter-Klasse für Datenbank-Adapter"""
 
+import asyncio
 import logging
+import random
+import time
+from datetime import date
+from email.utils import parsedate_to_datetime
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from collections import deque
+from typing import (List, Dict, Any, Optional, Callable, Iterable, Iterator, AsyncIterator,
+                    TypeVar, Tuple, Awaitable)
+from urllib.parse import urlparse
+
+import requests
+
+from src.config.settings import Settings
+from src.databases.http_cache import CacheMissError, get_shared_cache
+from src.databases.http_session import get_shared_session
+from src.databases.rate_limiter import TokenBucketLimiter, get_rate_limiter
+from src.utils.checkpoint import HarvestCheckpoint
+from src.utils.json_codec import JsonCodec
+
+T = TypeVar('T')
+
+
+class ResponseParseError(requests.RequestException):
+    """Response-Body ist abgeschnitten oder fehlerhaft (wird wie ein Netzwerkfehler wiederholt)"""
 
 
 class BaseAdapter(ABC):
     """Abstrakte Basisklasse für alle Datenbank-Adapter"""
     
+    BASE_URL = ""
+    
+    # Schlüssel in Settings.SUPPORTED_DATABASES (u.a. für die Cache-TTL)
+    DATABASE = ""
+    
+    # Maximale Anzahl gleichzeitiger Verbindungen zum API-Host
+    POOL_MAXSIZE = Settings.HTTP_POOL_MAXSIZE
+    
+    # Maximale Anzahl gleichzeitig laufender Requests (async_search)
+    MAX_CONCURRENCY = 1
+    
+    # Chunk-Größe beim Streamen von Response-Bodies (Bytes)
+    STREAM_CHUNK_SIZE = 64 * 1024
+    
+    # HTTP-Status, bei denen ein Request wiederholt wird
+    RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+    
     def __init__(self, logger: logging.Logger):
         self.logger = logger
+        
+        # Mindestabstand zwischen Request-Starts (von Subklassen gesetzt)
+        self.rate_limit_delay = 0.0
+        
+        # Gemeinsame Session mit Keep-Alive und Connection-Pool pro Host
+        self.http = get_shared_session()
+        if self.BASE_URL:
+            self.http.configure_host(self.BASE_URL, max(self.POOL_MAXSIZE, self.MAX_CONCURRENCY))
+        
+        # Semaphore wird pro Event-Loop angelegt
+        self._async_loop = None
+        self._async_semaphore = None
+        
+        # Retry-Statistik dieses Laufs (siehe log_http_stats)
+        self.retry_stats = {'retries': 0, 'backoff_seconds': 0.0, 'failed_requests': 0}
+        
+        # Gemeinsamer Response-Cache auf der Festplatte (None = deaktiviert)
+        self.cache = get_shared_cache()
+        self.cache_stats = {'hits': 0, 'misses': 0, 'bytes_saved': 0}
     
-    @abstractmethod
-    def search(self, query: str, limit: int = 500) -> List[Dict[str, Any]]:
+    def search(self, query: str, limit: int = 500,
+               checkpoint: Optional[HarvestCheckpoint] = None) -> List[Dict[str, Any]]:
         """
-        Führt Suche in der Datenbank durch
+        Führt Suche in der Datenbank durch (sammelt search_iter)
+        
+        Darf nicht aus einer laufenden Event-Loop aufgerufen werden -
+        dort direkt ``await adapter.async_search(...)`` verwenden.
         
         Args:
             query: Query-String
             limit: Maximale Anzahl Ergebnisse
+            checkpoint: Optionaler Checkpoint zum Speichern/Fortsetzen des Fortschritts
             
         Returns:
             Liste von Artikel-Dictionaries
         """
+        return list(self.search_iter(query, limit, checkpoint))
+    
+    def search_iter(self, query: str, limit: int = 500,
+                    checkpoint: Optional[HarvestCheckpoint] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Liefert standardisierte Artikel, sobald ihre Seite abgerufen ist
+        
+        Die Suche läuft auf einer eigenen Event-Loop, die nur weiterläuft,
+        während der Aufrufer den nächsten Artikel anfordert. Parallele
+        Requests laufen damit höchstens eine Seite pro Stream voraus, und
+        der Speicherbedarf hängt nicht von der Ergebnisgröße ab. Bricht der
+        Aufrufer die Iteration ab, werden laufende Requests abgebrochen.
+        
+        Args:
+            query: Query-String
+            limit: Maximale Anzahl Ergebnisse
+            checkpoint: Optionaler Checkpoint zum Speichern/Fortsetzen des Fortschritts
+            
+        Yields:
+            Artikel-Dictionaries
+        """
+        loop = asyncio.new_event_loop()
+        pages = self.async_search_iter(query, limit, checkpoint)
+        try:
+            while True:
+                try:
+                    page = loop.run_until_complete(pages.__anext__())
+                except StopAsyncIteration:
+                    break
+                yield from page
+        finally:
+            loop.run_until_complete(pages.aclose())
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+    
+    async def async_search(self, query: str, limit: int = 500,
+                           checkpoint: Optional[HarvestCheckpoint] = None) -> List[Dict[str, Any]]:
+        """
+        Führt Suche in der Datenbank asynchron durch (sammelt async_search_iter)
+        
+        Args:
+            query: Query-String
+            limit: Maximale Anzahl Ergebnisse
+            checkpoint: Optionaler Checkpoint - bereits abgerufene Seiten werden
+                        übernommen, neue Seiten nach dem Abruf gespeichert
+            
+        Returns:
+            Liste von Artikel-Dictionaries
+        """
+        articles = []
+        async for page in self.async_search_iter(query, limit, checkpoint):
+            articles.extend(page)
+        return articles
+    
+    async def async_search_iter(self, query: str, limit: int = 500,
+                                checkpoint: Optional[HarvestCheckpoint] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Liefert die Ergebnisse seitenweise (asynchron)
+        
+        Begrenzt die Seiten von _iter_pages auf ``limit``. Schlägt die
+        Suche fehl, bleiben bereits gelieferte Seiten gültig.
+        
+        Yields:
+            Listen standardisierter Artikel (eine pro abgerufener Seite)
+        """
+        name = Settings.SUPPORTED_DATABASES.get(self.DATABASE, {}).get('name', self.DATABASE)
+        count = 0
+        pages = self._iter_pages(query, limit, checkpoint)
+        
+        try:
+            async for page in pages:
+                if limit is not None:
+                    page = page[:limit - count]
+                if page:
+                    count += len(page)
+                    yield page
+                if limit is not None and count >= limit:
+                    break
+        except Exception as e:
+            self.logger.error(f"{name}-Suche fehlgeschlagen: {e}")
+        finally:
+            await pages.aclose()
+        
+        if count:
+            self.logger.info(f"{count} Artikel von {name} abgerufen")
+        else:
+            self.logger.warning(f"Keine {name} Artikel gefunden")
+    
+    @abstractmethod
+    def _iter_pages(self, query: str, limit: Optional[int],
+                    checkpoint: Optional[HarvestCheckpoint] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Ruft die Suche ab und liefert die Artikel seitenweise (async Generator)
+        
+        Args:
+            query: Query-String
+            limit: Maximale Anzahl Ergebnisse (None = alle)
+            checkpoint: Optionaler Checkpoint - bereits abgerufene Seiten werden
+                        zuerst geliefert, neue Seiten nach dem Abruf gespeichert
+            
+        Yields:
+            Listen standardisierter Artikel
+        """
+        pass
+    
+    async def _ordered_pages(self, fetches: Iterable[Awaitable[List[Dict[str, Any]]]],
+                             window: Optional[int] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Führt Seitenabrufe parallel aus und liefert sie in Aufrufreihenfolge
+        
+        Es laufen höchstens ``window`` Abrufe voraus (Standard: doppelte
+        MAX_CONCURRENCY), damit fertige, noch nicht gelieferte Seiten den
+        Speicher nicht füllen.
+        
+        Args:
+            fetches: Iterable von Awaitables (wird erst bei Bedarf weiter gelesen)
+            window: Maximale Anzahl gleichzeitig gestarteter Abrufe
+        """
+        window = window or 2 * self.MAX_CONCURRENCY
+        fetches = iter(fetches)
+        pending = deque()
+        
+        try:
+            for fetch in fetches:
+                pending.append(asyncio.ensure_future(fetch))
+                if len(pending) >= window:
+                    yield await pending.popleft()
+            while pending:
+                yield await pending.popleft()
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            for fetch in fetches:
+                # Nicht gestartete Coroutinen schließen (keine "never awaited"-Warnung)
+                if asyncio.iscoroutine(fetch):
+                    fetch.close()
+    
+    async def _merge_page_streams(self, streams: List[AsyncIterator[List[Dict[str, Any]]]]
+                                  ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Liefert Seiten mehrerer paralleler Streams (z.B. Shards) in Eintreffreihenfolge
+        
+        Jeder Stream läuft als eigene Task und wartet, bis seine Seite
+        abgenommen wurde - pro Stream wird höchstens eine Seite gepuffert.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+        
+        async def pump(stream):
+            try:
+                async for page in stream:
+                    taken = asyncio.Event()
+                    queue.put_nowait((page, taken))
+                    await taken.wait()
+            finally:
+                await stream.aclose()
+                queue.put_nowait((done, None))
+        
+        tasks = [asyncio.create_task(pump(stream)) for stream in streams]
+        remaining = len(tasks)
+        
+        try:
+            while remaining:
+                page, taken = await queue.get()
+                if page is done:
+                    remaining -= 1
+                    continue
+                yield page
+                taken.set()
+            # Fehler einzelner Streams weitergeben
+            for task in tasks:
+                task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    @abstractmethod
+    def delta_query(self, query: str, since: date) -> str:
+        """
+        Schränkt eine Query auf Datensätze ein, die seit ``since`` neu
+        hinzugekommen oder aktualisiert worden sind (Delta-Harvesting)
+        
+        Args:
+            query: Query-String
+            since: Datum des letzten Laufs (inklusive)
+            
+        Returns:
+            Eingeschränkter Query-String
+        """
         pass
     
     @abstractmethod
@@ -38,6 +292,413 @@ class BaseAdapter(ABC):
         """
         pass
     
+    def _get(self, url: str, params: Optional[Dict[str, Any]] = None,
+             headers: Optional[Dict[str, str]] = None,
+             read_timeout: Optional[float] = None) -> requests.Response:
+        """
+        GET-Request über die gemeinsame Session (wirft HTTPError bei 4xx/5xx)
+        
+        Args:
+            url: Ziel-URL
+            params: Query-Parameter
+            headers: Zusätzliche Header
+            read_timeout: Abweichender Read-Timeout (None = Standard)
+            
+        Returns:
+            requests.Response
+        """
+        response = self.http.get(url, params=params, headers=headers,
+                                 read_timeout=read_timeout)
+        response.raise_for_status()
+        return response
+    
+    def _get_streamed(self, url: str, consume: Callable[[Iterator[bytes]], T],
+                      params: Optional[Dict[str, Any]] = None,
+                      headers: Optional[Dict[str, str]] = None,
+                      read_timeout: Optional[float] = None) -> T:
+        """
+        GET-Request mit gestreamtem Body
+        
+        Der Body wird nicht vollständig im Speicher gehalten, sondern
+        chunkweise an ``consume`` übergeben - die Verarbeitung überlappt
+        mit dem Download.
+        
+        Args:
+            url: Ziel-URL
+            consume: Funktion, die den Chunk-Iterator verarbeitet
+            params: Query-Parameter
+            headers: Zusätzliche Header
+            read_timeout: Abweichender Read-Timeout (None = Standard)
+            
+        Returns:
+            Rückgabewert von ``consume``
+        """
+        with self.http.get(url, params=params, headers=headers,
+                           read_timeout=read_timeout, stream=True) as response:
+            response.raise_for_status()
+            return consume(response.iter_content(chunk_size=self.STREAM_CHUNK_SIZE))
+    
+    async def _aget(self, url: str, params: Optional[Dict[str, Any]] = None,
+                    headers: Optional[Dict[str, str]] = None,
+                    read_timeout: Optional[float] = None,
+                    cache_params: Optional[Dict[str, Any]] = None,
+                    volatile: bool = False) -> requests.Response:
+        """
+        Asynchroner GET-Request mit Cache, Rate Limiting, Concurrency-Limit und Retries
+        
+        Der blockierende Request läuft in einem Worker-Thread auf der
+        gemeinsamen Session, die Event-Loop bleibt frei für weitere Requests.
+        Cache-Treffer belasten weder Rate Limit noch Netzwerk.
+        
+        Args:
+            cache_params: Parameter für den Cache-Schlüssel (None = params)
+            volatile: Antwort enthält serverseitigen Zustand (z.B. WebEnv) -
+                      wird gespeichert, aber nur im Offline-Modus gelesen
+        """
+        key = self._cache_key(url, params if cache_params is None else cache_params)
+        
+        if key:
+            ttl = self._cache_ttl(volatile)
+            body = await asyncio.to_thread(self.cache.read, key, ttl) if ttl != 0 else None
+            if body is not None:
+                self._count_cache_hit(len(body))
+                return self._cached_response(url, body)
+            self._count_cache_miss(url)
+        
+        response = await self._with_retries(url, self._get, url, params, headers, read_timeout)
+        
+        if key:
+            # Alle Endpoints liefern JSON - defekte Bodies nicht in den Cache übernehmen
+            try:
+                JsonCodec.loads(response.content)
+            except ValueError:
+                self.logger.warning(f"Antwort nicht parsebar - wird nicht gecacht: {url}")
+            else:
+                await asyncio.to_thread(self.cache.write, key, response.content)
+        
+        return response
+    
+    async def _aget_streamed(self, url: str, consume: Callable[[Iterator[bytes]], T],
+                             params: Optional[Dict[str, Any]] = None,
+                             headers: Optional[Dict[str, str]] = None,
+                             read_timeout: Optional[float] = None,
+                             cache_params: Optional[Dict[str, Any]] = None) -> T:
+        """
+        Asynchrone Variante von _get_streamed (Verarbeitung im Worker-Thread)
+        
+        Bei einem Cache-Treffer wird ``consume`` mit den Chunks aus dem Cache
+        aufgerufen; sonst wird der Body beim Verarbeiten komprimiert in den
+        Cache geschrieben.
+        """
+        key = self._cache_key(url, params if cache_params is None else cache_params)
+        
+        if not key:
+            return await self._with_retries(url, self._get_streamed, url, consume,
+                                            params, headers, read_timeout)
+        
+        ttl = self._cache_ttl()
+        if ttl != 0:
+            try:
+                hit, result, size = await asyncio.to_thread(self._consume_cached, key, ttl, consume)
+            except ResponseParseError as e:
+                # Defekter Cache-Eintrag: verwerfen und neu laden
+                self.logger.warning(f"Cache-Eintrag nicht lesbar ({e}) - wird neu geladen: {url}")
+                hit = False
+            if hit:
+                self._count_cache_hit(size)
+                return result
+        self._count_cache_miss(url)
+        
+        def consume_and_store(chunks: Iterator[bytes]) -> T:
+            with self.cache.writer(key) as write:
+                def tee():
+                    for chunk in chunks:
+                        write(chunk)
+                        yield chunk
+                
+                stream = tee()
+                result = consume(stream)
+                # Rest des Bodies übernehmen, falls consume vorzeitig endet
+                for _ in stream:
+                    pass
+                return result
+        
+        return await self._with_retries(url, self._get_streamed, url, consume_and_store,
+                                        params, headers, read_timeout)
+    
+    def _cache_key(self, url: str, params: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Cache-Schlüssel des Requests (None = Cache für diesen Adapter aus)"""
+        if self.cache is None or self._cache_ttl() == 0:
+            return None
+        return self.cache.make_key(url, params)
+    
+    def _cache_ttl(self, volatile: bool = False) -> Optional[float]:
+        """
+        Maximales Alter eines Cache-Eintrags in Sekunden
+        
+        Returns:
+            None = beliebig alt (Offline-Modus), 0 = Cache nicht lesen
+        """
+        if Settings.HTTP_CACHE_OFFLINE:
+            return None
+        if volatile:
+            return 0
+        return Settings.HTTP_CACHE_TTL_HOURS.get(self.DATABASE, 0) * 3600
+    
+    def _consume_cached(self, key: str, ttl: Optional[float],
+                        consume: Callable[[Iterator[bytes]], T]) -> Tuple[bool, Optional[T], int]:
+        """
+        Verarbeitet einen Cache-Eintrag chunkweise (läuft im Worker-Thread)
+        
+        Returns:
+            (Treffer, Rückgabewert von consume, unkomprimierte Größe)
+        """
+        with self.cache.open_chunks(key, ttl) as chunks:
+            if chunks is None:
+                return False, None, 0
+            
+            size = 0
+            def counted():
+                nonlocal size
+                for chunk in chunks:
+                    size += len(chunk)
+                    yield chunk
+            
+            result = consume(counted())
+        
+        return True, result, size
+    
+    def _count_cache_hit(self, size: int) -> None:
+        self.cache_stats['hits'] += 1
+        self.cache_stats['bytes_saved'] += size
+    
+    def _count_cache_miss(self, url: str) -> None:
+        """Zählt einen Cache-Fehlzugriff; im Offline-Modus ist das ein Fehler"""
+        self.cache_stats['misses'] += 1
+        if Settings.HTTP_CACHE_OFFLINE:
+            self.retry_stats['failed_requests'] += 1
+            raise CacheMissError(f"Offline-Modus: nicht im Cache: {url}")
+    
+    @staticmethod
+    def _cached_response(url: str, body: bytes) -> requests.Response:
+        """Baut eine requests.Response aus einem Cache-Eintrag"""
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.encoding = 'utf-8'
+        response._content = body
+        response.headers['X-Cache'] = 'HIT'
+        return response
+    
+    async def _with_retries(self, url: str, request: Callable[..., T], *args) -> T:
+        """
+        Führt einen Request mit exponentiellem Backoff und Jitter aus
+        
+        Wiederholt werden Timeouts, Verbindungsfehler und die Status-Codes
+        aus RETRY_STATUS_CODES. Ein ``Retry-After``-Header wird vollständig
+        eingehalten und pausiert den gemeinsamen Rate Limiter, damit
+        parallele Requests an dieselbe API ebenfalls warten; verlangt er
+        mehr als HTTP_RETRY_AFTER_MAX Sekunden, scheitert der Request sofort
+        (ein früherer Retry würde nur erneut abgewiesen).
+        
+        Raises:
+            requests.RequestException: wenn alle Versuche fehlschlagen
+        """
+        for attempt in range(Settings.HTTP_MAX_RETRIES + 1):
+            try:
+                async with self._async_semaphore_for_loop():
+                    await self.rate_limiter.wait()
+                    return await asyncio.to_thread(request, *args)
+            
+            except requests.RequestException as e:
+                if attempt == Settings.HTTP_MAX_RETRIES or not self._is_retryable(e):
+                    self.retry_stats['failed_requests'] += 1
+                    raise
+                
+                retry_after = self._retry_after(e)
+                if retry_after is not None and retry_after > Settings.HTTP_RETRY_AFTER_MAX:
+                    self.logger.warning(f"Retry-After {retry_after:.0f}s überschreitet "
+                                        f"HTTP_RETRY_AFTER_MAX ({Settings.HTTP_RETRY_AFTER_MAX:.0f}s), "
+                                        f"kein Retry: {url}")
+                    self.retry_stats['failed_requests'] += 1
+                    raise
+                
+                if retry_after is not None:
+                    delay = retry_after
+                else:
+                    # Full Jitter: zufällig zwischen 0 und exponentieller Obergrenze
+                    delay = random.uniform(0, min(Settings.HTTP_BACKOFF_MAX,
+                                                  Settings.HTTP_BACKOFF_BASE * 2 ** attempt))
+                
+                self.retry_stats['retries'] += 1
+                self.retry_stats['backoff_seconds'] += delay
+                self.logger.warning(f"Request fehlgeschlagen ({self._describe_error(e)}), "
+                                    f"Versuch {attempt + 2}/{Settings.HTTP_MAX_RETRIES + 1} "
+                                    f"in {delay:.1f}s: {url}")
+                
+                if retry_after is not None and self.rate_limiter.rate > 0:
+                    # Wartezeit läuft über den Rate Limiter (gilt für alle Requests an den Host)
+                    self.rate_limiter.pause(delay)
+                else:
+                    await asyncio.sleep(delay)
+    
+    def _is_retryable(self, error: requests.RequestException) -> bool:
+        """Prüft, ob ein fehlgeschlagener Request wiederholt werden soll"""
+        if isinstance(error, requests.HTTPError):
+            return error.response is not None and error.response.status_code in self.RETRY_STATUS_CODES
+        return isinstance(error, (requests.ConnectionError, requests.Timeout,
+                                  requests.exceptions.ChunkedEncodingError, ResponseParseError))
+    
+    @staticmethod
+    def _retry_after(error: requests.RequestException) -> Optional[float]:
+        """Liest den Retry-After-Header (Sekunden oder HTTP-Datum) einer Fehler-Antwort"""
+        response = getattr(error, 'response', None)
+        if response is None:
+            return None
+        
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+        
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+    
+    @staticmethod
+    def _describe_error(error: requests.RequestException) -> str:
+        """Kurzbeschreibung eines Request-Fehlers für Log-Meldungen"""
+        response = getattr(error, 'response', None)
+        if response is not None:
+            return f"HTTP {response.status_code}"
+        return type(error).__name__
+    
+    def _async_semaphore_for_loop(self) -> asyncio.Semaphore:
+        """Gibt die Concurrency-Semaphore für die aktuelle Event-Loop zurück"""
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            self._async_loop = loop
+            self._async_semaphore = asyncio.Semaphore(self.MAX_CONCURRENCY)
+        return self._async_semaphore
+    
+    @property
+    def rate_limiter(self) -> TokenBucketLimiter:
+        """
+        Token Bucket für API-Host + Zugangsdaten dieses Adapters
+        
+        Wird bei jedem Zugriff über die Registry aufgelöst, damit
+        ``rate_limit_delay`` und Zugangsdaten aus dem Subklassen-__init__
+        berücksichtigt werden.
+        """
+        rate = 1.0 / self.rate_limit_delay if self.rate_limit_delay > 0 else 0.0
+        return get_rate_limiter(urlparse(self.BASE_URL).netloc,
+                                self._rate_limit_credential(), rate)
+    
+    def _rate_limit_credential(self) -> str:
+        """Zugangsdaten, an die das Rate Limit der API gebunden ist ('' = anonym)"""
+        return ''
+    
+    def _should_shard(self, limit: Optional[int]) -> bool:
+        """Jahres-Sharding nur für unbegrenzte Suchen (Reihenfolge bei Limit bleibt erhalten)"""
+        return Settings.CURSOR_SHARDING and limit is None
+    
+    @staticmethod
+    def _pack_year_counts(year_counts: Dict[int, int], max_shard_size: int) -> List[Tuple[int, int, int]]:
+        """
+        Fasst aufeinanderfolgende Jahre zu Shards mit ≤ max_shard_size Treffern zusammen
+        
+        Ein einzelnes Jahr mit mehr Treffern bildet einen eigenen Shard.
+        
+        Args:
+            year_counts: Trefferzahl pro Publikationsjahr
+            max_shard_size: Ziel-Obergrenze pro Shard
+            
+        Returns:
+            Liste von (start_year, end_year, count)
+        """
+        shards = []
+        current = None
+        
+        for year in sorted(year_counts):
+            count = year_counts[year]
+            if current and current[2] + count <= max_shard_size:
+                current = (current[0], year, current[2] + count)
+            else:
+                if current:
+                    shards.append(current)
+                current = (year, year, count)
+        
+        if current:
+            shards.append(current)
+        
+        return shards
+    
+    async def _bisect_year_ranges(self, count_fn: Callable[[int, int], Awaitable[int]],
+                                  start_year: int, end_year: int,
+                                  max_shard_size: int) -> List[Tuple[int, int, int]]:
+        """
+        Halbiert einen Jahresbereich rekursiv, bis jeder Teil ≤ max_shard_size Treffer hat
+        
+        Die Vorab-Zählungen der beiden Hälften laufen parallel; leere
+        Bereiche werden verworfen.
+        
+        Args:
+            count_fn: Async-Funktion (start_year, end_year) → Trefferzahl
+            start_year: Erstes Jahr (inklusive)
+            end_year: Letztes Jahr (inklusive)
+            max_shard_size: Ziel-Obergrenze pro Shard
+            
+        Returns:
+            Liste von (start_year, end_year, count), aufsteigend sortiert
+        """
+        count = await count_fn(start_year, end_year)
+        
+        if count == 0:
+            return []
+        
+        if count <= max_shard_size or start_year == end_year:
+            return [(start_year, end_year, count)]
+        
+        middle = (start_year + end_year) // 2
+        lower, upper = await asyncio.gather(
+            self._bisect_year_ranges(count_fn, start_year, middle, max_shard_size),
+            self._bisect_year_ranges(count_fn, middle + 1, end_year, max_shard_size)
+        )
+        return lower + upper
+    
+    def log_http_stats(self) -> None:
+        """Loggt HTTP-Verbindungen (neu vs. wiederverwendet), Retry- und Cache-Statistik"""
+        stats = self.http.connection_stats()
+        self.logger.info(
+            f"HTTP-Verbindungen: {stats['requests']} Requests, "
+            f"{stats['new_connections']} neu aufgebaut, "
+            f"{stats['reused_connections']} wiederverwendet"
+        )
+        
+        retries = self.retry_stats
+        self.logger.info(
+            f"Retries: {retries['retries']}, Backoff: {retries['backoff_seconds']:.1f}s, "
+            f"endgültig fehlgeschlagen: {retries['failed_requests']}"
+        )
+        
+        if self.cache is not None:
+            cache = self.cache_stats
+            self.logger.info(
+                f"HTTP-Cache: {cache['hits']} Treffer, {cache['misses']} Fehlzugriffe, "
+                f"{cache['bytes_saved'] / (1024 * 1024):.1f} MB eingespart"
+                + (" (Offline-Modus)" if Settings.HTTP_CACHE_OFFLINE else "")
+            )
+        
+        if retries['failed_requests']:
+            reason = "nicht im Cache (Offline-Modus)" if Settings.HTTP_CACHE_OFFLINE \
+                else f"nach {Settings.HTTP_MAX_RETRIES} Retries fehlgeschlagen"
+            print(f"  ⚠ {retries['failed_requests']} Seite(n) {reason} - Ergebnis unvollständig")
+    
     def _standardize_article(self, article_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Standardisiert Artikel-Daten zu einheitlichem Format
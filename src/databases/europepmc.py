@@ -1,16 +1,27 @@
 """Europe PMC Datenbank-Adapter"""
 
-import requests
 import logging
-import time
-from typing import List, Dict, Any
+import math
+from datetime import date, timedelta
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
+import requests
 from src.databases.base_adapter import BaseAdapter
+from src.config.settings import Settings
+from src.utils.checkpoint import HarvestCheckpoint
+from src.utils.json_codec import JsonCodec
 
 
 class EuropePMCAdapter(BaseAdapter):
     """Adapter für Europe PMC Datenbank"""
     
     BASE_URL = "https://www.ebi.ac.uk/europepmc/webservices/rest/search"
+    DATABASE = "europepmc"
+    
+    # Jahres-Shards laufen parallel; das Rate Limit begrenzt die Request-Starts
+    MAX_CONCURRENCY = 4
+    
+    # Untergrenze für die Jahres-Zerlegung großer Treffermengen
+    EARLIEST_PUBLICATION_YEAR = 1700
     
     def __init__(self, logger: logging.Logger):
         super().__init__(logger)
@@ -18,75 +29,204 @@ class EuropePMCAdapter(BaseAdapter):
         self.rate_limit_delay = 0.2  # 5 requests/second (polite usage)
         self.logger.info("Europe PMC Adapter initialized")
     
-    def search(self, query: str, limit: int = 500) -> List[Dict[str, Any]]:
+    async def _iter_pages(self, query: str, limit: Optional[int],
+                          checkpoint: Optional[HarvestCheckpoint] = None) -> AsyncIterator[List[Dict[str, Any]]]:
         """
-        Führt Europe PMC-Suche durch
+        Führt Europe PMC-Suche durch und liefert die Ergebnisse seitenweise
+        
+        Unbegrenzte Suchen werden in PUB_YEAR-Shards aufgeteilt, deren
+        Cursor-Ketten parallel abgearbeitet werden.
         
         Args:
             query: Europe PMC Query-String
             limit: Maximale Anzahl Ergebnisse
+            checkpoint: Optionaler Checkpoint (cursorMark pro Shard)
             
-        Returns:
-            Liste von Artikel-Dictionaries
+        Yields:
+            Artikel einer Seite
         """
         self.logger.info(f"Starte Europe PMC-Suche mit Query: {query[:100]}...")
         
+        if checkpoint and 'shards' in checkpoint.meta:
+            # Fortsetzen: Shard-Aufteilung des ursprünglichen Laufs beibehalten
+            shards = [tuple(shard) for shard in checkpoint.meta['shards']]
+        else:
+            shards = await self._plan_year_shards(query) if self._should_shard(limit) else []
+            if checkpoint:
+                checkpoint.update_meta(shards=shards)
+        
+        if shards:
+            pages = self._merge_page_streams([
+                self._harvest_cursor(shard_query, None, shard_label=label, checkpoint=checkpoint)
+                for shard_query, label, _ in shards
+            ])
+        else:
+            pages = self._harvest_cursor(query, limit, checkpoint=checkpoint)
+        
         try:
-            all_articles = []
-            page_size = 100  # Europe PMC empfiehlt max 1000, wir nutzen 100
-            cursor_mark = "*"  # Start cursor
-            
-            while limit is None or len(all_articles) < limit:
-                # Prepare request
-                params = {
-                    'query': query,
-                    'format': 'json',
-                    'resultType': 'core',  # Explicitly request 'core' for full metadata including abstract
-                    'pageSize': page_size if limit is None else min(page_size, limit - len(all_articles)),
-                    'cursorMark': cursor_mark
-                }
-                
-                self.logger.debug(f"Fetching page: cursorMark={cursor_mark}, pageSize={params['pageSize']}")
-                
-                # Make request
-                response = requests.get(self.BASE_URL, params=params, timeout=30)
-                response.raise_for_status()
-                
-                data = response.json()
-                
-                # Log total hit count on first request (independent of limit)
-                if cursor_mark == "*":
-                    total_hits = data.get('hitCount', 0)
-                    self.logger.info(f"Europe PMC Datenbank: {total_hits} Treffer insgesamt (Limit: {limit})")
-                
-                # Parse results
-                articles = self._parse_response(data)
-                
-                if not articles:
-                    self.logger.info("Keine weiteren Ergebnisse")
-                    break
-                
-                all_articles.extend(articles)
-                self.logger.debug(f"Abgerufen: {len(articles)} Artikel, Gesamt: {len(all_articles)}")
-                
-                # Check if we have more pages
-                next_cursor = data.get('nextCursorMark')
-                if not next_cursor or next_cursor == cursor_mark:
-                    self.logger.info("Letzte Seite erreicht")
-                    break
-                
-                cursor_mark = next_cursor
-                
-                # Rate limiting (polite usage)
-                if len(all_articles) < limit:
-                    time.sleep(self.rate_limit_delay)
-            
-            self.logger.info(f"{len(all_articles)} Artikel von Europe PMC abgerufen")
-            return all_articles[:limit]  # Ensure we don't exceed limit
-            
-        except Exception as e:
-            self.logger.error(f"Europe PMC-Suche fehlgeschlagen: {e}")
+            async for page in pages:
+                yield page
+        finally:
+            await pages.aclose()
+    
+    async def _harvest_cursor(self, query: str, limit: Optional[int],
+                              shard_label: Optional[str] = None,
+                              checkpoint: Optional[HarvestCheckpoint] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Folgt einer cursorMark-Kette bis zum Ende (oder Limit)
+        
+        Args:
+            query: Europe PMC Query-String
+            limit: Maximale Anzahl Ergebnisse (None = alle)
+            shard_label: Bezeichnung des Shards (None = ungeteilte Suche)
+            checkpoint: Optionaler Checkpoint - Fortsetzung ab gespeichertem cursorMark
+            
+        Yields:
+            Artikel einer Seite (beim Fortsetzen zuerst die gespeicherten Artikel)
+        """
+        fetched = 0
+        page_size = 100  # Europe PMC empfiehlt max 1000, wir nutzen 100
+        cursor_mark = "*"  # Start cursor
+        prefix = f"[Shard {shard_label}] " if shard_label else ""
+        stream_key = shard_label or "main"
+        
+        state = checkpoint.stream(stream_key) if checkpoint else None
+        if state:
+            fetched = state['articles']
+            self.logger.info(f"{prefix}Fortsetzung nach {state['pages']} Seiten ({fetched} Artikel)")
+            # Gespeicherte Seiten einzeln aus der Spool-Datei liefern
+            for page in checkpoint.iter_pages(stream_key):
+                yield page
+            if state['done']:
+                return
+            cursor_mark = state['position']
+        
+        while limit is None or fetched < limit:
+            # Prepare request
+            params = {
+                'query': query,
+                'format': 'json',
+                'resultType': 'core',  # Explicitly request 'core' for full metadata including abstract
+                'pageSize': page_size if limit is None else min(page_size, limit - fetched),
+                'cursorMark': cursor_mark
+            }
+            
+            self.logger.debug(f"{prefix}Fetching page: cursorMark={cursor_mark}, pageSize={params['pageSize']}")
+            
+            # Make request (Retries in _aget); bei endgültigem Fehler Teilergebnis behalten
+            try:
+                response = await self._aget(self.BASE_URL, params=params)
+            except requests.RequestException as e:
+                self.logger.error(f"{prefix}Seite fehlgeschlagen nach Retries ({e}) - "
+                                  f"{fetched} bereits abgerufene Artikel werden behalten")
+                break
+            
+            data = JsonCodec.loads(response.content)
+            
+            # Log total hit count on first request (independent of limit)
+            if cursor_mark == "*" and not shard_label:
+                total_hits = data.get('hitCount', 0)
+                self.logger.info(f"Europe PMC Datenbank: {total_hits} Treffer insgesamt (Limit: {limit})")
+            
+            # Parse results
+            articles = self._parse_response(data)
+            
+            if not articles:
+                self.logger.debug(f"{prefix}Keine weiteren Ergebnisse")
+                if checkpoint:
+                    checkpoint.record_page(stream_key, [], position=cursor_mark, done=True)
+                break
+            
+            fetched += len(articles)
+            self.logger.debug(f"{prefix}Abgerufen: {len(articles)} Artikel, Gesamt: {fetched}")
+            
+            # Check if we have more pages
+            next_cursor = data.get('nextCursorMark')
+            last_page = not next_cursor or next_cursor == cursor_mark
+            
+            if checkpoint:
+                checkpoint.record_page(stream_key, articles, position=next_cursor, done=last_page)
+            
+            yield articles
+            
+            if last_page:
+                self.logger.debug(f"{prefix}Letzte Seite erreicht")
+                break
+            
+            cursor_mark = next_cursor
+        
+        if shard_label:
+            self.logger.info(f"{prefix}{fetched} Artikel abgerufen")
+    
+    async def _plan_year_shards(self, query: str) -> List[Tuple[str, str, int]]:
+        """
+        Teilt eine Suche in PUB_YEAR-Bereiche mit ähnlich vielen Treffern
+        
+        Die Bereiche werden per Vorab-Zählung (Halbierung) bestimmt. Ein
+        Rest-Shard erfasst Treffer außerhalb des Jahresbereichs bzw. ohne
+        Publikationsjahr, sodass die Vereinigung der Shards genau der
+        ursprünglichen Treffermenge entspricht.
+        
+        Args:
+            query: Europe PMC Query-String
+            
+        Returns:
+            Liste von (shard_query, label, count); leer wenn Sharding nicht lohnt
+        """
+        total_hits = await self._count(query)
+        
+        # Trefferzahl wird nur beim Sharding hier gemeldet, sonst von der ersten Seite
+        if total_hits < Settings.CURSOR_SHARD_MIN_RESULTS:
             return []
+        
+        self.logger.info(f"Europe PMC Datenbank: {total_hits} Treffer insgesamt (Limit: None)")
+        max_shard_size = math.ceil(total_hits / Settings.CURSOR_SHARD_COUNT)
+        first_year = self.EARLIEST_PUBLICATION_YEAR
+        last_year = date.today().year + 1
+        
+        year_ranges = await self._bisect_year_ranges(
+            lambda start, end: self._count(self._year_query(query, start, end)),
+            first_year, last_year, max_shard_size
+        )
+        
+        shards = [
+            (self._year_query(query, start, end), f"{start}-{end}", count)
+            for start, end, count in year_ranges
+        ]
+        
+        residual_query = f"({query}) NOT PUB_YEAR:[{first_year} TO {last_year}]"
+        residual_hits = await self._count(residual_query)
+        if residual_hits:
+            shards.append((residual_query, "ohne Jahr", residual_hits))
+        
+        sharded_hits = sum(count for _, _, count in shards)
+        if sharded_hits != total_hits:
+            self.logger.warning(f"Shard-Summe ({sharded_hits}) weicht von Trefferzahl ({total_hits}) ab")
+        
+        self.logger.info(f"Europe PMC: Suche in {len(shards)} Jahres-Shards aufgeteilt")
+        return shards
+    
+    def delta_query(self, query: str, since: date) -> str:
+        """Nur seit ``since`` erstmals veröffentlichte oder aktualisierte Datensätze"""
+        until = (date.today() + timedelta(days=1)).isoformat()
+        return (f"({query}) AND (FIRST_PDATE:[{since.isoformat()} TO {until}] "
+                f"OR UPDATE_DATE:[{since.isoformat()} TO {until}])")
+    
+    @staticmethod
+    def _year_query(query: str, start_year: int, end_year: int) -> str:
+        """Schränkt eine Query auf einen PUB_YEAR-Bereich ein"""
+        return f"({query}) AND PUB_YEAR:[{start_year} TO {end_year}]"
+    
+    async def _count(self, query: str) -> int:
+        """Liefert die Trefferzahl einer Query (ein Request, minimale Antwort)"""
+        params = {
+            'query': query,
+            'format': 'json',
+            'resultType': 'idlist',
+            'pageSize': 1
+        }
+        response = await self._aget(self.BASE_URL, params=params)
+        return int(JsonCodec.loads(response.content).get('hitCount', 0))
     
     def _parse_response(self, response: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Parsed Europe PMC API Response"""
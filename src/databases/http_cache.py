@@ -0,0 +1,231 @@
+"""Content-adressierter HTTP-Response-Cache auf der Festplatte"""
+
+import gzip
+import hashlib
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+from urllib.parse import urlencode
+
+import requests
+
+from src.config.settings import Settings
+
+
+class CacheMissError(requests.RequestException):
+    """Offline-Modus: Response ist nicht im Cache vorhanden"""
+
+
+class HttpCache:
+    """
+    Speichert Response-Bodies gzip-komprimiert unter einem Hash aus
+    Endpoint und normalisierten Parametern
+
+    - TTL: wird beim Lesen pro Datenbank geprüft (mtime = Zeitpunkt des Schreibens)
+    - LRU: Treffer setzen die atime; überschreitet der Cache
+      ``max_bytes``, werden die am längsten nicht genutzten Einträge gelöscht
+    - Zugangsdaten (API-Key, E-Mail) fließen nicht in den Schlüssel ein
+    """
+
+    # Parameter ohne Einfluss auf den Inhalt der Antwort
+    IGNORED_PARAMS = frozenset({'api_key', 'email', 'mailto', 'tool'})
+
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, directory: Path, max_bytes: int):
+        """
+        Args:
+            directory: Cache-Verzeichnis
+            max_bytes: Maximale Gesamtgröße (komprimiert) in Bytes
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+
+    @classmethod
+    def make_key(cls, url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Bildet den Cache-Schlüssel aus URL und normalisierten Parametern
+
+        Parameter werden sortiert, Zugangsdaten und leere Werte entfernt.
+        """
+        normalized = sorted(
+            (str(name), str(value)) for name, value in (params or {}).items()
+            if name not in cls.IGNORED_PARAMS and value is not None and value != ''
+        )
+        return hashlib.sha256(f"{url}?{urlencode(normalized)}".encode('utf-8')).hexdigest()
+
+    def read(self, key: str, ttl: Optional[float]) -> Optional[bytes]:
+        """
+        Liest einen Eintrag
+
+        Args:
+            key: Cache-Schlüssel
+            ttl: Maximales Alter in Sekunden (None = beliebig alt)
+
+        Returns:
+            Unkomprimierter Body oder None (nicht vorhanden/abgelaufen)
+        """
+        path = self._path(key)
+        if not self._is_fresh(path, ttl):
+            return None
+
+        try:
+            with gzip.open(path, 'rb') as f:
+                body = f.read()
+        except (OSError, EOFError):
+            return None
+
+        self._touch(path)
+        return body
+
+    @contextmanager
+    def open_chunks(self, key: str, ttl: Optional[float]) -> Iterator[Optional[Iterator[bytes]]]:
+        """
+        Öffnet einen Eintrag zum chunkweisen Lesen
+
+        Yields:
+            Iterator über unkomprimierte Chunks oder None (nicht vorhanden/abgelaufen)
+        """
+        path = self._path(key)
+        if not self._is_fresh(path, ttl):
+            yield None
+            return
+
+        try:
+            f = gzip.open(path, 'rb')
+        except OSError:
+            yield None
+            return
+
+        try:
+            self._touch(path)
+            yield iter(lambda: f.read(self.CHUNK_SIZE), b'')
+        finally:
+            f.close()
+
+    def write(self, key: str, body: bytes) -> None:
+        """Speichert einen Body (atomar)"""
+        with self.writer(key) as write:
+            write(body)
+
+    @contextmanager
+    def writer(self, key: str):
+        """
+        Schreibt einen Eintrag inkrementell (z.B. während eines Streams)
+
+        Der Eintrag wird erst beim fehlerfreien Verlassen des Blocks per
+        Umbenennen veröffentlicht; bei Fehlern wird er verworfen.
+
+        Yields:
+            Funktion write(chunk)
+        """
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+        f = gzip.open(tmp_path, 'wb', compresslevel=6)
+        try:
+            yield f.write
+            f.close()
+            os.replace(tmp_path, path)
+        except BaseException:
+            f.close()
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        self._account(path.stat().st_size)
+
+    def clear(self) -> None:
+        """Löscht alle Einträge"""
+        for path in self._entries():
+            path.unlink(missing_ok=True)
+        with self._lock:
+            self._total_bytes = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.gz"
+
+    def _entries(self) -> Iterator[Path]:
+        if self.directory.exists():
+            yield from self.directory.glob('*/*.gz')
+
+    @staticmethod
+    def _is_fresh(path: Path, ttl: Optional[float]) -> bool:
+        """Prüft Existenz und Alter (mtime = Zeitpunkt des Schreibens)"""
+        try:
+            stat = path.stat()
+        except OSError:
+            return False
+        return ttl is None or time.time() - stat.st_mtime <= ttl
+
+    @staticmethod
+    def _touch(path: Path) -> None:
+        """Markiert einen Eintrag als genutzt (LRU über atime, mtime bleibt für die TTL)"""
+        try:
+            stat = path.stat()
+            os.utime(path, (time.time(), stat.st_mtime))
+        except OSError:
+            pass
+
+    def _account(self, added_bytes: int) -> None:
+        """Aktualisiert die Gesamtgröße und räumt bei Überschreitung auf"""
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(self._sizes().values())
+            else:
+                self._total_bytes += added_bytes
+
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _sizes(self) -> Dict[Path, int]:
+        sizes = {}
+        for path in self._entries():
+            try:
+                sizes[path] = path.stat().st_size
+            except OSError:
+                pass
+        return sizes
+
+    def _evict(self) -> None:
+        """Löscht die am längsten nicht genutzten Einträge bis auf 90 % von max_bytes"""
+        entries: List[Tuple[float, int, Path]] = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_atime, stat.st_size, path))
+
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+
+        for _, size, path in entries:
+            if total <= target:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+        self._total_bytes = total
+
+
+_shared_cache: Optional[HttpCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_cache() -> Optional[HttpCache]:
+    """Gibt den prozessweit gemeinsamen Cache zurück (None = deaktiviert)"""
+    global _shared_cache
+    if not (Settings.HTTP_CACHE or Settings.HTTP_CACHE_OFFLINE):
+        return None
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = HttpCache(Settings.HTTP_CACHE_DIR,
+                                      int(Settings.HTTP_CACHE_MAX_MB * 1024 * 1024))
+        return _shared_cache
@@ -0,0 +1,128 @@
+"""Gepoolte HTTP-Session für alle Datenbank-Adapter"""
+
+import threading
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.config.settings import Settings
+
+
+class PooledSession:
+    """
+    Gemeinsame requests.Session mit Keep-Alive und Connection-Pool pro Host
+
+    Statt für jede Seite eine neue TCP+TLS-Verbindung aufzubauen, werden
+    Verbindungen pro Host in einem Pool gehalten und wiederverwendet.
+    """
+
+    def __init__(self,
+                 pool_connections: int = Settings.HTTP_POOL_CONNECTIONS,
+                 pool_maxsize: int = Settings.HTTP_POOL_MAXSIZE,
+                 connect_timeout: float = Settings.HTTP_CONNECT_TIMEOUT,
+                 read_timeout: float = Settings.HTTP_READ_TIMEOUT):
+        """
+        Args:
+            pool_connections: Anzahl gecachter Host-Pools
+            pool_maxsize: Standard-Anzahl Verbindungen pro Host
+            connect_timeout: Timeout für Verbindungsaufbau (Sekunden)
+            read_timeout: Standard-Timeout für Antworten (Sekunden)
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+
+        self.session = requests.Session()
+        self.session.headers['Connection'] = 'keep-alive'
+
+        default_adapter = HTTPAdapter(pool_connections=pool_connections,
+                                      pool_maxsize=pool_maxsize)
+        self.session.mount('https://', default_adapter)
+        self.session.mount('http://', default_adapter)
+
+        self._adapters = [default_adapter]
+        self._host_pool_sizes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def configure_host(self, base_url: str, pool_maxsize: int) -> None:
+        """
+        Setzt eigene Pool-Größe für einen Host (z.B. für parallele Requests)
+
+        Args:
+            base_url: Beliebige URL des Hosts (Schema + Host werden verwendet)
+            pool_maxsize: Maximale Anzahl gleichzeitiger Verbindungen zum Host
+        """
+        parsed = urlparse(base_url)
+        prefix = f"{parsed.scheme}://{parsed.netloc}/"
+
+        with self._lock:
+            # Größten angeforderten Wert behalten (mehrere Adapter pro Host möglich)
+            if self._host_pool_sizes.get(prefix, 0) >= pool_maxsize:
+                return
+            self._host_pool_sizes[prefix] = pool_maxsize
+
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+            self.session.mount(prefix, adapter)
+            self._adapters.append(adapter)
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None,
+            headers: Optional[Dict[str, str]] = None,
+            read_timeout: Optional[float] = None,
+            stream: bool = False) -> requests.Response:
+        """
+        GET-Request über den gemeinsamen Connection-Pool
+
+        Args:
+            url: Ziel-URL
+            params: Query-Parameter
+            headers: Zusätzliche Header
+            read_timeout: Abweichender Read-Timeout (None = Standard)
+            stream: Response-Body erst beim Lesen herunterladen
+
+        Returns:
+            requests.Response
+        """
+        timeout = (self.connect_timeout, read_timeout or self.read_timeout)
+        return self.session.get(url, params=params, headers=headers,
+                                timeout=timeout, stream=stream)
+
+    def connection_stats(self) -> Dict[str, int]:
+        """
+        Zählt neu aufgebaute und wiederverwendete Verbindungen
+
+        Returns:
+            Dict mit 'requests', 'new_connections', 'reused_connections'
+        """
+        total_requests = 0
+        new_connections = 0
+
+        for adapter in self._adapters:
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                total_requests += pool.num_requests
+                new_connections += pool.num_connections
+
+        return {
+            'requests': total_requests,
+            'new_connections': new_connections,
+            'reused_connections': max(0, total_requests - new_connections)
+        }
+
+
+_shared_session: Optional[PooledSession] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_session() -> PooledSession:
+    """Gibt die prozessweit gemeinsame PooledSession zurück (lazy erstellt)"""
+    global _shared_session
+    with _shared_lock:
+        if _shared_session is None:
+            _shared_session = PooledSession()
+        return _shared_session
@@ -1,17 +1,24 @@
 """OpenAlex Datenbank-Adapter"""
 
-import requests
 import logging
-import time
-from typing import List, Dict, Any
+import math
+from datetime import date
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
+import requests
 from src.databases.base_adapter import BaseAdapter
 from src.config.settings import Settings
+from src.utils.checkpoint import HarvestCheckpoint
+from src.utils.json_codec import JsonCodec
 
 
 class OpenAlexAdapter(BaseAdapter):
     """Adapter für OpenAlex Datenbank"""
     
     BASE_URL = "https://api.openalex.org/works"
+    DATABASE = "openalex"
+    
+    # Jahres-Shards laufen parallel; das Rate Limit begrenzt die Request-Starts
+    MAX_CONCURRENCY = 4
     
     def __init__(self, logger: logging.Logger):
         super().__init__(logger)
@@ -21,16 +28,31 @@ class OpenAlexAdapter(BaseAdapter):
         self.logger.info(f"OpenAlex Adapter initialized with email: {'Yes' if self.email else 'No (slower rate)'}")
         self.logger.info(f"Rate limit: {1/self.rate_limit_delay:.1f} requests/second")
     
-    def search(self, query: str, limit: int = None) -> List[Dict[str, Any]]:
+    def delta_query(self, query: str, since: date) -> str:
+        """
+        Nur seit ``since`` geänderte Works (Filter from_updated_date)
+        
+        Der Filter wird wie ein Zeitraum-Filter angehängt und bleibt bei
+        der automatischen Umwandlung in das Filter-Format erhalten.
+        """
+        return f"{query},from_updated_date:{since.isoformat()}"
+    
+    def _rate_limit_credential(self) -> str:
+        """OpenAlex ordnet Requests mit mailto dem Polite Pool zu"""
+        return self.email
+    
+    async def _iter_pages(self, query: str, limit: Optional[int],
+                          checkpoint: Optional[HarvestCheckpoint] = None) -> AsyncIterator[List[Dict[str, Any]]]:
         """
         Führt OpenAlex-Suche durch mit Cursor Paging
         
         Args:
             query: OpenAlex Query-String (filter format or simple terms)
             limit: Maximale Anzahl Ergebnisse (None = alle)
+            checkpoint: Optionaler Checkpoint (Cursor pro Shard)
             
-        Returns:
-            Liste von Artikel-Dictionaries
+        Yields:
+            Artikel einer Seite
         """
         # Auto-convert simple queries to filter format
         # Use title_and_abstract.search for more precise results
@@ -53,79 +75,180 @@ class OpenAlexAdapter(BaseAdapter):
         else:
             self.logger.info(f"Limit: {limit}")
         
+        if checkpoint and 'shards' in checkpoint.meta:
+            # Fortsetzen: Shard-Aufteilung des ursprünglichen Laufs beibehalten
+            shards = [tuple(shard) for shard in checkpoint.meta['shards']]
+        else:
+            shards = await self._plan_year_shards(query) if self._should_shard(limit) else []
+            if checkpoint:
+                checkpoint.update_meta(shards=shards)
+        
+        if shards:
+            pages = self._merge_page_streams([
+                self._harvest_cursor(f"{query},publication_year:{start}-{end}", None,
+                                     shard_label=f"{start}-{end}", checkpoint=checkpoint)
+                for start, end, _ in shards
+            ])
+        else:
+            pages = self._harvest_cursor(query, limit, checkpoint=checkpoint)
+        
         try:
-            all_articles = []
-            per_page = 200  # OpenAlex max per page
-            cursor = '*'  # Start with * for cursor paging
-            request_count = 0
-            
-            while True:
-                # Check if we've reached the limit
-                if limit is not None and len(all_articles) >= limit:
-                    break
-                
-                # Prepare request with cursor paging
-                params = {
-                    'filter': query,
-                    'per-page': per_page if limit is None else min(per_page, limit - len(all_articles)),
-                    'cursor': cursor,
-                    # Select only needed fields to reduce data transfer
-                    'select': 'id,title,display_name,authorships,publication_year,doi,primary_location,abstract_inverted_index'
-                }
-                
-                # Add mailto for polite pool (faster rate limits)
-                if self.email:
-                    params['mailto'] = self.email
-                
-                request_count += 1
-                self.logger.debug(f"Request #{request_count}: cursor={cursor[:20]}..., per-page={params['per-page']}")
-                
-                # Make request
-                response = requests.get(self.BASE_URL, params=params, timeout=30)
-                response.raise_for_status()
-                
-                data = response.json()
-                
-                # Log total hit count on first request
-                if cursor == '*':
-                    total_count = data.get('meta', {}).get('count', 0)
-                    limit_msg = "alle" if limit is None else str(limit)
-                    self.logger.info(f"OpenAlex Datenbank: {total_count} Treffer insgesamt (Limit: {limit_msg})")
-                    print(f"  → Total verfügbar: {total_count}")
-                
-                # Parse results
-                articles = self._parse_response(data)
-                
-                if not articles:
-                    self.logger.info("Keine weiteren Ergebnisse")
-                    break
-                
-                all_articles.extend(articles)
-                self.logger.debug(f"Abgerufen: {len(articles)} Artikel, Gesamt: {len(all_articles)}")
-                
-                # Progress update every 1000 articles
-                if len(all_articles) % 1000 == 0:
-                    print(f"  → Fortschritt: {len(all_articles)} Artikel abgerufen...")
-                
-                # Check for next cursor
-                meta = data.get('meta', {})
-                next_cursor = meta.get('next_cursor')
-                
-                if not next_cursor:
-                    self.logger.info("Alle verfügbaren Ergebnisse abgerufen")
-                    break
-                
-                cursor = next_cursor
-                
-                # Rate limiting
-                time.sleep(self.rate_limit_delay)
-            
-            self.logger.info(f"{len(all_articles)} Artikel von OpenAlex abgerufen")
-            return all_articles if limit is None else all_articles[:limit]
+            async for page in pages:
+                yield page
+        finally:
+            await pages.aclose()
+    
+    async def _harvest_cursor(self, query: str, limit: Optional[int],
+                              shard_label: Optional[str] = None,
+                              checkpoint: Optional[HarvestCheckpoint] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Folgt einer Cursor-Kette bis zum Ende (oder Limit)
+        
+        Args:
+            query: OpenAlex Filter-String
+            limit: Maximale Anzahl Ergebnisse (None = alle)
+            shard_label: Bezeichnung des Shards (None = ungeteilte Suche)
+            checkpoint: Optionaler Checkpoint - Fortsetzung ab gespeichertem Cursor
             
-        except Exception as e:
-            self.logger.error(f"OpenAlex-Suche fehlgeschlagen: {e}")
+        Yields:
+            Artikel einer Seite (beim Fortsetzen zuerst die gespeicherten Artikel)
+        """
+        fetched = 0
+        per_page = 200  # OpenAlex max per page
+        cursor = '*'  # Start with * for cursor paging
+        request_count = 0
+        prefix = f"[Shard {shard_label}] " if shard_label else ""
+        stream_key = shard_label or 'main'
+        
+        state = checkpoint.stream(stream_key) if checkpoint else None
+        if state:
+            fetched = state['articles']
+            request_count = state['pages']
+            self.logger.info(f"{prefix}Fortsetzung nach {state['pages']} Seiten ({fetched} Artikel)")
+            # Gespeicherte Seiten einzeln aus der Spool-Datei liefern
+            for page in checkpoint.iter_pages(stream_key):
+                yield page
+            if state['done']:
+                return
+            cursor = state['position']
+        
+        while True:
+            # Check if we've reached the limit
+            if limit is not None and fetched >= limit:
+                break
+            
+            # Prepare request with cursor paging
+            params = {
+                'filter': query,
+                'per-page': per_page if limit is None else min(per_page, limit - fetched),
+                'cursor': cursor,
+                # Select only needed fields to reduce data transfer
+                'select': 'id,title,display_name,authorships,publication_year,doi,primary_location,abstract_inverted_index'
+            }
+            
+            # Add mailto for polite pool (faster rate limits)
+            if self.email:
+                params['mailto'] = self.email
+            
+            request_count += 1
+            self.logger.debug(f"{prefix}Request #{request_count}: cursor={cursor[:20]}..., per-page={params['per-page']}")
+            
+            # Make request (Retries in _aget); bei endgültigem Fehler Teilergebnis behalten
+            try:
+                response = await self._aget(self.BASE_URL, params=params)
+            except requests.RequestException as e:
+                self.logger.error(f"{prefix}Seite fehlgeschlagen nach Retries ({e}) - "
+                                  f"{fetched} bereits abgerufene Artikel werden behalten")
+                break
+            
+            data = JsonCodec.loads(response.content)
+            
+            # Log total hit count on first request (sharded: already logged by planner)
+            if cursor == '*' and not shard_label:
+                total_count = data.get('meta', {}).get('count', 0)
+                limit_msg = "alle" if limit is None else str(limit)
+                self.logger.info(f"OpenAlex Datenbank: {total_count} Treffer insgesamt (Limit: {limit_msg})")
+                print(f"  → Total verfügbar: {total_count}")
+            
+            # Parse results
+            articles = self._parse_response(data)
+            
+            if not articles:
+                self.logger.info(f"{prefix}Keine weiteren Ergebnisse")
+                if checkpoint:
+                    checkpoint.record_page(stream_key, [], position=cursor, done=True)
+                break
+            
+            fetched += len(articles)
+            self.logger.debug(f"{prefix}Abgerufen: {len(articles)} Artikel, Gesamt: {fetched}")
+            
+            # Progress update every 1000 articles
+            if not shard_label and fetched % 1000 == 0:
+                print(f"  → Fortschritt: {fetched} Artikel abgerufen...")
+            
+            # Check for next cursor
+            meta = data.get('meta', {})
+            next_cursor = meta.get('next_cursor')
+            
+            if checkpoint:
+                checkpoint.record_page(stream_key, articles, position=next_cursor, done=not next_cursor)
+            
+            yield articles
+            
+            if not next_cursor:
+                self.logger.info(f"{prefix}Alle verfügbaren Ergebnisse abgerufen ({fetched})")
+                break
+            
+            cursor = next_cursor
+    
+    async def _plan_year_shards(self, query: str) -> List[Tuple[int, int, int]]:
+        """
+        Teilt eine Suche anhand von group_by=publication_year in Jahres-Shards
+        
+        Ein einziger Request liefert die Trefferzahl pro Jahr; aufeinander-
+        folgende Jahre werden zu Shards mit ähnlich vielen Treffern gepackt.
+        Gibt es Treffer ohne Publikationsjahr, wird nicht geshardet, da diese
+        per publication_year-Filter nicht erreichbar wären.
+        
+        Args:
+            query: OpenAlex Filter-String
+            
+        Returns:
+            Liste von (start_year, end_year, count); leer wenn Sharding nicht lohnt
+        """
+        params = {'filter': query, 'group_by': 'publication_year'}
+        if self.email:
+            params['mailto'] = self.email
+        
+        response = await self._aget(self.BASE_URL, params=params)
+        data = JsonCodec.loads(response.content)
+        
+        total_count = data.get('meta', {}).get('count', 0)
+        
+        # Trefferzahl wird nur beim Sharding hier gemeldet, sonst von der ersten Seite
+        if total_count < Settings.CURSOR_SHARD_MIN_RESULTS:
+            return []
+        
+        year_counts = {}
+        for group in data.get('group_by', []):
+            key = str(group.get('key', ''))
+            if not key.isdigit():
+                self.logger.info(f"OpenAlex: Treffer ohne Publikationsjahr ({key}) - kein Sharding")
+                return []
+            year_counts[int(key)] = group.get('count', 0)
+        
+        if sum(year_counts.values()) != total_count:
+            self.logger.info("OpenAlex: Jahresgruppen unvollständig - kein Sharding")
             return []
+        
+        max_shard_size = math.ceil(total_count / Settings.CURSOR_SHARD_COUNT)
+        shards = self._pack_year_counts(year_counts, max_shard_size)
+        
+        self.logger.info(f"OpenAlex Datenbank: {total_count} Treffer insgesamt (Limit: alle)")
+        print(f"  → Total verfügbar: {total_count}")
+        self.logger.info(f"OpenAlex: Suche in {len(shards)} Jahres-Shards aufgeteilt")
+        print(f"  → Parallel in {len(shards)} Jahres-Shards")
+        return shards
     
     def _parse_response(self, response: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Parsed OpenAlex API Response"""
@@ -1,18 +1,34 @@
 """PubMed Datenbank-Adapter"""
 
-import requests
+import asyncio
+import hashlib
 import logging
-import time
+import math
 import xml.etree.ElementTree as ET
-from typing import List, Dict, Any
-from src.databases.base_adapter import BaseAdapter
+from datetime import date, timedelta
+from typing import List, Dict, Any, AsyncIterator, Awaitable, Tuple, Iterable, Iterator, Optional
+import requests
+from src.databases.base_adapter import BaseAdapter, ResponseParseError
 from src.config.settings import Settings
+from src.utils.checkpoint import HarvestCheckpoint
+from src.utils.json_codec import JsonCodec
 
 
 class PubMedAdapter(BaseAdapter):
     """Adapter für PubMed Datenbank (NCBI E-utilities)"""
     
     BASE_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/"
+    DATABASE = "pubmed"
+    
+    # esearch/efetch liefern pro Query höchstens so viele Treffer
+    ESEARCH_MAX_RECORDS = 10000
+    
+    # Untergrenze für die Datums-Zerlegung großer Treffermengen
+    EARLIEST_PUBLICATION_DATE = date(1700, 1, 1)
+    
+    # Mehrere efetch-Batches gleichzeitig in Bearbeitung; das Rate Limit
+    # (3 bzw. 10 req/s) begrenzt weiterhin die Request-Starts
+    MAX_CONCURRENCY = 8
     
     def __init__(self, logger: logging.Logger):
         super().__init__(logger)
@@ -23,161 +39,495 @@ class PubMedAdapter(BaseAdapter):
         # Rate limiting: 3 req/sec without key, 10 req/sec with key
         self.rate_limit_delay = 0.11 if self.api_key else 0.34
         
+        # History Server (WebEnv/query_key) statt ID-Listen
+        self.use_history = Settings.PUBMED_USE_HISTORY
+        
         # User-Agent as per NCBI guidelines
         self.user_agent = f"MedicalDatabaseResearchTool/1.0 ({self.email})"
         
         self.logger.info(f"PubMed Adapter initialized with API key: {'Yes' if self.api_key else 'No'}")
         self.logger.info(f"Rate limit: {1/self.rate_limit_delay:.1f} requests/second")
     
-    def search(self, query: str, limit: int = 500) -> List[Dict[str, Any]]:
+    def delta_query(self, query: str, since: date) -> str:
+        """
+        Nur seit ``since`` in PubMed aufgenommene Datensätze (Entrez-Datum)
+        
+        Entspricht ``datetype=edat&mindate=...``; als Query-Term formuliert,
+        weil mindate/maxdate bereits für die pdat-Zeiträume genutzt werden.
+        """
+        return f'({query}) AND ("{since.strftime("%Y/%m/%d")}"[EDAT] : "3000"[EDAT])'
+    
+    def _rate_limit_credential(self) -> str:
+        """NCBI bindet das Rate Limit an den API-Key (ohne Key: pro IP)"""
+        return self.api_key
+    
+    async def _iter_pages(self, query: str, limit: Optional[int],
+                          checkpoint: Optional[HarvestCheckpoint] = None) -> AsyncIterator[List[Dict[str, Any]]]:
         """
-        Führt PubMed-Suche durch
+        Führt PubMed-Suche durch und liefert die efetch-Batches in Trefferreihenfolge
+        
+        Zwei Modi:
+        - History Server (Standard): esearch mit usehistory=y, efetch
+          blättert über WebEnv/query_key mit retstart/retmax
+        - ID-Listen (PUBMED_USE_HISTORY=0): efetch über explizite PMID-Listen
+          aus esearch (siehe _search_with_id_pages)
+        
+        Mehr als ESEARCH_MAX_RECORDS Treffer werden in Publikationsdatum-
+        Zeiträume aufgeteilt (siehe _search_partitioned).
+        
+        Mit Checkpoint wird jeder abgeschlossene efetch-Batch gespeichert;
+        beim Fortsetzen werden nur noch fehlende Batches abgerufen.
         
         Args:
             query: PubMed Query-String
             limit: Maximale Anzahl Ergebnisse
+            checkpoint: Optionaler Checkpoint (WebEnv, retstart pro Batch)
             
-        Returns:
-            Liste von Artikel-Dictionaries
+        Yields:
+            Artikel eines efetch-Batches
         """
         self.logger.info(f"Starte PubMed-Suche mit Query: {query[:100]}...")
         
+        # First request: total count (+ WebEnv bzw. erste ID-Seite)
+        first_retmax = 0 if self.use_history else min(self.ESEARCH_MAX_RECORDS, limit or self.ESEARCH_MAX_RECORDS)
+        esearch_result = await self._esearch(query, retstart=0, retmax=first_retmax,
+                                             use_history=self.use_history)
+        total_count = int(esearch_result.get('count', '0'))
+        self._log_total_count(total_count, limit)
+        
+        target_count = total_count if limit is None else min(limit, total_count)
+        
+        if checkpoint:
+            self._validate_checkpoint(checkpoint, total_count, esearch_result)
+        
+        if target_count == 0:
+            return
+        elif target_count > self.ESEARCH_MAX_RECORDS and Settings.PUBMED_DATE_SLICING:
+            pages = self._search_partitioned(query, target_count, total_count, checkpoint)
+        elif self.use_history:
+            pages = self._ordered_pages(self._history_batches(esearch_result, target_count, checkpoint,
+                                                              cache_scope=query))
+        else:
+            pages = self._search_with_id_pages(query, target_count, esearch_result, checkpoint)
+        
         try:
-            # Schritt 1: esearch - IDs holen
-            pmids = self._search_ids(query, limit)
-            
-            if not pmids:
-                self.logger.warning("Keine PubMed IDs gefunden")
-                return []
-            
-            self.logger.info(f"{len(pmids)} PubMed IDs gefunden")
-            
-            # Schritt 2: efetch - Artikel-Details holen
-            articles = self._fetch_details(pmids)
+            async for page in pages:
+                yield page
+        finally:
+            await pages.aclose()
+    
+    def _validate_checkpoint(self, checkpoint: HarvestCheckpoint, total_count: int,
+                             esearch_result: Dict[str, Any]) -> None:
+        """
+        Prüft, ob ein Checkpoint zur aktuellen Trefferliste passt
+        
+        Ein WebEnv des NCBI History Servers verfällt nach einigen Stunden;
+        beim Fortsetzen wird daher das WebEnv der neuen esearch verwendet.
+        Die gespeicherten Batches (retstart) bleiben nur gültig, solange
+        sich die Trefferzahl nicht geändert hat.
+        """
+        previous_count = checkpoint.meta.get('total_count')
+        if previous_count is not None and previous_count != total_count:
+            self.logger.warning(f"Trefferzahl seit Checkpoint geändert ({previous_count} → {total_count}) "
+                                f"- Checkpoint wird verworfen")
+            checkpoint.reset()
+        
+        checkpoint.update_meta(total_count=total_count,
+                               webenv=esearch_result.get('webenv'),
+                               query_key=esearch_result.get('querykey'))
+    
+    def _history_batches(self, esearch_result: Dict[str, Any],
+                         target_count: int,
+                         checkpoint: Optional[HarvestCheckpoint] = None,
+                         slice_label: str = 'all',
+                         cache_scope: str = '') -> Iterator[Awaitable[List[Dict[str, Any]]]]:
+        """
+        efetch-Batches über den NCBI History Server (zur Ausführung mit _ordered_pages)
+        
+        Die Trefferliste bleibt auf dem NCBI-Server; efetch wird direkt
+        über WebEnv/query_key paginiert. Es werden keine ID-Listen
+        übertragen, und die efetch-Seiten können deutlich größer sein.
+        
+        Args:
+            esearch_result: esearch-Antwort mit usehistory=y
+            target_count: Anzahl abzurufender Artikel
+            checkpoint: Optionaler Checkpoint
+            slice_label: Bezeichnung des Datums-Zeitraums (Checkpoint-Schlüssel)
+            cache_scope: Query der esearch (ersetzt das kurzlebige WebEnv im Cache-Schlüssel;
+                         zusammen mit der Trefferzahl, damit neue Treffer den Cache ungültig machen)
+        """
+        webenv = esearch_result.get('webenv')
+        query_key = esearch_result.get('querykey')
+        if not webenv or not query_key:
+            raise ValueError("esearch lieferte kein WebEnv/query_key")
+        
+        self.logger.debug(f"History Server: WebEnv={webenv[:20]}..., query_key={query_key}")
+        
+        batch_size = Settings.PUBMED_HISTORY_BATCH_SIZE
+        
+        for batch_num, retstart in enumerate(range(0, target_count, batch_size), start=1):
+            yield self._efetch({
+                'WebEnv': webenv,
+                'query_key': query_key,
+                'retstart': retstart,
+                'retmax': min(batch_size, target_count - retstart)
+            }, batch_num, checkpoint, f"history:{slice_label}:{retstart}",
+               cache_scope=f"{cache_scope}|{slice_label}|{esearch_result.get('count')}")
+    
+    async def _search_with_id_pages(self, query: str, target_count: int,
+                                    first_result: Dict[str, Any],
+                                    checkpoint: Optional[HarvestCheckpoint] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Sucht mit expliziten ID-Listen (nur mit PUBMED_USE_HISTORY=0)
+        
+        Die erste esearch-Antwort enthält bereits bis zu ESEARCH_MAX_RECORDS
+        IDs; größere Treffermengen werden nach Datum aufgeteilt
+        (_search_partitioned). Weitere ID-Seiten fallen daher nur mit
+        PUBMED_DATE_SLICING=0 an. Sie werden parallel angefragt; jeder
+        efetch-Batch wartet nur auf seine eigene ID-Seite. Die Batches laufen
+        über _ordered_pages (höchstens 2×MAX_CONCURRENCY voraus) und werden
+        in der Reihenfolge der esearch-Trefferliste geliefert.
+        """
+        batch_size = 200  # Max 200 IDs pro efetch-Request
+        
+        first_ids = first_result.get('idlist', [])
+        if not first_ids:
+            return
+        
+        first_page = asyncio.get_running_loop().create_future()
+        first_page.set_result(first_ids)
+        id_pages = [(first_page, len(first_ids))]
+        
+        # Weitere ID-Seiten vorab starten (Rate Limiter verteilt die Starts),
+        # damit sie vor den efetch-Batches an der Reihe sind
+        for page_index, retstart in enumerate(range(len(first_ids), target_count, self.ESEARCH_MAX_RECORDS),
+                                              start=1):
+            retmax = min(self.ESEARCH_MAX_RECORDS, target_count - retstart)
+            id_pages.append((asyncio.ensure_future(self._fetch_id_page(query, page_index, retstart, retmax)),
+                             retmax))
+        
+        def fetches() -> Iterator[Awaitable[List[Dict[str, Any]]]]:
+            batch_num = 0
+            for id_page, page_size in id_pages:
+                for offset in range(0, page_size, batch_size):
+                    batch_num += 1
+                    yield self._fetch_id_page_batch(id_page, offset, batch_size, batch_num, checkpoint)
+        
+        pages = self._ordered_pages(fetches())
+        try:
+            async for page in pages:
+                if page:
+                    yield page
+        finally:
+            await pages.aclose()
+            for id_page, _ in id_pages:
+                id_page.cancel()
+            await asyncio.gather(*[id_page for id_page, _ in id_pages], return_exceptions=True)
+    
+    async def _fetch_id_page_batch(self, id_page: Awaitable[List[str]], offset: int, batch_size: int,
+                                   batch_num: int, checkpoint: Optional[HarvestCheckpoint] = None
+                                   ) -> List[Dict[str, Any]]:
+        """Holt einen efetch-Batch, sobald seine ID-Seite vorliegt (leer, wenn die Seite kürzer ist)"""
+        batch_pmids = (await id_page)[offset:offset + batch_size]
+        if not batch_pmids:
+            return []
+        return await self._fetch_batch(batch_pmids, batch_num, checkpoint)
+    
+    async def _search_partitioned(self, query: str, target_count: int, total_count: int,
+                                  checkpoint: Optional[HarvestCheckpoint] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Sucht jenseits des esearch-Fensters über Publikationsdatum-Zeiträume
+        
+        esearch/efetch liefern pro Query höchstens ESEARCH_MAX_RECORDS
+        Treffer. Die Query wird daher anhand von Vorab-Zählungen in
+        pdat-Zeiträume mit jeweils höchstens so vielen Treffern zerlegt.
+        Die Zeiträume werden parallel (im Rate-Limit-Budget) abgearbeitet
+        und ihre PMID-Mengen zusammengeführt.
+        
+        Args:
+            query: PubMed Query-String
+            target_count: Anzahl abzurufender Artikel
+            total_count: Gesamtzahl Treffer (ohne Datumseinschränkung)
+            checkpoint: Optionaler Checkpoint
+        """
+        today = date.today()
+        slices = await self._plan_date_slices(
+            query, self.EARLIEST_PUBLICATION_DATE, date(today.year + 1, 12, 31), total_count
+        )
+        
+        # Neueste Zeiträume zuerst (entspricht der Standard-Sortierung)
+        slices.sort(key=lambda s: s[0], reverse=True)
+        
+        # Nur so viele Zeiträume wie für target_count nötig
+        selected = []
+        remaining = target_count
+        for start, end, count, esearch_result in slices:
+            if remaining <= 0:
+                break
+            selected.append((start, end, min(count, remaining), esearch_result))
+            remaining -= count
+        
+        self.logger.info(f"PubMed: {total_count} Treffer in {len(selected)} Datums-Zeiträume aufgeteilt "
+                         f"(max. {self.ESEARCH_MAX_RECORDS} pro Zeitraum)")
+        
+        if self.use_history:
+            # Jeder Zeitraum hat sein eigenes WebEnv aus der Vorab-Zählung;
+            # die Batches aller Zeiträume laufen in einem gemeinsamen Fenster
+            batches = (
+                batch
+                for start, end, count, esearch_result in selected
+                for batch in self._history_batches(esearch_result, count, checkpoint,
+                                                   f"{start}_{end}", cache_scope=query)
+            )
             
-            self.logger.info(f"{len(articles)} Artikel abgerufen")
-            return articles
+            # Artikel an Zeitraumgrenzen können doppelt vorkommen
+            seen = set()
+            pages = self._ordered_pages(batches)
+            try:
+                async for batch in pages:
+                    page = [article for article in batch if article['url'] not in seen]
+                    seen.update(article['url'] for article in page)
+                    yield page
+            finally:
+                await pages.aclose()
+            return
+        
+        # ID-Modus: pro Zeitraum eine esearch-Seite (≤ ESEARCH_MAX_RECORDS IDs)
+        id_pages = await asyncio.gather(*[
+            self._esearch(query, retstart=0, retmax=count, date_range=(start, end))
+            for start, end, count, _ in selected
+        ], return_exceptions=True)
+        
+        # PMID-Mengen zusammenführen (Reihenfolge bleibt erhalten)
+        pmids = []
+        seen = set()
+        for (start, end, _, _), esearch_result in zip(selected, id_pages):
+            if isinstance(esearch_result, requests.RequestException):
+                self.logger.error(f"esearch für Zeitraum {start} - {end} fehlgeschlagen nach Retries "
+                                  f"({esearch_result}) - Zeitraum wird übersprungen")
+                continue
+            if isinstance(esearch_result, BaseException):
+                raise esearch_result
+            for pmid in esearch_result.get('idlist', []):
+                if pmid not in seen:
+                    seen.add(pmid)
+                    pmids.append(pmid)
+        
+        self.logger.info(f"{len(pmids)} PubMed IDs aus {len(selected)} Zeiträumen zusammengeführt")
+        pages = self._iter_details(pmids[:target_count], checkpoint)
+        try:
+            async for page in pages:
+                yield page
+        finally:
+            await pages.aclose()
+    
+    async def _plan_date_slices(self, query: str, start: date, end: date,
+                                count: Optional[int] = None) -> List[Tuple[date, date, int, Dict[str, Any]]]:
+        """
+        Zerlegt einen Datumsbereich rekursiv, bis jeder Teil ≤ ESEARCH_MAX_RECORDS Treffer hat
+        
+        Die Vorab-Zählungen (esearch mit retmax=0) der Teilbereiche laufen
+        parallel. Im History-Modus liefern sie gleichzeitig das WebEnv für
+        den späteren efetch.
+        
+        Args:
+            query: PubMed Query-String
+            start: Erstes Publikationsdatum (inklusive)
+            end: Letztes Publikationsdatum (inklusive)
+            count: Bereits bekannte Trefferzahl (None = zählen)
             
-        except Exception as e:
-            self.logger.error(f"PubMed-Suche fehlgeschlagen: {e}")
+        Returns:
+            Liste von (start, end, count, esearch_result) für nicht-leere Zeiträume
+        """
+        esearch_result = {}
+        if count is None:
+            try:
+                esearch_result = await self._esearch(query, retstart=0, retmax=0,
+                                                     use_history=self.use_history,
+                                                     date_range=(start, end))
+            except requests.RequestException as e:
+                self.logger.error(f"Zählung für Zeitraum {start} - {end} fehlgeschlagen nach Retries ({e}) "
+                                  f"- Zeitraum wird übersprungen")
+                return []
+            count = int(esearch_result.get('count', '0'))
+        
+        if count == 0:
+            return []
+        
+        if count <= self.ESEARCH_MAX_RECORDS or start == end:
+            if count > self.ESEARCH_MAX_RECORDS:
+                self.logger.warning(f"Zeitraum {start} nicht weiter teilbar: "
+                                    f"{count} Treffer, nur {self.ESEARCH_MAX_RECORDS} abrufbar")
+            if not esearch_result:
+                # Bekannte Zählung ohne eigenes WebEnv/Datumsfilter → nochmals zählen
+                return await self._plan_date_slices(query, start, end)
+            return [(start, end, min(count, self.ESEARCH_MAX_RECORDS), esearch_result)]
+        
+        # Gleich breite Teilbereiche; Anzahl nach geschätztem Bedarf (max. 10 pro Ebene)
+        parts = min(max(2, math.ceil(count / self.ESEARCH_MAX_RECORDS)), 10)
+        total_days = (end - start).days + 1
+        parts = min(parts, total_days)
+        
+        ranges = []
+        range_start = start
+        for i in range(1, parts + 1):
+            range_end = start + timedelta(days=total_days * i // parts - 1)
+            ranges.append((range_start, range_end))
+            range_start = range_end + timedelta(days=1)
+        
+        sub_slices = await asyncio.gather(*[
+            self._plan_date_slices(query, range_start, range_end)
+            for range_start, range_end in ranges
+        ])
+        
+        return [s for sub in sub_slices for s in sub]
+    
+    async def _fetch_id_page(self, query: str, page_index: int,
+                             retstart: int, retmax: int) -> List[str]:
+        """Holt eine Seite PubMed IDs via esearch"""
+        self.logger.debug(f"Fetching IDs: retstart={retstart}, retmax={retmax}")
+        try:
+            esearch_result = await self._esearch(query, retstart=retstart, retmax=retmax)
+        except requests.RequestException as e:
+            self.logger.error(f"esearch Seite {page_index} fehlgeschlagen nach Retries ({e}) - wird übersprungen")
             return []
+        return esearch_result.get('idlist', [])
     
-    def _search_ids(self, query: str, limit: int) -> List[str]:
+    async def _esearch(self, query: str, retstart: int, retmax: int,
+                       use_history: bool = False,
+                       date_range: Optional[Tuple[date, date]] = None) -> Dict[str, Any]:
         """
-        Sucht PubMed IDs via esearch with pagination support
+        Führt einen esearch-Request aus
         
         Args:
-            query: Search query
-            limit: Maximum number of results (None = all available)
+            query: PubMed Query-String
+            retstart: Offset in der Trefferliste
+            retmax: Anzahl zurückzugebender IDs
+            use_history: Trefferliste auf dem History Server ablegen
+            date_range: Optionaler Publikationsdatum-Bereich (pdat, inklusive)
+        
+        Returns:
+            'esearchresult'-Dictionary der JSON-Antwort
         """
         url = f"{self.BASE_URL}esearch.fcgi"
         headers = {'User-Agent': self.user_agent}
-        
-        all_ids = []
-        batch_size = 10000  # esearch max retmax
-        retstart = 0
-        
-        # First request to get total count
         params = {
             'db': 'pubmed',
             'term': query,
-            'retmax': 0,  # Just get count first
+            'retstart': retstart,
+            'retmax': retmax,
             'retmode': 'json',
             'tool': 'MedicalDatabaseResearchTool',
             'email': self.email
         }
         
+        if use_history:
+            params['usehistory'] = 'y'
+        
+        if date_range:
+            params['datetype'] = 'pdat'
+            params['mindate'] = date_range[0].strftime('%Y/%m/%d')
+            params['maxdate'] = date_range[1].strftime('%Y/%m/%d')
+        
         if self.api_key:
             params['api_key'] = self.api_key
         
-        response = requests.get(url, params=params, headers=headers, timeout=30)
-        response.raise_for_status()
-        
-        data = response.json()
-        esearch_result = data.get('esearchresult', {})
-        total_count = int(esearch_result.get('count', '0'))
+        # Antworten mit WebEnv nur im Offline-Modus aus dem Cache (WebEnv verfällt)
+        response = await self._aget(url, params=params, headers=headers, volatile=use_history)
         
+        data = JsonCodec.loads(response.content)
+        return data.get('esearchresult', {})
+    
+    def _log_total_count(self, total_count: int, limit: int) -> None:
+        """Loggt die Gesamt-Trefferzahl der Suche"""
         limit_msg = "alle" if limit is None else str(limit)
         self.logger.info(f"PubMed Datenbank: {total_count} Treffer insgesamt (Limit: {limit_msg})")
-        
-        # Determine how many IDs to fetch
-        target_count = total_count if limit is None else min(limit, total_count)
-        
-        # Fetch IDs in batches
-        while retstart < target_count:
-            current_batch = min(batch_size, target_count - retstart)
-            
-            params['retmax'] = current_batch
-            params['retstart'] = retstart
-            
-            self.logger.debug(f"Fetching IDs: retstart={retstart}, retmax={current_batch}")
-            
-            if retstart > 0:
-                time.sleep(self.rate_limit_delay)
-            
-            response = requests.get(url, params=params, headers=headers, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
-            esearch_result = data.get('esearchresult', {})
-            batch_ids = esearch_result.get('idlist', [])
-            
-            if not batch_ids:
-                break
-            
-            all_ids.extend(batch_ids)
-            retstart += len(batch_ids)
-            
-            self.logger.debug(f"Retrieved {len(batch_ids)} IDs, total: {len(all_ids)}")
-        
-        return all_ids
     
-    def _fetch_details(self, pmids: List[str]) -> List[Dict[str, Any]]:
+    def _iter_details(self, pmids: List[str],
+                      checkpoint: Optional[HarvestCheckpoint] = None) -> AsyncIterator[List[Dict[str, Any]]]:
         """
         Holt Artikel-Details via efetch (XML) in Batches mit Rate Limiting
         Verwendet XML für vollständige Metadaten inkl. Abstract
         """
-        if not pmids:
-            return []
-        
-        all_articles = []
         batch_size = 200  # Max 200 IDs pro Request
         
+        # Batches laufen parallel (MAX_CONCURRENCY), Reihenfolge bleibt erhalten
+        return self._ordered_pages(
+            self._fetch_batch(pmids[i:i+batch_size], i//batch_size + 1, checkpoint)
+            for i in range(0, len(pmids), batch_size)
+        )
+    
+    async def _fetch_batch(self, batch_pmids: List[str], batch_num: int,
+                           checkpoint: Optional[HarvestCheckpoint] = None) -> List[Dict[str, Any]]:
+        """Holt einen efetch-Batch über eine explizite ID-Liste"""
+        ids = ','.join(batch_pmids)
+        page_key = f"ids:{hashlib.sha1(ids.encode('ascii')).hexdigest()[:16]}"
+        return await self._efetch({'id': ids}, batch_num, checkpoint, page_key)
+    
+    async def _efetch(self, selection: Dict[str, Any], batch_num: int,
+                      checkpoint: Optional[HarvestCheckpoint] = None,
+                      page_key: Optional[str] = None,
+                      cache_scope: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Holt einen efetch-Batch (XML) und parsed ihn
+        
+        Args:
+            selection: Auswahl der Artikel - entweder {'id': ...} oder
+                       {'WebEnv', 'query_key', 'retstart', 'retmax'}
+            batch_num: Laufende Batch-Nummer (für Logging)
+            checkpoint: Optionaler Checkpoint - bereits gespeicherte Batches
+                        werden nicht erneut abgerufen
+            page_key: Stabiler Schlüssel des Batches im Checkpoint
+            cache_scope: Stabile Kennung der History-Suche für den Cache-Schlüssel
+        """
+        if checkpoint and page_key:
+            state = checkpoint.stream(page_key)
+            if state and state['done']:
+                self.logger.debug(f"Batch {batch_num} aus Checkpoint übernommen")
+                return checkpoint.articles(page_key)
+        
+        self.logger.debug(f"Fetching batch {batch_num}: "
+                          f"{selection.get('retmax') or selection['id'].count(',') + 1} Artikel")
+        
         headers = {'User-Agent': self.user_agent}
         
-        # IDs in Batches aufteilen
-        for i in range(0, len(pmids), batch_size):
-            batch_pmids = pmids[i:i+batch_size]
-            batch_num = i//batch_size + 1
-            self.logger.debug(f"Fetching batch {batch_num}: {len(batch_pmids)} IDs")
-            
-            # Rate limiting: Sleep between requests (except first)
-            if i > 0:
-                time.sleep(self.rate_limit_delay)
-                self.logger.debug(f"Rate limit delay: {self.rate_limit_delay}s")
-            
-            # Use efetch with XML for complete metadata including abstract
-            url = f"{self.BASE_URL}efetch.fcgi"
-            params = {
-                'db': 'pubmed',
-                'id': ','.join(batch_pmids),
-                'retmode': 'xml',
-                'rettype': 'abstract',  # Get abstract data
-                'tool': 'MedicalDatabaseResearchTool',
-                'email': self.email
-            }
-            
-            if self.api_key:
-                params['api_key'] = self.api_key
-            
-            response = requests.get(url, params=params, headers=headers, timeout=60)
-            response.raise_for_status()
-            
-            # Parse XML response
-            articles = self._parse_xml_response(response.text)
-            all_articles.extend(articles)
+        # Use efetch with XML for complete metadata including abstract
+        url = f"{self.BASE_URL}efetch.fcgi"
+        params = {
+            'db': 'pubmed',
+            'retmode': 'xml',
+            'rettype': 'abstract',  # Get abstract data
+            'tool': 'MedicalDatabaseResearchTool',
+            'email': self.email
+        }
+        params.update(selection)
+        
+        if self.api_key:
+            params['api_key'] = self.api_key
         
-        return all_articles
+        # WebEnv ist pro Lauf neu → im Cache-Schlüssel durch Query + Trefferzahl ersetzen
+        cache_params = None
+        if 'WebEnv' in selection:
+            cache_params = {name: value for name, value in params.items()
+                            if name not in ('WebEnv', 'query_key')}
+            cache_params['history_scope'] = cache_scope
+        
+        # XML wird während des Downloads geparst (kein vollständiger Body im Speicher)
+        try:
+            articles = await self._aget_streamed(
+                url, lambda chunks: list(self._iter_xml_articles(chunks)),
+                params=params, headers=headers, read_timeout=60,
+                cache_params=cache_params
+            )
+        except requests.RequestException as e:
+            # Retries erschöpft: Batch auslassen, übrige Batches behalten
+            self.logger.error(f"efetch Batch {batch_num} fehlgeschlagen nach Retries ({e}) - wird übersprungen")
+            return []
+        
+        if checkpoint and page_key:
+            checkpoint.record_page(page_key, articles, position=selection.get('retstart'), done=True)
+        
+        return articles
     
     def _parse_response(self, response: Any) -> List[Dict[str, Any]]:
         """Not used - PubMed uses XML parsing directly"""
@@ -185,91 +535,133 @@ class PubMedAdapter(BaseAdapter):
     
     def _parse_xml_response(self, xml_text: str) -> List[Dict[str, Any]]:
         """Parsed PubMed efetch XML Response"""
-        articles = []
+        return list(self._iter_xml_articles([xml_text.encode('utf-8')]))
+    
+    def _iter_xml_articles(self, chunks: Iterable[bytes]) -> Iterator[Dict[str, Any]]:
+        """
+        Parsed PubMed efetch XML inkrementell (Streaming)
+        
+        Die Bytes werden chunkweise in einen Pull-Parser gefüttert; pro
+        abgeschlossenem PubmedArticle wird ein Artikel geliefert und das
+        Element danach verworfen. Der Speicherbedarf bleibt dadurch
+        unabhängig von der Größe der Antwort.
+        
+        Args:
+            chunks: Iterator über Bytes der efetch-Antwort
+            
+        Yields:
+            Standardisierte Artikel-Dictionaries
+            
+        Raises:
+            ResponseParseError: bei abgeschnittenem oder fehlerhaftem XML
+                                (der Batch wird dann wiederholt, nicht gecacht)
+        """
+        parser = ET.XMLPullParser(events=('start', 'end'))
+        root = None
         
         try:
-            root = ET.fromstring(xml_text)
+            for chunk in chunks:
+                parser.feed(chunk)
+                
+                for event, elem in parser.read_events():
+                    if root is None and event == 'start':
+                        root = elem
+                    elif event == 'end' and elem.tag == 'PubmedArticle':
+                        article = self._parse_article_element(elem)
+                        if article is not None:
+                            yield article
+                        # Verarbeitete Artikel aus dem Baum entfernen
+                        root.clear()
             
-            # Iterate over all PubmedArticle elements
-            for article_elem in root.findall('.//PubmedArticle'):
-                try:
-                    # Extract PMID
-                    pmid_elem = article_elem.find('.//PMID')
-                    pmid = pmid_elem.text if pmid_elem is not None else 'N/A'
-                    
-                    # Extract title
-                    title_elem = article_elem.find('.//ArticleTitle')
-                    title = title_elem.text if title_elem is not None else 'N/A'
-                    
-                    # Extract authors
-                    authors_list = []
-                    for author in article_elem.findall('.//Author'):
-                        lastname = author.find('LastName')
-                        forename = author.find('ForeName')
-                        if lastname is not None:
-                            name = lastname.text
-                            if forename is not None:
-                                name = f"{forename.text} {name}"
-                            authors_list.append(name)
-                    authors = ', '.join(authors_list) if authors_list else 'N/A'
-                    
-                    # Extract year
-                    year = 'N/A'
-                    pub_date = article_elem.find('.//PubDate/Year')
-                    if pub_date is not None:
-                        year = pub_date.text
-                    else:
-                        # Try MedlineDate format (e.g., "2024 Jan-Feb")
-                        medline_date = article_elem.find('.//PubDate/MedlineDate')
-                        if medline_date is not None and medline_date.text:
-                            year = medline_date.text.split()[0]
-                    
-                    # Extract DOI
-                    doi = 'N/A'
-                    for article_id in article_elem.findall('.//ArticleId'):
-                        if article_id.get('IdType') == 'doi':
-                            doi = article_id.text
-                            break
-                    
-                    # Extract abstract
-                    abstract_parts = []
-                    for abstract_text in article_elem.findall('.//Abstract/AbstractText'):
-                        # Handle labeled abstracts (Background, Methods, etc.)
-                        label = abstract_text.get('Label')
-                        text = abstract_text.text or ''
-                        if label:
-                            abstract_parts.append(f"{label}: {text}")
-                        else:
-                            abstract_parts.append(text)
-                    abstract = ' '.join(abstract_parts) if abstract_parts else 'N/A'
-                    
-                    # Entferne Absatzzeichen und normalisiere Whitespace
-                    if abstract != 'N/A':
-                        abstract = abstract.replace('\n', ' ').replace('\r', ' ')
-                        abstract = ' '.join(abstract.split())
-                    
-                    # Extract journal
-                    journal_elem = article_elem.find('.//Journal/Title')
-                    venue = journal_elem.text if journal_elem is not None else 'N/A'
-                    
-                    # Standardize article
-                    article = self._standardize_article({
-                        'authors': authors,
-                        'title': title,
-                        'year': year,
-                        'doi': doi,
-                        'url': f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/",
-                        'abstract': abstract,
-                        'venue': venue
-                    })
-                    
-                    articles.append(article)
-                    
-                except Exception as e:
-                    self.logger.warning(f"Failed to parse article: {e}")
-                    continue
+            parser.close()
             
         except ET.ParseError as e:
-            self.logger.error(f"XML parsing error: {e}")
+            raise ResponseParseError(f"XML parsing error: {e}") from e
+    
+    def _parse_article_element(self, article_elem: ET.Element) -> Optional[Dict[str, Any]]:
+        """
+        Extrahiert einen Artikel aus einem PubmedArticle-Element
         
-        return articles
+        Verwendet direkte Pfade statt './/'-Suchen über den ganzen Teilbaum.
+        """
+        try:
+            citation = article_elem.find('MedlineCitation')
+            article_data = citation.find('Article') if citation is not None else None
+            if article_data is None:
+                raise ValueError("MedlineCitation/Article fehlt")
+            
+            # Extract PMID
+            pmid_elem = citation.find('PMID')
+            pmid = pmid_elem.text if pmid_elem is not None else 'N/A'
+            
+            # Extract title
+            title_elem = article_data.find('ArticleTitle')
+            title = title_elem.text if title_elem is not None else 'N/A'
+            
+            # Extract authors
+            authors_list = []
+            for author in article_data.iterfind('AuthorList/Author'):
+                lastname = author.find('LastName')
+                forename = author.find('ForeName')
+                if lastname is not None:
+                    name = lastname.text
+                    if forename is not None:
+                        name = f"{forename.text} {name}"
+                    authors_list.append(name)
+            authors = ', '.join(authors_list) if authors_list else 'N/A'
+            
+            # Extract year
+            year = 'N/A'
+            pub_date = article_data.find('Journal/JournalIssue/PubDate')
+            if pub_date is not None:
+                year_elem = pub_date.find('Year')
+                if year_elem is not None:
+                    year = year_elem.text
+                else:
+                    # Try MedlineDate format (e.g., "2024 Jan-Feb")
+                    medline_date = pub_date.find('MedlineDate')
+                    if medline_date is not None and medline_date.text:
+                        year = medline_date.text.split()[0]
+            
+            # Extract DOI
+            doi = 'N/A'
+            for article_id in article_elem.iterfind('PubmedData/ArticleIdList/ArticleId'):
+                if article_id.get('IdType') == 'doi':
+                    doi = article_id.text
+                    break
+            
+            # Extract abstract
+            abstract_parts = []
+            for abstract_text in article_data.iterfind('Abstract/AbstractText'):
+                # Handle labeled abstracts (Background, Methods, etc.)
+                label = abstract_text.get('Label')
+                text = abstract_text.text or ''
+                if label:
+                    abstract_parts.append(f"{label}: {text}")
+                else:
+                    abstract_parts.append(text)
+            abstract = ' '.join(abstract_parts) if abstract_parts else 'N/A'
+            
+            # Entferne Absatzzeichen und normalisiere Whitespace
+            if abstract != 'N/A':
+                abstract = abstract.replace('\n', ' ').replace('\r', ' ')
+                abstract = ' '.join(abstract.split())
+            
+            # Extract journal
+            journal_elem = article_data.find('Journal/Title')
+            venue = journal_elem.text if journal_elem is not None else 'N/A'
+            
+            # Standardize article
+            return self._standardize_article({
+                'authors': authors,
+                'title': title,
+                'year': year,
+                'doi': doi,
+                'url': f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/",
+                'abstract': abstract,
+                'venue': venue
+            })
+            
+        except Exception as e:
+            self.logger.warning(f"Failed to parse article: {e}")
+            return None
@@ -0,0 +1,182 @@
+"""Rate Limiting für Datenbank-Requests"""
+
+import asyncio
+import hashlib
+import os
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: nur prozessinterne Koordination
+    fcntl = None
+
+from src.config.settings import Settings
+
+
+class TokenBucketLimiter:
+    """
+    Token Bucket pro API-Host und Zugangsdaten (API-Key / E-Mail)
+
+    Jeder Request reserviert ein Token; ist der Bucket leer, wird die
+    Reservierung in die Zukunft gebucht und der Aufrufer wartet genau bis
+    dahin. Requests, die länger als das Intervall dauern, verursachen so
+    keine zusätzliche Wartezeit, und das erlaubte Budget wird voll genutzt.
+
+    Der Zustand (Tokens, Zeitstempel) liegt in einer Datei unter
+    ``Settings.RATE_LIMIT_DIR`` und wird per ``fcntl.flock`` gesperrt -
+    dadurch teilen sich alle Threads und alle Prozesse auf dem Rechner
+    (z.B. zwei parallele research.py-Läufe mit demselben NCBI-Key) ein
+    Budget. Ohne ``fcntl`` gilt das Budget nur innerhalb des Prozesses.
+
+    Rate und Burst gehören zum Dateischlüssel: Teilnehmer mit anderer
+    Konfiguration (z.B. anderes RATE_LIMIT_BURST) nutzen einen
+    eigenen Bucket, statt einen fremden Zustand mit eigener Rate fortzuschreiben.
+    """
+
+    _STATE_FORMAT = '<dd'  # tokens, timestamp (time.time)
+    _STATE_SIZE = struct.calcsize(_STATE_FORMAT)
+
+    def __init__(self, key: str, rate: float, burst: float = 1.0,
+                 state_dir: Optional[Path] = None):
+        """
+        Args:
+            key: Eindeutiger Schlüssel (z.B. Host + Zugangsdaten)
+            rate: Erlaubte Requests pro Sekunde (0 = unbegrenzt)
+            burst: Bucket-Kapazität (Requests, die ohne Wartezeit starten dürfen)
+            state_dir: Verzeichnis für die Zustandsdatei (None = Settings.RATE_LIMIT_DIR)
+        """
+        self.key = key
+        self.rate = rate
+        self.burst = max(1.0, burst)
+
+        # Zugangsdaten nicht im Dateinamen ablegen
+        digest = hashlib.sha256(f"{key}|{rate!r}|{self.burst!r}".encode('utf-8')).hexdigest()[:16]
+        self.state_file = Path(state_dir or Settings.RATE_LIMIT_DIR) / f"{digest}.bucket"
+
+        self._lock = threading.Lock()
+        self._local_state: Optional[Tuple[float, float]] = None
+        self._shared = fcntl is not None
+        if self._shared:
+            try:
+                self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            except OSError:
+                self._shared = False
+
+    def reserve(self) -> float:
+        """
+        Reserviert ein Token
+
+        Returns:
+            Wartezeit in Sekunden, bis der Request starten darf
+        """
+        if self.rate <= 0:
+            return 0.0
+        return self._update(self._take)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Sperrt den Bucket für alle Teilnehmer (z.B. bei Retry-After)
+
+        Die nächste Reservierung startet frühestens nach ``seconds``;
+        bereits weiter in der Zukunft gebuchte Slots bleiben bestehen.
+        """
+        if self.rate <= 0 or seconds <= 0:
+            return
+
+        def block(state, now):
+            tokens, last = self._refill(state, now)
+            return (min(tokens, 1.0 - seconds * self.rate), last), None
+
+        self._update(block)
+
+    def acquire(self) -> None:
+        """Wartet (blockierend) bis ein Token verfügbar ist"""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def wait(self) -> None:
+        """Wartet (ohne die Event-Loop zu blockieren) bis ein Token verfügbar ist"""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _update(self, operation):
+        """Führt eine Zustandsänderung unter Thread- und Dateisperre aus"""
+        with self._lock:
+            if self._shared:
+                try:
+                    return self._update_shared(operation)
+                except OSError:
+                    # Zustandsdatei nicht nutzbar → prozessintern weiter
+                    self._shared = False
+            self._local_state, result = operation(self._local_state, time.time())
+            return result
+
+    def _update_shared(self, operation):
+        """Zustandsänderung mit exklusiv gesperrter Zustandsdatei"""
+        fd = os.open(self.state_file, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            raw = os.pread(fd, self._STATE_SIZE, 0)
+            state = struct.unpack(self._STATE_FORMAT, raw) if len(raw) == self._STATE_SIZE else None
+
+            state, result = operation(state, time.time())
+            os.pwrite(fd, struct.pack(self._STATE_FORMAT, *state), 0)
+            return result
+        finally:
+            os.close(fd)  # gibt auch den flock frei
+
+    def _refill(self, state: Optional[Tuple[float, float]],
+                now: float) -> Tuple[float, float]:
+        """Füllt den Bucket seit dem letzten Zeitstempel auf"""
+        if state is None:
+            return self.burst, now
+
+        tokens, last = state
+        # Uhr zurückgestellt → nicht auffüllen, Reservierungen bleiben gültig
+        elapsed = max(0.0, now - last)
+        return min(self.burst, tokens + elapsed * self.rate), max(now, last)
+
+    def _take(self, state: Optional[Tuple[float, float]],
+              now: float) -> Tuple[Tuple[float, float], float]:
+        """
+        Entnimmt ein Token (negative Tokens = bereits vergebene zukünftige Slots)
+
+        Returns:
+            (neuer Zustand, Wartezeit in Sekunden)
+        """
+        tokens, last = self._refill(state, now)
+        tokens -= 1.0
+        delay = -tokens / self.rate if tokens < 0 else 0.0
+        return (tokens, last), delay
+
+
+_limiters: Dict[Tuple[str, float, float], TokenBucketLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(host: str, credential: str, rate: float) -> TokenBucketLimiter:
+    """
+    Gibt den prozessweit gemeinsamen Limiter für Host + Zugangsdaten zurück
+
+    Args:
+        host: API-Host (z.B. eutils.ncbi.nlm.nih.gov)
+        credential: API-Key oder E-Mail ('' = anonym)
+        rate: Erlaubte Requests pro Sekunde
+
+    Returns:
+        TokenBucketLimiter
+    """
+    key = f"{host}|{credential}"
+    burst = Settings.RATE_LIMIT_BURST
+    with _limiters_lock:
+        limiter = _limiters.get((key, rate, burst))
+        if limiter is None:
+            limiter = TokenBucketLimiter(key, rate, burst=burst)
+            _limiters[(key, rate, burst)] = limiter
+        return limiter
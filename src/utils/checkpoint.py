@@ -0,0 +1,215 @@
+"""Checkpoints für fortsetzbare Suchen (--resume)"""
+
+import hashlib
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Iterator, Optional
+
+from src.utils.json_codec import JsonCodec
+
+
+class HarvestCheckpoint:
+    """
+    Speichert den Fortschritt einer unbegrenzten Suche in output/<db>/
+
+    Eine Suche besteht aus einem oder mehreren Streams (Cursor-Kette,
+    Jahres-Shard, efetch-Seite). Jede abgerufene Seite wird als eine Zeile
+    an die Spool-Datei angehängt - mit Stream, Fortsetzungsposition (z.B.
+    cursorMark, OpenAlex-Cursor, PubMed retstart) und ihren Artikeln. Die
+    Zustandsdatei enthält nur suchweite Angaben und wird nur bei deren
+    Änderung neu geschrieben, der Aufwand pro Seite ist also konstant.
+
+    Der Stream-Zustand wird beim Laden aus der Spool-Datei rekonstruiert;
+    die Artikel bleiben dort und werden erst beim Fortsetzen des jeweiligen
+    Streams gelesen. Eine beim Abbruch unvollständig geschriebene letzte
+    Zeile wird verworfen - pro Stream wird also höchstens eine Seite
+    erneut abgerufen.
+    """
+
+    VERSION = 2
+
+    def __init__(self, directory: Path, db_name: str, query: str,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            directory: Output-Verzeichnis der Datenbank (output/<db>/)
+            db_name: Name der Datenbank
+            query: Query-String (bestimmt den Dateinamen)
+            logger: Optionaler Logger
+        """
+        self.db_name = db_name
+        self.query = query
+        self.logger = logger or logging.getLogger(__name__)
+
+        digest = hashlib.sha256(f"{db_name}|{query}".encode('utf-8')).hexdigest()[:12]
+        self.state_file = Path(directory) / f"checkpoint_{digest}.json"
+        self.spool_file = Path(directory) / f"checkpoint_{digest}.jsonl"
+
+        self.meta: Dict[str, Any] = {}
+        self.streams: Dict[str, Dict[str, Any]] = {}
+        self._page_offsets: Dict[str, List[int]] = {}  # Byte-Offsets der Spool-Zeilen pro Stream
+        self._spool = None
+
+    def exists(self) -> bool:
+        """Prüft, ob für diese Query ein Checkpoint vorliegt"""
+        return self.state_file.exists()
+
+    def load(self) -> bool:
+        """
+        Lädt den Zustand und indiziert die bereits abgerufenen Seiten
+
+        Returns:
+            True wenn ein gültiger Checkpoint geladen wurde
+        """
+        if not self.exists():
+            return False
+
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = JsonCodec.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Checkpoint nicht lesbar ({e}) - Suche startet neu")
+            return False
+
+        if state.get('version') != self.VERSION or state.get('query') != self.query:
+            self.logger.warning("Checkpoint passt nicht zur Query - Suche startet neu")
+            return False
+
+        self.meta = state.get('meta', {})
+        self.streams = {}
+        self._page_offsets = {}
+
+        if self.spool_file.exists():
+            valid_end = 0
+            with open(self.spool_file, 'rb') as f:
+                offset = 0
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break  # abgeschnittene letzte Zeile
+                    try:
+                        page = JsonCodec.loads(line)
+                    except ValueError:
+                        break
+                    self._apply_page(page['stream'], len(page['articles']),
+                                     page['position'], page['done'], offset)
+                    offset += len(line)
+                    valid_end = offset
+
+            # Unvollständige Zeile abschneiden, damit neue Seiten sauber anschließen
+            if self.spool_file.stat().st_size > valid_end:
+                with open(self.spool_file, 'r+b') as f:
+                    f.truncate(valid_end)
+
+        restored = sum(stream['articles'] for stream in self.streams.values())
+        self.logger.info(f"Checkpoint geladen: {len(self.streams)} Streams, {restored} Artikel")
+        return True
+
+    def reset(self, meta: Optional[Dict[str, Any]] = None) -> None:
+        """Verwirft den Fortschritt und beginnt einen neuen Checkpoint"""
+        self.close()
+        self.meta = dict(meta or {})
+        self.streams = {}
+        self._page_offsets = {}
+        for path in (self.state_file, self.spool_file):
+            if path.exists():
+                path.unlink()
+        self._save_state()
+
+    def update_meta(self, **values: Any) -> None:
+        """Speichert suchweite Angaben (z.B. Trefferzahl, WebEnv)"""
+        self.meta.update(values)
+        self._save_state()
+
+    def stream(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Gibt den gespeicherten Zustand eines Streams zurück
+
+        Returns:
+            Dict mit 'position', 'pages', 'articles', 'done' oder None
+        """
+        return self.streams.get(key)
+
+    def articles(self, key: str) -> List[Dict[str, Any]]:
+        """Bereits abgerufene Artikel eines Streams (in Abrufreihenfolge, aus der Spool-Datei)"""
+        return [article for page in self.iter_pages(key) for article in page]
+
+    def iter_pages(self, key: str) -> Iterator[List[Dict[str, Any]]]:
+        """Bereits abgerufene Seiten eines Streams einzeln aus der Spool-Datei (in Abrufreihenfolge)"""
+        offsets = self._page_offsets.get(key)
+        if not offsets:
+            return
+
+        if self._spool:
+            self._spool.flush()
+
+        with open(self.spool_file, 'rb') as f:
+            for offset in offsets:
+                f.seek(offset)
+                yield JsonCodec.loads(f.readline())['articles']
+
+    def record_page(self, key: str, articles: List[Dict[str, Any]],
+                    position: Any = None, done: bool = False) -> None:
+        """
+        Speichert eine abgerufene Seite (eine angehängte Spool-Zeile)
+
+        Args:
+            key: Stream-Schlüssel
+            articles: Artikel der Seite
+            position: Fortsetzungsposition nach dieser Seite (Cursor, retstart, ...)
+            done: Stream vollständig abgerufen
+        """
+        spool = self._open_spool()
+        offset = spool.tell()
+        line = JsonCodec.dumps({'stream': key, 'position': position, 'done': done, 'articles': articles})
+        spool.write(line.encode('utf-8') + b'\n')
+        spool.flush()
+
+        self._apply_page(key, len(articles), position, done, offset)
+
+    def clear(self) -> None:
+        """Entfernt den Checkpoint (nach erfolgreichem Export)"""
+        self.close()
+        for path in (self.state_file, self.spool_file):
+            if path.exists():
+                path.unlink()
+
+    def close(self) -> None:
+        """Schreibt die Spool-Datei auf die Platte und schließt sie"""
+        if self._spool:
+            self._spool.flush()
+            os.fsync(self._spool.fileno())
+            self._spool.close()
+            self._spool = None
+
+    def _apply_page(self, key: str, count: int, position: Any, done: bool, offset: int) -> None:
+        """Übernimmt eine Seite in den Stream-Zustand (beim Schreiben und beim Laden)"""
+        stream = self.streams.setdefault(key, {'position': None, 'pages': 0, 'articles': 0, 'done': False})
+        stream['position'] = position
+        stream['pages'] += 1
+        stream['articles'] += count
+        stream['done'] = done
+        if count:
+            self._page_offsets.setdefault(key, []).append(offset)
+
+    def _open_spool(self):
+        if self._spool is None:
+            self.spool_file.parent.mkdir(parents=True, exist_ok=True)
+            self._spool = open(self.spool_file, 'ab')
+        return self._spool
+
+    def _save_state(self) -> None:
+        """Schreibt die suchweiten Angaben atomar (temporäre Datei + Umbenennen)"""
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        state = {
+            'version': self.VERSION,
+            'database': self.db_name,
+            'query': self.query,
+            'updated': datetime.now().isoformat(timespec='seconds'),
+            'meta': self.meta
+        }
+        tmp_file = self.state_file.with_suffix('.json.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            JsonCodec.dump(state, f)
+        os.replace(tmp_file, self.state_file)
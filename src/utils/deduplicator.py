@@ -1,13 +1,261 @@
 """Deduplicator - Entfernt Duplikate über mehrere Datenbanken hinweg"""
 
-import json
 import html
+import itertools
+import os
+import random
+import re
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Tuple, Set, Optional
+from typing import List, Dict, Any, Tuple, Set, Optional, Iterable, Iterator, Sequence
 from datetime import datetime
 from collections import defaultdict
 import logging
 
+try:
+    import numpy as np
+except ImportError:  # numpy optional (MinHash/Jaccard dann in reinem Python, deutlich langsamer)
+    np = None
+
+from src.config.settings import Settings
+from src.utils.exporter import CsvStreamWriter, Exporter
+from src.utils.file_handler import FileHandler
+
+
+def _load_result_file(database: str, path: Path, columns: Optional[List[str]],
+                      file_no: Optional[int] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Lädt eine Ergebnisdatei im Worker-Prozess (Deduplicator.load_articles)
+    
+    Args:
+        file_no: Index in Deduplicator.source_files (key_fields_only) - setzt
+                 '_ref' = (file_no, Position in der Datei) zum Nachladen
+    
+    Returns:
+        (Artikel mit 'source_database' Feld, Fehlermeldung oder None) - bei
+        einem Fehler bleiben die bis dahin gelesenen Artikel erhalten
+    """
+    articles = []
+    try:
+        for row_no, article in enumerate(FileHandler.iter_result_articles(path, columns)):
+            article['source_database'] = database
+            if file_no is not None:
+                article['_ref'] = (file_no, row_no)
+            articles.append(article)
+    except Exception as e:
+        return articles, str(e)
+    return articles, None
+
+
+class _UnionFind:
+    """
+    Disjunkte Mengen über die Indizes 0..size-1 (Pfadkompression, Union by Size)
+    
+    Optional trägt jede Menge ein Label (z.B. die DOI); zwei Mengen mit
+    verschiedenen Labels werden nie vereinigt.
+    """
+    
+    def __init__(self, size: int, labels: Optional[List[str]] = None):
+        self.parent = list(range(size))
+        self.size = [1] * size
+        self.labels = list(labels) if labels is not None else [''] * size
+    
+    def find(self, i: int) -> int:
+        root = i
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[i] != root:
+            self.parent[i], i = root, self.parent[i]
+        return root
+    
+    def union(self, i: int, j: int) -> bool:
+        """Vereinigt die Mengen von i und j (False bei verschiedenen Labels)"""
+        root_i, root_j = self.find(i), self.find(j)
+        if root_i == root_j:
+            return True
+        label_i, label_j = self.labels[root_i], self.labels[root_j]
+        if label_i and label_j and label_i != label_j:
+            return False
+        if self.size[root_i] < self.size[root_j]:
+            root_i, root_j = root_j, root_i
+        self.parent[root_j] = root_i
+        self.size[root_i] += self.size[root_j]
+        self.labels[root_i] = label_i or label_j
+        return True
+
+
+def _index_pairs(left: List[int], right: Optional[List[int]] = None,
+                 offset: int = 0) -> Tuple[Sequence[int], Sequence[int]]:
+    """
+    Alle Paare left × right bzw. (ohne right) alle Paare i < j aus left
+    
+    Returns:
+        (linke Indizes, rechte Indizes) jeweils + offset - numpy-Arrays für
+        viele Paare (wenn numpy installiert ist), sonst Listen
+    """
+    count = len(left) * (len(left) - 1) // 2 if right is None else len(left) * len(right)
+    if np is None or count < 256:
+        pairs = list(itertools.combinations(left, 2) if right is None else itertools.product(left, right))
+        return [i + offset for i, _ in pairs], [j + offset for _, j in pairs]
+    
+    left_array = np.asarray(left, dtype=np.int64) + offset
+    if right is None:
+        i, j = np.triu_indices(len(left_array), 1)
+        return left_array[i], left_array[j]
+    right_array = np.asarray(right, dtype=np.int64) + offset
+    return np.repeat(left_array, len(right_array)), np.tile(right_array, len(left_array))
+
+
+class _JaccardBatch:
+    """
+    Wort-Jaccard-Ähnlichkeit (wie Deduplicator.text_similarity) für viele Textpaare
+    
+    Jeder Text wird einmal in Wörter zerlegt; die Wortmengen liegen als dünn
+    besetzte Matrix im CSR-Format vor (Zeilen-Offsets + sortierte Wort-IDs).
+    Die Schnittmengen aller Paare werden in einem vektorisierten Schritt
+    gezählt: jedes Wort der linken Zeile wird per binärer Suche in den
+    Schlüsseln (Zeile, Wort) der rechten Zeile nachgeschlagen.
+    Ohne numpy werden Python-Mengen verglichen.
+    """
+    
+    PAIR_CHUNK = 65536  # Paare pro Schritt (begrenzt den Zwischenspeicher)
+    
+    def __init__(self, texts: List[str]):
+        vocabulary: Dict[str, int] = {}
+        rows = [sorted({vocabulary.setdefault(word, len(vocabulary)) for word in text.split()})
+                for text in texts]
+        
+        if np is None:
+            self.sets = [set(row) for row in rows]
+            return
+        
+        self.width = max(len(vocabulary), 1)
+        self.sizes = np.array([len(row) for row in rows], dtype=np.int64)
+        self.indptr = np.concatenate(([0], np.cumsum(self.sizes)))
+        self.indices = np.fromiter(itertools.chain.from_iterable(rows), dtype=np.int64,
+                                   count=int(self.indptr[-1]))
+        # Schlüssel Zeile * Vokabulargröße + Wort-ID - aufsteigend sortiert
+        self.keys = np.repeat(np.arange(len(rows), dtype=np.int64), self.sizes) * self.width + self.indices
+    
+    def similarities(self, left: Sequence[int], right: Sequence[int]) -> List[float]:
+        """Jaccard-Ähnlichkeit (0.0 - 1.0) für jedes Paar (left[k], right[k]) von Text-Indizes"""
+        if np is None:
+            return [len(self.sets[i] & self.sets[j]) / len(self.sets[i] | self.sets[j])
+                    if self.sets[i] and self.sets[j] else 0.0 for i, j in zip(left, right)]
+        
+        result: List[float] = []
+        all_left = np.asarray(left, dtype=np.int64)
+        all_right = np.asarray(right, dtype=np.int64)
+        for start in range(0, len(all_left), self.PAIR_CHUNK):
+            left = all_left[start:start + self.PAIR_CHUNK]
+            right = all_right[start:start + self.PAIR_CHUNK]
+            lengths = self.sizes[left]
+            
+            # Alle Wörter der linken Zeilen hintereinander, je mit Paar-Nummer
+            pair_ids = np.repeat(np.arange(len(left)), lengths)
+            positions = np.repeat(self.indptr[left] - (np.cumsum(lengths) - lengths), lengths)
+            words = self.indices[positions + np.arange(len(pair_ids))]
+            
+            queries = right[pair_ids] * self.width + words
+            found = np.minimum(np.searchsorted(self.keys, queries), max(len(self.keys) - 1, 0))
+            hits = self.keys[found] == queries if len(queries) else np.zeros(0, dtype=bool)
+            
+            intersection = np.bincount(pair_ids, weights=hits, minlength=len(left))
+            union = lengths + self.sizes[right] - intersection
+            result.extend(np.divide(intersection, union, out=np.zeros(len(left)),
+                                    where=(union > 0) & (lengths > 0) & (self.sizes[right] > 0)).tolist())
+        return result
+
+
+class _MinHashLSH:
+    """
+    MinHash-Signaturen mit Locality Sensitive Hashing (Banding)
+    
+    Jeder Text (ASCII, siehe Deduplicator.fuzzy_text) wird in Zeichen-Shingles
+    der Länge shingle_size zerlegt und auf bands * rows MinHash-Werte
+    abgebildet. Zwei Texte werden Kandidaten, wenn sie in mindestens einem
+    Band in allen rows Werten übereinstimmen - bei Jaccard-Ähnlichkeit s der
+    Shingle-Mengen mit Wahrscheinlichkeit 1 - (1 - s^rows)^bands (Schwelle
+    etwa (1/bands)^(1/rows)). Der Aufwand ist linear in der Anzahl Texte;
+    verglichen werden nur Kandidaten.
+    """
+    
+    MASK = (1 << 64) - 1
+    BATCH_SIZE = 256  # Texte pro vektorisiertem Schritt (numpy)
+    
+    def __init__(self, bands: int, rows: int, shingle_size: int = 5, seed: int = 1):
+        self.bands = bands
+        self.rows = rows
+        self.shingle_size = shingle_size
+        rnd = random.Random(seed)
+        # Multiply-Shift-Hashing: h -> ((a * h + b) mod 2^64) >> 32, a ungerade
+        self.coefficients = [(rnd.getrandbits(64) | 1, rnd.getrandbits(64))
+                             for _ in range(bands * rows)]
+        if np is not None:
+            self._a = np.array([a for a, _ in self.coefficients], dtype=np.uint64)[:, None]
+            self._b = np.array([b for _, b in self.coefficients], dtype=np.uint64)[:, None]
+    
+    def shingle_hashes(self, text: str) -> Set[int]:
+        """
+        Shingles eines (nicht leeren) ASCII-Texts als Zahlen
+        
+        Ein Shingle wird als Zahl zur Basis 256 gelesen (5 Zeichen = 40 Bit,
+        kollisionsfrei).
+        """
+        data = text.encode('ascii')
+        width = min(self.shingle_size, len(data))
+        return {int.from_bytes(data[i:i + width], 'big') for i in range(len(data) - width + 1)}
+    
+    def _shingle_array(self, text: str) -> 'np.ndarray':
+        """Wie shingle_hashes, vektorisiert (sortiert, ohne Wiederholungen)"""
+        codes = np.frombuffer(text.encode('ascii'), dtype=np.uint8).astype(np.uint64)
+        width = min(self.shingle_size, len(codes))
+        count = len(codes) - width + 1
+        hashes = np.zeros(count, dtype=np.uint64)
+        for offset in range(width):
+            hashes = hashes * np.uint64(256) + codes[offset:offset + count]
+        return np.unique(hashes)
+    
+    def signatures(self, texts: List[str]) -> List[Optional[Tuple[int, ...]]]:
+        """MinHash-Signaturen (None für leere Texte)"""
+        if np is None:
+            return [tuple(min(((a * h + b) & self.MASK) >> 32 for h in self.shingle_hashes(text))
+                          for a, b in self.coefficients) if text else None
+                    for text in texts]
+        
+        result: List[Optional[Tuple[int, ...]]] = [None] * len(texts)
+        indices = [i for i, text in enumerate(texts) if text]
+        shift = np.uint64(32)
+        for start in range(0, len(indices), self.BATCH_SIZE):
+            batch = indices[start:start + self.BATCH_SIZE]
+            arrays = [self._shingle_array(texts[i]) for i in batch]
+            offsets = np.cumsum([0] + [len(array) for array in arrays[:-1]])
+            values = (self._a * np.concatenate(arrays)[None, :] + self._b) >> shift
+            minima = np.minimum.reduceat(values, offsets, axis=1)
+            for i, signature in zip(batch, minima.T.tolist()):
+                result[i] = tuple(signature)
+        return result
+    
+    def candidate_buckets(self, texts: List[str]) -> Iterator[List[int]]:
+        """
+        Liefert LSH-Buckets mit mindestens zwei Indizes (Kandidaten-Gruppen)
+        
+        Leere Texte werden übersprungen. Die Buckets werden Band für Band
+        gebildet, es liegt jeweils nur ein Band-Index im Speicher.
+        """
+        signatures = self.signatures(texts)
+        
+        for band in range(self.bands):
+            start = band * self.rows
+            buckets = defaultdict(list)
+            for i, signature in enumerate(signatures):
+                if signature is not None:
+                    buckets[signature[start:start + self.rows]].append(i)
+            for members in buckets.values():
+                if len(members) > 1:
+                    yield members
+
 
 class Deduplicator:
     """Klasse für Cross-Database Deduplication"""
@@ -19,6 +267,32 @@ class Deduplicator:
         'openalex': 3
     }
     
+    # Felder, die beim Vergleich (abstract nur bei Jahr-Konflikten) und
+    # Export genutzt werden - weitere Spalten werden nicht geladen
+    COMPARE_COLUMNS = ['authors', 'title', 'year', 'doi', 'url', 'abstract']
+    
+    # Modus key_fields_only: nur die Gruppierungs-Schlüssel laden; abstract
+    # (Jahr-Konflikte) und alle Felder für den Export werden nachgeladen
+    KEY_COLUMNS = ['authors', 'title', 'year', 'doi', 'url']
+    
+    # Identifikatoren für den Hash-Join vor der Text-Gruppierung
+    DOI_PREFIX = re.compile(r'^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)', re.IGNORECASE)
+    PMID_URL = re.compile(r'(?:pubmed\.ncbi\.nlm\.nih\.gov/|ncbi\.nlm\.nih\.gov/pubmed/|'
+                          r'europepmc\.org/(?:article|abstract)/MED/)(\d+)', re.IGNORECASE)
+    PMCID_URL = re.compile(r'(?:europepmc\.org/(?:article|abstract)/PMC/|ncbi\.nlm\.nih\.gov/pmc/articles/|'
+                           r'pmc\.ncbi\.nlm\.nih\.gov/articles/)(?:PMC)?(\d+)', re.IGNORECASE)
+    
+    # Unscharfe Duplikate: griechische Buchstaben ausschreiben (α → alpha),
+    # Zeichen-Shingles der Länge SHINGLE_SIZE über Titel + Abstract-Anfang
+    GREEK_LETTERS = {cp: f" {unicodedata.name(chr(cp)).split()[-1].lower()} "
+                     for cp in range(0x391, 0x3CA) if unicodedata.name(chr(cp), '').startswith('GREEK')}
+    NON_ALPHANUMERIC = re.compile(r'[^a-z0-9]+')
+    SHINGLE_SIZE = 5
+    
+    # LSH-Buckets bis zu dieser Größe werden in alle Paare expandiert; größere
+    # (z.B. tausende "Erratum"-Titel) nur innerhalb von (Jahr, Erstautor)-Gruppen
+    FUZZY_FULL_BUCKET_SIZE = 64
+    
     def __init__(self, output_base_dir: Path, logger: Optional[logging.Logger] = None):
         """
         Args:
@@ -42,10 +316,14 @@ class Deduplicator:
         })
         # Duplikate-Details (für detailliertes Logging)
         self.duplicates_details = []
+        # Quelldateien der Artikel aus key_fields_only: '_ref' = (Index, Position)
+        self.source_files: List[Tuple[str, Path]] = []
+        # Normalisierte Abstracts (id(Artikel) -> Text), nur während deduplicate
+        self._abstract_cache: Dict[int, str] = {}
     
     def collect_json_files(self, databases: List[str]) -> Dict[str, List[Path]]:
         """
-        Sammelt alle JSON-Files aus den angegebenen Datenbank-Verzeichnissen
+        Sammelt alle Ergebnisdateien (.json, .jsonl und .parquet) aus den angegebenen Datenbank-Verzeichnissen
         
         Args:
             databases: Liste von Datenbanknamen (z.B. ['pubmed', 'europepmc'])
@@ -62,8 +340,8 @@ class Deduplicator:
                 json_files[db] = []
                 continue
             
-            # Rekursiv alle JSON-Files finden (auch in Subfoldern)
-            all_json_files = list(db_dir.rglob('*.json'))
+            # Rekursiv alle Ergebnisdateien finden (JSON/JSONL/Parquet, auch komprimiert und in Subfoldern)
+            all_json_files = sorted(f for f in db_dir.rglob('*') if FileHandler.is_result_file(f))
             
             # Spezielle Behandlung für OpenAlex: Nur finale Dateien (openalex_*.json)
             # Ignoriere Query-Zwischendateien
@@ -79,44 +357,177 @@ class Deduplicator:
         
         return json_files
     
-    def load_articles(self, json_files: Dict[str, List[Path]]) -> List[Dict[str, Any]]:
+    def load_articles(self, json_files: Dict[str, List[Path]],
+                      columns: Optional[List[str]] = None,
+                      workers: Optional[int] = None,
+                      key_fields_only: Optional[bool] = None) -> List[Dict[str, Any]]:
         """
         Lädt alle Artikel aus den JSON-Files
         
+        Mehrere Dateien werden in einem Prozess-Pool parallel geparst;
+        Reihenfolge der Artikel und Statistiken entsprechen dem seriellen
+        Laden (iter_articles).
+        
         Args:
             json_files: Dict mit Datenbank -> Liste von JSON-Files
+            columns: Zu ladende Felder (None = COMPARE_COLUMNS)
+            workers: Anzahl Prozesse (None = Settings.DEDUP_LOAD_WORKERS, 1 = seriell)
+            key_fields_only: Nur KEY_COLUMNS laden, Rest bei Bedarf nachladen
+                             (None = Settings.DEDUP_KEY_FIELDS_ONLY)
             
         Returns:
             Liste aller Artikel mit 'source_database' Feld
         """
-        all_articles = []
+        if key_fields_only is None:
+            key_fields_only = Settings.DEDUP_KEY_FIELDS_ONLY
+        if workers is None:
+            workers = Settings.DEDUP_LOAD_WORKERS or os.cpu_count() or 1
+        
+        tasks = [(database, json_file) for database, files in json_files.items() for json_file in files]
+        workers = min(workers, len(tasks))
+        if workers <= 1:
+            return list(self.iter_articles(json_files, columns, key_fields_only))
+        
+        if columns is None:
+            columns = self.KEY_COLUMNS if key_fields_only else self.COMPARE_COLUMNS
+        file_numbers = [self._register_source(database, json_file) if key_fields_only else None
+                        for database, json_file in tasks]
+        
+        articles = []
+        db_articles_count = {database: 0 for database in json_files}
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(_load_result_file,
+                                   [database for database, _ in tasks],
+                                   [json_file for _, json_file in tasks],
+                                   [columns] * len(tasks),
+                                   file_numbers)
+            
+            # map liefert in Auftragsreihenfolge → gleiche Artikel-Reihenfolge wie seriell
+            for (database, json_file), (file_articles, error) in zip(tasks, results):
+                if error:
+                    print(f"⚠ Fehler beim Laden von {json_file}: {error}")
+                articles.extend(file_articles)
+                db_articles_count[database] += len(file_articles)
+        
+        for database, files in json_files.items():
+            self.per_database_stats[database]['files_found'] = len(files)
+            self.per_database_stats[database]['articles_loaded'] = db_articles_count[database]
+            self.stats['articles_loaded'] += db_articles_count[database]
+            if self.logger:
+                self.logger.info(f"{database}: {db_articles_count[database]} Artikel geladen")
+        
+        return articles
+    
+    def iter_articles(self, json_files: Dict[str, List[Path]],
+                      columns: Optional[List[str]] = None,
+                      key_fields_only: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Liefert die Artikel der JSON-Files Datei für Datei
+        
+        Kann direkt an deduplicate übergeben werden; die Statistiken
+        werden beim Durchlaufen aktualisiert. Aus Parquet-Dateien werden
+        nur die angeforderten Spalten gelesen.
+        
+        Args:
+            json_files: Dict mit Datenbank -> Liste von JSON-Files
+            columns: Zu ladende Felder (None = COMPARE_COLUMNS bzw. KEY_COLUMNS)
+            key_fields_only: Nur KEY_COLUMNS laden; jeder Artikel erhält eine
+                             Referenz '_ref' auf seine Quelldatei zum Nachladen
+            
+        Yields:
+            Artikel mit 'source_database' Feld
+        """
+        if columns is None:
+            columns = self.KEY_COLUMNS if key_fields_only else self.COMPARE_COLUMNS
         
         for database, files in json_files.items():
             db_articles_count = 0
             self.per_database_stats[database]['files_found'] = len(files)
             
             for json_file in files:
+                file_no = self._register_source(database, json_file) if key_fields_only else None
+                file_count = 0
                 try:
-                    with open(json_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        articles = data.get('articles', [])
-                        
+                    # JSONL zeilenweise, JSON als Dokument (große Dateien inkrementell), Parquet spaltenweise
+                    for article in FileHandler.iter_result_articles(json_file, columns):
                         # Füge Quelldatenbank zu jedem Artikel hinzu
-                        for article in articles:
-                            article['source_database'] = database
-                            all_articles.append(article)
-                        
-                        db_articles_count += len(articles)
-                        self.stats['articles_loaded'] += len(articles)
+                        article['source_database'] = database
+                        if file_no is not None:
+                            article['_ref'] = (file_no, file_count)
+                        file_count += 1
+                        yield article
                 
                 except Exception as e:
                     print(f"⚠ Fehler beim Laden von {json_file}: {e}")
+                
+                db_articles_count += file_count
+                self.stats['articles_loaded'] += file_count
             
             self.per_database_stats[database]['articles_loaded'] = db_articles_count
             if self.logger:
                 self.logger.info(f"{database}: {db_articles_count} Artikel geladen")
+    
+    def _register_source(self, database: str, path: Path) -> int:
+        """Merkt sich eine Quelldatei für das Nachladen (key_fields_only)"""
+        self.source_files.append((database, path))
+        return len(self.source_files) - 1
+    
+    def load_lazy_fields(self, articles: Iterable[Dict[str, Any]], fields: List[str]) -> None:
+        """
+        Lädt fehlende Felder von Artikeln aus key_fields_only nach (in place)
         
-        return all_articles
+        Jede betroffene Quelldatei wird einmal gestreamt und nur bis zum
+        letzten benötigten Artikel gelesen. Felder, die in der Datei fehlen,
+        werden auf None gesetzt.
+        
+        Args:
+            articles: Artikel (ohne '_ref' werden übersprungen)
+            fields: Nachzuladende Felder (z.B. ['abstract'])
+        """
+        pending = defaultdict(dict)  # Datei-Index -> {Position: Artikel}
+        for article in articles:
+            ref = article.get('_ref')
+            if ref is not None and any(field not in article for field in fields):
+                pending[ref[0]][ref[1]] = article
+        
+        for file_no in sorted(pending):
+            rows = pending[file_no]
+            last_row = max(rows)
+            for row_no, record in enumerate(FileHandler.iter_result_articles(self.source_files[file_no][1], fields)):
+                article = rows.get(row_no)
+                if article is not None:
+                    for field in fields:
+                        article[field] = record.get(field)
+                if row_no >= last_row:
+                    break
+    
+    def iter_full_articles(self, articles: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Liefert die vollständigen Datensätze (alle Felder) für den Export
+        
+        Artikel aus key_fields_only werden dateiweise aus ihrer Quelldatei
+        gelesen (Reihenfolge: nach Datei und Position); vollständig geladene
+        Artikel werden unverändert durchgereicht.
+        """
+        pending = defaultdict(dict)  # Datei-Index -> {Position: Artikel}
+        for article in articles:
+            ref = article.get('_ref')
+            if ref is None:
+                yield article
+            else:
+                pending[ref[0]][ref[1]] = article
+        
+        for file_no in sorted(pending):
+            rows = pending[file_no]
+            last_row = max(rows)
+            for row_no, record in enumerate(FileHandler.iter_result_articles(self.source_files[file_no][1])):
+                article = rows.get(row_no)
+                if article is not None:
+                    record['source_database'] = article['source_database']
+                    yield record
+                if row_no >= last_row:
+                    break
     
     @staticmethod
     def normalize_title(title: str) -> str:
@@ -144,6 +555,47 @@ class Deduplicator:
         # Lowercase & trim
         return title.lower().strip()
     
+    @classmethod
+    def normalize_doi(cls, doi: Optional[str]) -> str:
+        """
+        Normalisiert eine DOI (ohne doi.org-Präfix, lowercase)
+        
+        Returns:
+            Normalisierte DOI oder '' wenn keine gültige DOI vorliegt
+        """
+        if not doi or doi == 'N/A':
+            return ''
+        doi = cls.DOI_PREFIX.sub('', str(doi).strip()).strip().lower()
+        return doi if doi.startswith('10.') else ''
+    
+    @classmethod
+    def extract_identifiers(cls, article: Dict[str, Any]) -> List[str]:
+        """
+        Ermittelt die Identifikatoren eines Artikels
+        
+        DOI aus dem Feld doi (oder einer doi.org-URL), PMID und PMCID aus
+        PubMed-, PMC- und Europe-PMC-URLs.
+        
+        Returns:
+            Schlüssel wie 'doi:10.1000/xyz', 'pmid:123456', 'pmcid:654321'
+        """
+        identifiers = []
+        url = str(article.get('url') or '')
+        
+        doi = cls.normalize_doi(article.get('doi')) or cls.normalize_doi(url)
+        if doi:
+            identifiers.append(f"doi:{doi}")
+        
+        match = cls.PMID_URL.search(url)
+        if match:
+            identifiers.append(f"pmid:{match.group(1)}")
+        
+        match = cls.PMCID_URL.search(url)
+        if match:
+            identifiers.append(f"pmcid:{match.group(1)}")
+        
+        return identifiers
+    
     @staticmethod
     def normalize_abstract(abstract: str, max_length: int = 200) -> str:
         """
@@ -168,6 +620,29 @@ class Deduplicator:
         # Lowercase, trim, kürzen
         return abstract.lower().strip()[:max_length]
     
+    @classmethod
+    def fuzzy_text(cls, text: str) -> str:
+        """
+        Normalisiert Text für den unscharfen Vergleich
+        
+        Wie normalize_title, zusätzlich: griechische Buchstaben ausgeschrieben,
+        Akzente entfernt, alle Satz- und Sonderzeichen durch Leerzeichen ersetzt
+        ("TNF-α: A Review." → "tnf alpha a review").
+        """
+        if not text or text == 'N/A':
+            return ''
+        
+        text = unicodedata.normalize('NFKC', html.unescape(text)).translate(cls.GREEK_LETTERS)
+        text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+        return ' '.join(cls.NON_ALPHANUMERIC.sub(' ', text.lower()).split())
+    
+    def _normalized_abstract(self, article: Dict[str, Any]) -> str:
+        """normalize_abstract mit Cache pro Artikel (gültig während deduplicate)"""
+        key = id(article)
+        if key not in self._abstract_cache:
+            self._abstract_cache[key] = self.normalize_abstract(article.get('abstract') or '')
+        return self._abstract_cache[key]
+    
     @staticmethod
     def text_similarity(text1: str, text2: str) -> float:
         """
@@ -192,38 +667,53 @@ class Deduplicator:
         
         return len(intersection) / len(union) if union else 0.0
     
-    def deduplicate(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def deduplicate(self, articles: Iterable[Dict[str, Any]],
+                    fuzzy: Optional[bool] = None) -> List[Dict[str, Any]]:
         """
-        Entfernt Duplikate basierend auf (authors, normalized_title)
+        Entfernt Duplikate basierend auf DOI/PMID/PMCID und (authors, normalized_title)
         Mit intelligenter Jahr-Prüfung über DOI/URL/Abstract
+        Optional: unscharfe Duplikate (Titel/Abstract fast gleich) per MinHash/LSH
         Bei Duplikaten: Behalte Artikel mit höchster Priorität
         
         Args:
-            articles: Liste aller Artikel (mit 'source_database' Feld)
+            articles: Alle Artikel (mit 'source_database' Feld) - Liste oder
+                      Stream, z.B. iter_articles() oder adapter.search_iter()
+            fuzzy: Unscharfe Duplikate suchen (Standard: Settings.DEDUP_FUZZY)
             
         Returns:
             Liste eindeutiger Artikel
         """
+        duplicates_count = 0
+        db_duplicates = defaultdict(int)
+        self._abstract_cache.clear()
+        
+        # STUFE 0: Hash-Join über Identifikatoren (Autoren-Schreibweisen
+        # unterscheiden sich zwischen den Datenbanken)
+        articles, duplicates_count = self._join_on_identifiers(list(articles), db_duplicates)
+        
         # STUFE 1: Gruppiere Artikel nach (authors, normalized_title) - OHNE Jahr
-        groups = defaultdict(list)
+        heads, groups = self._group_by_text_key(articles)
         
-        for article in articles:
-            # Normalisiere Schlüssel-Felder
-            authors = (article.get('authors') or '').lower().strip()
-            title_norm = self.normalize_title(article.get('title') or '')
-            
-            key = (authors, title_norm)
-            groups[key].append(article)
+        # Gruppen mit Jahr-Konflikt gemeinsam clustern (Abstract-Vergleich in einem Batch)
+        conflict_heads = [head for head, group_articles in groups.items()
+                          if len({(a.get('year') or '').strip() for a in group_articles}) > 1]
+        
+        # key_fields_only: Abstracts nur für Gruppen mit Jahr-Konflikt nachladen
+        if self.source_files:
+            self.load_lazy_fields((article for head in conflict_heads for article in groups[head]),
+                                  ['abstract'])
+        
+        year_clusters = dict(zip(conflict_heads,
+                                 self._cluster_year_conflicts([groups[head] for head in conflict_heads])))
         
         # STUFE 2: Für jede Gruppe - intelligente Duplikats-Prüfung
         unique_articles = []
-        duplicates_count = 0
-        db_duplicates = defaultdict(int)
         
-        for key, group_articles in groups.items():
-            if len(group_articles) == 1:
+        for head in heads:
+            group_articles = groups.get(head)
+            if group_articles is None:
                 # Kein Duplikat
-                unique_articles.append(group_articles[0])
+                unique_articles.append(articles[head])
             else:
                 # Mehrere Artikel mit gleichen Autoren und Titel
                 # Gruppiere nach Jahr
@@ -250,47 +740,19 @@ class Deduplicator:
                         self._log_duplicate(article, kept_article, db_duplicates)
                 
                 else:
-                    # Fall B: Unterschiedliche Jahre → intelligente Prüfung
-                    potential_duplicates = []
-                    
-                    # Gruppiere Artikel die potenziell Duplikate sind
-                    processed_indices = set()
-                    
-                    for i, article1 in enumerate(group_articles):
-                        if i in processed_indices:
-                            continue
-                        
-                        duplicate_group = [article1]
-                        
-                        for j, article2 in enumerate(group_articles[i+1:], start=i+1):
-                            if j in processed_indices:
-                                continue
-                            
-                            # Prüfe ob Duplikat trotz unterschiedlicher Jahre
-                            if self._are_duplicates_despite_year_difference(article1, article2):
-                                duplicate_group.append(article2)
-                                processed_indices.add(j)
-                        
-                        # Behalte bestes Artikel aus Duplikat-Gruppe
-                        if len(duplicate_group) > 1:
-                            sorted_group = sorted(
-                                duplicate_group,
-                                key=lambda a: self.DATABASE_PRIORITY.get(
-                                    a.get('source_database', ''), 999
-                                )
-                            )
-                            kept_article = sorted_group[0]
-                            unique_articles.append(kept_article)
-                            duplicates_count += len(sorted_group) - 1
-                            
-                            # Logging
-                            for article in sorted_group[1:]:
-                                self._log_duplicate(article, kept_article, db_duplicates,
-                                                   reason="Jahr-Konflikt (DOI/URL/Abstract)")
-                        else:
-                            unique_articles.append(article1)
-                        
-                        processed_indices.add(i)
+                    # Fall B: Unterschiedliche Jahre → intelligente Prüfung (DOI/URL/Abstract)
+                    remaining, group_duplicates = self._keep_best_per_cluster(
+                        group_articles, year_clusters[head],
+                        db_duplicates, reason="Jahr-Konflikt (DOI/URL/Abstract)")
+                    unique_articles.extend(remaining)
+                    duplicates_count += group_duplicates
+        
+        # STUFE 3 (optional): Unscharfe Duplikate über Gruppengrenzen hinweg
+        if Settings.DEDUP_FUZZY if fuzzy is None else fuzzy:
+            unique_articles, fuzzy_count = self._merge_near_duplicates(unique_articles, db_duplicates)
+            duplicates_count += fuzzy_count
+        
+        self._abstract_cache.clear()  # ids gelten nur solange die Artikel leben
         
         # Update Statistiken
         for db in self.per_database_stats.keys():
@@ -306,55 +768,322 @@ class Deduplicator:
         
         return unique_articles
     
-    def _are_duplicates_despite_year_difference(self, article1: Dict[str, Any], 
-                                                article2: Dict[str, Any]) -> bool:
+    def _text_key(self, article: Dict[str, Any]) -> str:
         """
-        Prüft ob zwei Artikel Duplikate sind, trotz unterschiedlicher Jahre
+        Normalisierter Schlüssel (authors, title) für die exakte Gruppierung
         
-        Prüfungs-Reihenfolge:
-        1. DOI identisch (und beide vorhanden)
-        2. URL identisch (und beide vorhanden)
-        3. Abstract-Ähnlichkeit > 80%
+        Ein einzelner String statt eines Tupels: str cached seinen Hash, die
+        Länge der Autoren vorn hält verschiedene Paare auseinander.
+        """
+        authors = (article.get('authors') or '').lower().strip()
+        return f"{len(authors)}:{authors}{self.normalize_title(article.get('title') or '')}"
+    
+    def _group_by_text_key(self, articles: List[Dict[str, Any]]) -> Tuple[List[int], Dict[int, List[Dict[str, Any]]]]:
+        """
+        Gruppiert Artikel nach (authors, normalized_title)
+        
+        Jeder Schlüssel wird genau einmal berechnet. Mit numpy spaltenweise:
+        die 64-Bit-Hashes der Schlüssel liegen in einem Array, Gruppen
+        entstehen durch stabiles Sortieren. Nur Gruppen mit mehreren
+        Mitgliedern werden gegen die gespeicherten Schlüssel geprüft (damit
+        Hash-Kollisionen keine Gruppen verschmelzen); Einzelartikel bleiben
+        reine Indizes.
+        
+        Returns:
+            (Index des ersten Artikels jeder Gruppe - aufsteigend, also in
+            Reihenfolge des ersten Auftretens, {erster Index: Artikel} nur für
+            Gruppen mit mehreren Artikeln)
+        """
+        keys = [self._text_key(article) for article in articles]
+        
+        if np is None or not articles:
+            positions = defaultdict(list)
+            for i, key in enumerate(keys):
+                positions[key].append(i)
+            heads = [members[0] for members in positions.values()]
+            groups = {members[0]: [articles[i] for i in members]
+                      for members in positions.values() if len(members) > 1}
+            return heads, groups
+        
+        hashes = np.fromiter(map(hash, keys), dtype=np.int64, count=len(keys))
+        order = np.argsort(hashes, kind='stable')  # innerhalb einer Gruppe aufsteigende Indizes
+        sorted_hashes = hashes[order]
+        starts = np.flatnonzero(np.concatenate(([True], sorted_hashes[1:] != sorted_hashes[:-1])))
+        sizes = np.diff(np.append(starts, len(articles)))
+        
+        heads = order[starts[sizes == 1]].tolist()
+        groups = {}
+        for start, size in zip(starts[sizes > 1].tolist(), sizes[sizes > 1].tolist()):
+            members = order[start:start + size].tolist()
+            first_key = keys[members[0]]
+            if all(keys[i] == first_key for i in members):
+                by_key = {first_key: members}
+            else:  # Hash-Kollision
+                by_key = defaultdict(list)
+                for i in members:
+                    by_key[keys[i]].append(i)
+            for members in by_key.values():
+                heads.append(members[0])
+                if len(members) > 1:
+                    groups[members[0]] = [articles[i] for i in members]
+        
+        heads.sort()
+        return heads, groups
+    
+    def _join_on_identifiers(self, articles: List[Dict[str, Any]],
+                             db_duplicates: Dict[str, int]) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Fasst Artikel mit gemeinsamer DOI, PMID oder PMCID zusammen (Hash-Join)
+        
+        Jeder Identifikator wird einmal in einem Dict nachgeschlagen, die
+        Gruppen entstehen per Union-Find (auch transitiv, z.B. PubMed ~ Europe
+        PMC über die PMID, Europe PMC ~ OpenAlex über die DOI). Gruppen mit
+        zwei verschiedenen DOIs werden nicht zusammengeführt.
+        
+        Returns:
+            (Artikel ohne Identifikator-Treffer plus je ein behaltener Artikel
+            pro Gruppe - in Reihenfolge des ersten Auftretens, Anzahl entfernter Duplikate)
+        """
+        identifiers = [self.extract_identifiers(article) for article in articles]
+        # Label = DOI: Unterschiedliche DOIs → definitiv keine Duplikate
+        clusters = _UnionFind(len(articles), [ids[0] if ids and ids[0].startswith('doi:') else ''
+                                              for ids in identifiers])
+        first_seen: Dict[str, int] = {}  # Identifikator -> Index
+        
+        for i, article_identifiers in enumerate(identifiers):
+            for identifier in article_identifiers:
+                j = first_seen.setdefault(identifier, i)
+                if j != i:
+                    clusters.union(i, j)
+        
+        return self._keep_best_per_cluster(articles, clusters, db_duplicates, reason="DOI/PMID/PMCID")
+    
+    def _merge_near_duplicates(self, articles: List[Dict[str, Any]], db_duplicates: Dict[str, int],
+                               bands: Optional[int] = None, rows: Optional[int] = None,
+                               threshold: Optional[float] = None) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Fasst unscharfe Duplikate zusammen (MinHash/LSH über Titel + Abstract)
+        
+        Erkennt Titel, die sich nur in Satzzeichen, griechischen Buchstaben
+        oder einem Untertitel unterscheiden. LSH liefert Kandidaten-Gruppen in
+        linearer Zeit, die Paare pro Gruppe sind begrenzt (_bucket_pairs). Jedes
+        Kandidatenpaar wird mit text_similarity geprüft
+        und muss zusätzlich im Jahr übereinstimmen, keine verschiedenen DOIs
+        haben und (falls beide Autoren haben) einen Autorennamen teilen.
         
         Args:
-            article1: Erster Artikel
-            article2: Zweiter Artikel
+            articles: Artikel nach der exakten Deduplizierung
+            db_duplicates: Duplikats-Zähler pro Datenbank
+            bands: LSH-Bänder (Standard: Settings.DEDUP_LSH_BANDS)
+            rows: MinHash-Werte pro Band (Standard: Settings.DEDUP_LSH_ROWS)
+            threshold: Mindest-Ähnlichkeit (Standard: Settings.DEDUP_FUZZY_THRESHOLD)
             
         Returns:
-            True wenn Duplikat, False sonst
+            (Artikel mit je einem behaltenen Artikel pro Gruppe, Anzahl entfernter Duplikate)
         """
-        # Prüfe DOI
-        doi1 = (article1.get('doi') or '').strip()
-        doi2 = (article2.get('doi') or '').strip()
+        bands = bands or Settings.DEDUP_LSH_BANDS
+        rows = rows or Settings.DEDUP_LSH_ROWS
+        threshold = Settings.DEDUP_FUZZY_THRESHOLD if threshold is None else threshold
         
-        if doi1 and doi2 and doi1 != 'N/A' and doi2 != 'N/A':
-            if doi1.lower() == doi2.lower():
-                return True
-            else:
-                # Unterschiedliche DOIs → definitiv keine Duplikate
-                return False
+        # key_fields_only: Abstracts werden für die Shingles benötigt
+        if self.source_files:
+            self.load_lazy_fields(articles, ['abstract'])
         
-        # Prüfe URL
-        url1 = (article1.get('url') or '').strip()
-        url2 = (article2.get('url') or '').strip()
+        texts = [f"{self.fuzzy_text(article.get('title') or '')} "
+                 f"{self.fuzzy_text(self._normalized_abstract(article))}".strip()
+                 for article in articles]
         
-        if url1 and url2 and url1 != 'N/A' and url2 != 'N/A':
-            if url1.lower() == url2.lower():
-                return True
+        chain_keys = [self._chain_key(article) for article in articles]
+        lsh = _MinHashLSH(bands, rows, self.SHINGLE_SIZE)
+        candidates = set()  # über alle Bänder dedupliziert
+        for members in lsh.candidate_buckets(texts):
+            candidates.update(self._bucket_pairs(members, chain_keys))
+        candidates = sorted(candidates)
+        
+        # Alle Kandidatenpaare in einem Batch prüfen
+        clusters = _UnionFind(len(articles))
+        similarities = _JaccardBatch(texts).similarities([i for i, _ in candidates], [j for _, j in candidates])
+        for (i, j), similarity in zip(candidates, similarities):
+            if similarity >= threshold and self._are_compatible(articles[i], articles[j]):
+                clusters.union(i, j)
+        
+        return self._keep_best_per_cluster(articles, clusters, db_duplicates,
+                                           reason="Ähnlicher Titel/Abstract (MinHash/LSH)")
+    
+    def _bucket_pairs(self, members: List[int], chain_keys: List[Tuple[str, str]]) -> Iterator[Tuple[int, int]]:
+        """
+        Kandidatenpaare eines LSH-Buckets (i < j)
+        
+        Kleine Buckets liefern alle Paare. Große Buckets werden nach
+        (Jahr, Erstautor) unterteilt: kleine Teilgruppen liefern alle Paare,
+        große nur eine Kette benachbarter Indizes (Transitivität über
+        Union-Find). Paare über Teilgruppen hinweg entfallen - sie wären
+        wegen Jahr oder Autoren ohnehin meist unvereinbar.
+        """
+        groups = [members]
+        if len(members) > self.FUZZY_FULL_BUCKET_SIZE:
+            subgroups = defaultdict(list)
+            for i in members:
+                subgroups[chain_keys[i]].append(i)
+            groups = subgroups.values()
+        
+        for group in groups:
+            group = sorted(group)
+            if len(group) > self.FUZZY_FULL_BUCKET_SIZE:
+                yield from zip(group, group[1:])
             else:
-                # Unterschiedliche URLs → definitiv keine Duplikate
-                return False
+                for pos, i in enumerate(group):
+                    for j in group[pos + 1:]:
+                        yield i, j
+    
+    def _chain_key(self, article: Dict[str, Any]) -> Tuple[str, str]:
+        """Unterteilung großer LSH-Buckets: (Jahr, Erstautor)"""
+        year = (article.get('year') or '').strip()
+        first_name = next((word for word in self.fuzzy_text(article.get('authors') or '').split()
+                           if len(word) > 1), '')
+        return year if year != 'N/A' else '', first_name
+    
+    def _are_compatible(self, article1: Dict[str, Any], article2: Dict[str, Any]) -> bool:
+        """
+        Prüft ob zwei ähnliche Artikel dieselbe Publikation sein können
+        
+        Gleiches Jahr (falls beide eins haben), keine verschiedenen DOIs und
+        mindestens ein gemeinsamer Autorenname (falls beide Autoren haben).
+        """
+        year1 = (article1.get('year') or '').strip()
+        year2 = (article2.get('year') or '').strip()
+        if year1 and year2 and year1 != 'N/A' and year2 != 'N/A' and year1 != year2:
+            return False
+        
+        doi1 = self.normalize_doi(article1.get('doi'))
+        doi2 = self.normalize_doi(article2.get('doi'))
+        if doi1 and doi2 and doi1 != doi2:
+            return False
+        
+        # Namensteile ab 2 Zeichen (Initialen unterscheiden sich je nach Datenbank)
+        names1 = {word for word in self.fuzzy_text(article1.get('authors') or '').split() if len(word) > 1}
+        names2 = {word for word in self.fuzzy_text(article2.get('authors') or '').split() if len(word) > 1}
+        return not names1 or not names2 or bool(names1 & names2)
+    
+    def _keep_best_per_cluster(self, articles: List[Dict[str, Any]], clusters: _UnionFind,
+                               db_duplicates: Dict[str, int], reason: str) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Behält pro Union-Find-Gruppe den Artikel mit höchster Priorität
+        
+        Returns:
+            (Einzelartikel plus je ein behaltener Artikel pro Gruppe - in
+            Reihenfolge des ersten Auftretens, Anzahl entfernter Duplikate)
+        """
+        members = defaultdict(list)
+        for i in range(len(articles)):
+            members[clusters.find(i)].append(articles[i])
+        
+        remaining = []
+        duplicates_count = 0
+        for group in members.values():
+            if len(group) == 1:
+                remaining.append(group[0])
+                continue
+            
+            sorted_group = sorted(group, key=lambda a: self.DATABASE_PRIORITY.get(
+                a.get('source_database', ''), 999))
+            kept_article = sorted_group[0]
+            remaining.append(kept_article)
+            duplicates_count += len(sorted_group) - 1
+            for article in sorted_group[1:]:
+                self._log_duplicate(article, kept_article, db_duplicates, reason=reason)
+        
+        return remaining, duplicates_count
+    
+    def _cluster_year_conflicts(self, conflict_groups: List[List[Dict[str, Any]]]) -> List[_UnionFind]:
+        """
+        Gruppiert Artikel mit gleichen Autoren/Titel, aber unterschiedlichen Jahren
+        
+        Ein Paar ist Duplikat, wenn (in dieser Reihenfolge entschieden):
+        1. beide eine DOI haben → DOI identisch
+        2. beide eine URL haben → URL identisch
+        3. sonst: Abstract-Ähnlichkeit > 80%
+        
+        DOI- und URL-Gleichheit werden über Index-Buckets gefunden. Die danach
+        noch unentschiedenen Paare aller Gruppen werden gesammelt und ihre
+        Abstract-Ähnlichkeit in einem vektorisierten Schritt berechnet
+        (_JaccardBatch). Duplikate werden transitiv zusammengefasst (A ~ B,
+        B ~ C → eine Gruppe), aber nie zwei verschiedene DOIs.
+        
+        Args:
+            conflict_groups: (authors, title)-Gruppen mit mehreren Jahren
+            
+        Returns:
+            Pro Gruppe ein Union-Find über die Indizes ihrer Artikel
+        """
+        def field(article: Dict[str, Any], name: str) -> str:
+            value = (article.get(name) or '').strip().lower()
+            return '' if value == 'n/a' else value
         
-        # Prüfe Abstract-Ähnlichkeit (Fallback)
-        abstract1 = self.normalize_abstract(article1.get('abstract') or '')
-        abstract2 = self.normalize_abstract(article2.get('abstract') or '')
+        all_clusters = []
+        offsets = list(itertools.accumulate((len(group) for group in conflict_groups), initial=0))
+        lefts, rights = [], []  # unentschiedene Paare (Index über alle Gruppen)
+        
+        for group_no, group_articles in enumerate(conflict_groups):
+            dois = [field(article, 'doi') for article in group_articles]
+            urls = [field(article, 'url') for article in group_articles]
+            clusters = _UnionFind(len(group_articles), dois)
+            all_clusters.append(clusters)
+            
+            # 1. Gleiche DOI
+            by_doi = defaultdict(list)
+            for i, doi in enumerate(dois):
+                if doi:
+                    by_doi[doi].append(i)
+            for members in by_doi.values():
+                for j in members[1:]:
+                    clusters.union(members[0], j)
+            
+            # 2. Gleiche URL: Artikel ohne DOI sind Duplikat jedes Artikels mit gleicher URL
+            by_url = defaultdict(list)
+            for i, url in enumerate(urls):
+                if url:
+                    by_url[url].append(i)
+            for members in by_url.values():
+                without_doi = [i for i in members if not dois[i]]
+                if without_doi:
+                    for j in members:
+                        clusters.union(without_doi[0], j)
+            
+            # 3. Unentschieden (nur Artikel mit Abstract): ohne DOI und URL mit
+            # allen anderen, nur mit DOI mit nur mit URL
+            with_abstract = [i for i, article in enumerate(group_articles) if self._normalized_abstract(article)]
+            bare = [i for i in with_abstract if not dois[i] and not urls[i]]
+            others = [i for i in with_abstract if dois[i] or urls[i]]
+            doi_only = [i for i in others if not urls[i]]
+            url_only = [i for i in others if not dois[i]]
+            
+            for left, right in (_index_pairs(bare, offset=offsets[group_no]),
+                                _index_pairs(bare, others, offset=offsets[group_no]),
+                                _index_pairs(doi_only, url_only, offset=offsets[group_no])):
+                lefts.append(left)
+                rights.append(right)
         
-        if abstract1 and abstract2:
-            similarity = self.text_similarity(abstract1, abstract2)
-            return similarity > 0.80
+        if lefts:
+            # Abstracts aller Gruppen einmal kodieren, alle Paare in einem Batch vergleichen
+            if np is not None:
+                left = np.concatenate(lefts).astype(np.int64, copy=False)
+                right = np.concatenate(rights).astype(np.int64, copy=False)
+            else:
+                left, right = list(itertools.chain(*lefts)), list(itertools.chain(*rights))
+            engine = _JaccardBatch([self._normalized_abstract(article)
+                                    for group in conflict_groups for article in group])
+            similarities = engine.similarities(left, right)
+            if np is not None:
+                left, right = left.tolist(), right.tolist()
+            
+            group_of = [group_no for group_no, group in enumerate(conflict_groups) for _ in group]
+            for i, j, similarity in zip(left, right, similarities):
+                if similarity > 0.80:
+                    group_no = group_of[i]
+                    all_clusters[group_no].union(i - offsets[group_no], j - offsets[group_no])
         
-        # Keine ausreichenden Informationen → als nicht-Duplikat behandeln
-        return False
+        return all_clusters
     
     def _log_duplicate(self, article: Dict[str, Any], kept_article: Dict[str, Any],
                       db_duplicates: Dict[str, int], reason: str = ""):
@@ -392,14 +1121,15 @@ class Deduplicator:
         self.duplicates_details.append(detail)
     
     def export_results(self, 
-                      articles: List[Dict[str, Any]], 
+                      articles: Iterable[Dict[str, Any]], 
                       databases: List[str],
                       output_dir: Path) -> Tuple[Path, Path]:
         """
         Exportiert deduplizierte Ergebnisse als CSV und JSON
         
         Args:
-            articles: Liste eindeutiger Artikel
+            articles: Eindeutige Artikel (Liste oder Stream; aus key_fields_only
+                      werden die vollständigen Datensätze nachgeladen)
             databases: Liste der durchsuchten Datenbanken
             output_dir: Output-Verzeichnis
             
@@ -408,6 +1138,7 @@ class Deduplicator:
         """
         # Timestamp für Dateinamen
         timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        articles = self.iter_full_articles(articles)
         
         # Datenbankname für Filename
         if len(databases) == 3:  # Alle Datenbanken
@@ -418,73 +1149,40 @@ class Deduplicator:
         # Stelle sicher dass Output-Verzeichnis existiert
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        # CSV- und JSON-Unterverzeichnisse erstellen
-        csv_dir = output_dir / "csv"
-        json_dir = output_dir / "json"
-        csv_dir.mkdir(parents=True, exist_ok=True)
-        json_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Dateinamen
-        csv_file = csv_dir / f"dedup_{db_name}_{timestamp}.csv"
-        json_file = json_dir / f"dedup_{db_name}_{timestamp}.json"
+        # Export CSV (selektives Quoting) und JSON/JSONL/Parquet, Artikel für Artikel
+        # (komprimiert nach Settings.OUTPUT_COMPRESSION)
+        stem = f"dedup_{db_name}_{timestamp}"
+        csv_writer = CsvStreamWriter(Exporter.output_file(output_dir / "csv", f"{stem}.csv"),
+                                     Exporter.CSV_COLUMNS + ['source_database'])
+        json_writer = Exporter.result_writer(output_dir, stem, {
+            "databases": databases,
+            "timestamp": None,  # beim Abschluss gesetzt
+            "total_results": 0,
+            "query_type": "cross-database deduplication",
+            "version": "1.0.0",
+            "statistics": {
+                "files_processed": self.stats['files_found'],
+                "articles_loaded": self.stats['articles_loaded'],
+                "duplicates_removed": self.stats['duplicates_removed'],
+                "unique_articles": self.stats['unique_articles']
+            }
+        })
         
-        # Export CSV mit selektivem Quoting
-        with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-            # Header schreiben
-            f.write('authors,title,year,doi,url,abstract,source_database\n')
-            
-            # Daten schreiben
+        with csv_writer, json_writer:
             for article in articles:
-                authors = article.get('authors', 'N/A')
-                title = article.get('title', 'N/A')
-                year = article.get('year', 'N/A')
-                doi = article.get('doi', 'N/A')
-                url = article.get('url', 'N/A')
-                abstract = article.get('abstract', 'N/A')
-                source_db = article.get('source_database', 'N/A')
-                
-                # Quote title and abstract (escape internal quotes)
-                title_quoted = '"' + str(title).replace('"', '""') + '"'
-                abstract_quoted = '"' + str(abstract).replace('"', '""') + '"'
-                
-                # Quote authors if contains comma
-                if ',' in str(authors) or '"' in str(authors) or '\n' in str(authors):
-                    authors_quoted = '"' + str(authors).replace('"', '""') + '"'
-                else:
-                    authors_quoted = str(authors)
-                
-                # Zeile zusammenbauen
-                line = f'{authors_quoted},{title_quoted},{year},{doi},{url},{abstract_quoted},{source_db}\n'
-                f.write(line)
-        
-        # Export JSON
-        data = {
-            "metadata": {
-                "databases": databases,
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "total_results": len(articles),
-                "query_type": "cross-database deduplication",
-                "version": "1.0.0",
-                "statistics": {
-                    "files_processed": self.stats['files_found'],
-                    "articles_loaded": self.stats['articles_loaded'],
-                    "duplicates_removed": self.stats['duplicates_removed'],
-                    "unique_articles": self.stats['unique_articles']
-                }
-            },
-            "articles": articles
-        }
+                csv_writer.write(article)
+                json_writer.write(article)
         
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        csv_file = csv_writer.path
+        json_file = json_writer.path
         
         # Dateigrößen
         csv_size = csv_file.stat().st_size / 1024
         json_size = json_file.stat().st_size / 1024
         
-        print(f"\n✓ CSV exportiert: {csv_file.name}")
+        print(f"\n✓ {Exporter.format_label(csv_file)} exportiert: {csv_file.name}")
         print(f"  Größe: {csv_size:.1f} KB")
-        print(f"✓ JSON exportiert: {json_file.name}")
+        print(f"✓ {Exporter.format_label(json_file)} exportiert: {json_file.name}")
         print(f"  Größe: {json_size:.1f} KB")
         
         return (csv_file, json_file)
@@ -0,0 +1,138 @@
+"""Delta-Harvesting: Watermark des letzten Laufs und Zusammenführen der Ergebnisse"""
+
+import hashlib
+import logging
+import os
+from datetime import datetime, date
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+from src.utils.file_handler import FileHandler
+from src.utils.json_codec import JsonCodec
+
+
+class DeltaWatermark:
+    """
+    Merkt sich pro Datenbank und Query den letzten erfolgreichen Lauf
+
+    Die Datei liegt neben den Exporten in output/<db>/ und enthält den
+    Startzeitpunkt des Laufs sowie den Pfad des zugehörigen JSON-Exports.
+    Ein Folgelauf mit --update fragt nur Datensätze ab, die seit diesem
+    Datum hinzugekommen oder aktualisiert worden sind, und führt sie mit
+    dem vorherigen Export zusammen.
+    """
+
+    def __init__(self, directory: Path, db_name: str, query: str,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            directory: Output-Verzeichnis der Datenbank (output/<db>/)
+            db_name: Name der Datenbank
+            query: Query-String (bestimmt den Dateinamen)
+            logger: Optionaler Logger
+        """
+        self.directory = Path(directory)
+        self.db_name = db_name
+        self.query = query
+        self.logger = logger or logging.getLogger(__name__)
+
+        digest = hashlib.sha256(f"{db_name}|{query}".encode('utf-8')).hexdigest()[:12]
+        self.path = self.directory / f"watermark_{digest}.json"
+
+        self.last_run: Optional[datetime] = None
+        self.json_file: Optional[Path] = None
+        self.total_results = 0
+
+    def load(self) -> bool:
+        """
+        Lädt den Watermark des letzten Laufs
+
+        Returns:
+            True wenn Watermark und vorheriger JSON-Export vorhanden sind
+        """
+        if not self.path.exists():
+            return False
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = JsonCodec.load(f)
+            self.last_run = datetime.fromisoformat(state['last_run'])
+            self.json_file = self.directory / state['json_file']
+            self.total_results = state.get('total_results', 0)
+        except (OSError, ValueError, KeyError) as e:
+            self.logger.warning(f"Watermark nicht lesbar ({e}) - vollständige Suche")
+            return False
+
+        if not self.json_file.exists():
+            self.logger.warning(f"Vorheriger Export fehlt ({self.json_file}) - vollständige Suche")
+            return False
+
+        return True
+
+    @property
+    def since(self) -> date:
+        """Startdatum für die Delta-Abfrage (Tag des letzten Laufs, inklusive)"""
+        return self.last_run.date()
+
+    def save(self, run_started: datetime, json_file: Path, total_results: int) -> None:
+        """
+        Speichert den Watermark nach erfolgreichem Export (atomar)
+
+        Args:
+            run_started: Startzeitpunkt des Laufs (Abfragen ab diesem Zeitpunkt sind abgedeckt)
+            json_file: JSON-Export mit dem vollständigen Ergebnis
+            total_results: Anzahl Artikel im Export
+        """
+        state = {
+            'database': self.db_name,
+            'query': self.query,
+            'last_run': run_started.isoformat(timespec='seconds'),
+            'json_file': os.path.relpath(json_file, self.directory),
+            'total_results': total_results
+        }
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            JsonCodec.dump(state, f, indent=True)
+        os.replace(tmp_path, self.path)
+
+        self.last_run = run_started
+        self.json_file = Path(json_file)
+        self.total_results = total_results
+
+    def load_previous_articles(self) -> List[Dict[str, Any]]:
+        """Lädt die Artikel des vorherigen Exports (JSON oder JSONL)"""
+        return list(FileHandler.iter_result_articles(self.json_file))
+
+    @staticmethod
+    def merge(previous: List[Dict[str, Any]], delta: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Führt neue/aktualisierte Artikel mit dem vorherigen Ergebnis zusammen
+
+        Artikel werden über die URL (Fallback: DOI, Titel) identifiziert.
+        Aktualisierte Artikel ersetzen ihre alte Version an derselben
+        Position, neue Artikel werden angehängt.
+
+        Returns:
+            Zusammengeführte Artikelliste
+        """
+        def identity(article: Dict[str, Any]) -> str:
+            for field in ('url', 'doi', 'title'):
+                value = str(article.get(field, 'N/A'))
+                if value and value != 'N/A':
+                    return f"{field}:{value.lower()}"
+            return f"id:{id(article)}"
+
+        merged = list(previous)
+        positions = {identity(article): i for i, article in enumerate(merged)}
+
+        for article in delta:
+            key = identity(article)
+            if key in positions:
+                merged[positions[key]] = article
+            else:
+                positions[key] = len(merged)
+                merged.append(article)
+
+        return merged
@@ -1,86 +1,427 @@
-"""Export-Funktionen für CSV und JSON"""
+"""Export-Funktionen für CSV, JSON und Parquet"""
 
-import csv
-import json
+import os
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet optional
+    pa = pq = None
+
+from src.config.settings import Settings
+from src.utils.file_handler import FileHandler
+from src.utils.json_codec import JsonCodec
+
+
+class _AtomicFileWriter:
+    """
+    Schreibt in eine temporäre Datei neben dem Ziel und benennt sie erst
+    beim Abschluss um - abgebrochene Exporte hinterlassen keine halben Dateien.
+    Endet der Zielpfad auf .gz oder .zst, wird komprimiert geschrieben.
+    """
+    
+    BINARY = False
+    
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+        self.count = 0
+        self.metadata: Dict[str, Any] = {}
+        if self.BINARY:
+            self._file = open(self.tmp_path, 'wb')
+        else:
+            # Endung .gz/.zst → komprimiert schreiben
+            self._file = FileHandler.open_text_writer(self.tmp_path, FileHandler.compression_of(self.path),
+                                                      Settings.OUTPUT_COMPRESSION_LEVEL)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+    
+    def _finish(self) -> None:
+        """Schreibt den Dateiabschluss (Subklassen)"""
+    
+    def _final_metadata(self) -> Dict[str, Any]:
+        """Metadaten mit Artikelzahl und Abschlusszeitpunkt"""
+        metadata = dict(self.metadata)
+        if not metadata.get('timestamp'):
+            metadata['timestamp'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        metadata['total_results'] = self.count
+        return metadata
+    
+    def close(self) -> Optional[Path]:
+        """
+        Schließt den Export ab
+        
+        Returns:
+            Path zur Datei oder None, wenn keine Artikel geschrieben wurden
+        """
+        if self._file.closed:
+            return self.path if self.path.exists() else None
+        if not self.count:
+            self.discard()
+            return None
+        
+        self._finish()
+        self._file.close()
+        os.replace(self.tmp_path, self.path)
+        return self.path
+    
+    def discard(self) -> None:
+        """Verwirft den Export (temporäre Datei löschen)"""
+        if not self._file.closed:
+            self._file.close()
+        self.tmp_path.unlink(missing_ok=True)
+
+
+class CsvStreamWriter(_AtomicFileWriter):
+    """
+    Schreibt Artikel zeilenweise als CSV
+    
+    Selektives Quoting wie bisher: title und abstract immer mit "",
+    authors nur wenn nötig, übrige Spalten (year, doi, url) unverändert
+    ohne Quoting.
+    """
+    
+    ALWAYS_QUOTED = frozenset({'title', 'abstract'})
+    QUOTED_IF_NEEDED = frozenset({'authors'})
+    
+    def __init__(self, path: Path, columns: List[str]):
+        super().__init__(path)
+        self.columns = columns
+        self._file.write(','.join(columns) + '\n')
+    
+    def write(self, article: Dict[str, Any]) -> None:
+        """Hängt eine Zeile an"""
+        values = []
+        for column in self.columns:
+            value = str(article.get(column, 'N/A'))
+            if column in self.ALWAYS_QUOTED or (column in self.QUOTED_IF_NEEDED and
+                                                (',' in value or '"' in value or '\n' in value)):
+                # Escape quotes (double them)
+                value = '"' + value.replace('"', '""') + '"'
+            values.append(value)
+        
+        self._file.write(','.join(values) + '\n')
+        self.count += 1
+
+
+class JsonStreamWriter(_AtomicFileWriter):
+    """
+    Schreibt Artikel als Elemente des "articles"-Arrays, sobald sie eintreffen
+    
+    Der "metadata"-Block (u.a. total_results) folgt am Ende der Datei;
+    Leser greifen über den Schlüssel darauf zu, die Reihenfolge ist egal.
+    Im kompakten Modus (Settings.OUTPUT_JSON_COMPACT) steht jeder Artikel
+    uneingerückt in einer eigenen Zeile.
+    """
+    
+    def __init__(self, path: Path, compact: Optional[bool] = None):
+        super().__init__(path)
+        self.compact = Settings.OUTPUT_JSON_COMPACT if compact is None else compact
+        self._file.write('{"articles":[' if self.compact else '{\n  "articles": [')
+    
+    def write(self, article: Dict[str, Any]) -> None:
+        """Hängt einen Artikel an"""
+        if self.compact:
+            self._file.write(('\n' if not self.count else ',\n') + JsonCodec.dumps(article))
+        else:
+            # JSON-Strings enthalten keine rohen Zeilenumbrüche → Einrücken per replace
+            encoded = JsonCodec.dumps(article, indent=True).replace('\n', '\n    ')
+            self._file.write(('\n    ' if not self.count else ',\n    ') + encoded)
+        self.count += 1
+    
+    def _finish(self) -> None:
+        if self.compact:
+            self._file.write(f'\n],"metadata":{JsonCodec.dumps(self._final_metadata())}}}\n')
+            return
+        encoded = JsonCodec.dumps(self._final_metadata(), indent=True).replace('\n', '\n  ')
+        self._file.write(f'\n  ],\n  "metadata": {encoded}\n}}\n')
+
+
+class JsonLinesStreamWriter(_AtomicFileWriter):
+    """
+    Schreibt einen Artikel pro Zeile (JSON Lines, kompakt)
+    
+    Die Metadaten stehen in einer kleinen Begleitdatei <name>.meta.json,
+    die nach der Artikeldatei geschrieben wird. Dateien lassen sich so
+    zeilenweise lesen, aneinanderhängen und aufteilen.
+    """
+    
+    META_SUFFIX = '.meta.json'
+    
+    @classmethod
+    def meta_path_for(cls, path: Path) -> Path:
+        """Pfad der Metadaten-Begleitdatei (unkomprimiert)"""
+        return path.with_name(FileHandler.strip_compression(path).stem + cls.META_SUFFIX)
+    
+    def write(self, article: Dict[str, Any]) -> None:
+        """Hängt einen Artikel als Zeile an"""
+        self._file.write(JsonCodec.dumps(article))
+        self._file.write('\n')
+        self.count += 1
+    
+    def close(self) -> Optional[Path]:
+        already_closed = self._file.closed
+        path = super().close()
+        if path and not already_closed:
+            meta_path = self.meta_path_for(path)
+            tmp_path = meta_path.with_name(f"{meta_path.name}.tmp")
+            metadata = dict(self._final_metadata(), format='jsonl', articles_file=path.name)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                JsonCodec.dump(metadata, f, indent=True)
+            os.replace(tmp_path, meta_path)
+        return path
+
+
+class ParquetStreamWriter(_AtomicFileWriter):
+    """
+    Schreibt Artikel spaltenweise als Parquet (benötigt pyarrow)
+    
+    Artikel werden zu Row Groups mit ROW_GROUP_SIZE Zeilen gepuffert, alle
+    Spalten sind Strings (fehlende Felder = null). Die Metadaten stehen als
+    JSON unter dem Schlüssel "metadata" im Datei-Footer. Leser können
+    einzelne Spalten laden (z.B. ohne abstract), ohne den Rest zu lesen.
+    Komprimiert wird spaltenweise innerhalb der Datei (keine .gz-Endung).
+    """
+    
+    COLUMNS = ['authors', 'title', 'year', 'doi', 'url', 'abstract', 'source_database']
+    ROW_GROUP_SIZE = 10000
+    BINARY = True
+    
+    def __init__(self, path: Path, compression: Optional[str] = None, level: int = 0):
+        """
+        Args:
+            path: Zieldatei
+            compression: "gzip" oder "zstd" (None = snappy, Standard von pyarrow)
+            level: Komprimierungsstufe (0 = Standard des Verfahrens)
+        """
+        if pa is None:
+            raise ImportError("Parquet-Export benötigt pyarrow (pip install pyarrow)")
+        super().__init__(path)
+        self._schema = pa.schema([(column, pa.string()) for column in self.COLUMNS])
+        self._writer = pq.ParquetWriter(self._file, self._schema, compression=compression or 'snappy',
+                                        compression_level=(level or None) if compression else None)
+        self._buffer: Dict[str, List[Optional[str]]] = {column: [] for column in self.COLUMNS}
+    
+    def write(self, article: Dict[str, Any]) -> None:
+        """Hängt einen Artikel an (geschrieben wird pro Row Group)"""
+        for column in self.COLUMNS:
+            value = article.get(column)
+            self._buffer[column].append(None if value is None else str(value))
+        self.count += 1
+        
+        if len(self._buffer['title']) >= self.ROW_GROUP_SIZE:
+            self._flush()
+    
+    def _flush(self) -> None:
+        """Schreibt die gepufferten Artikel als Row Group"""
+        if self._buffer['title']:
+            self._writer.write_batch(pa.RecordBatch.from_pydict(self._buffer, schema=self._schema))
+            self._buffer = {column: [] for column in self.COLUMNS}
+    
+    def _finish(self) -> None:
+        self._flush()
+        self._writer.add_key_value_metadata(
+            {'metadata': JsonCodec.dumps(self._final_metadata())})
+        self._writer.close()
+    
+    def discard(self) -> None:
+        if not self._file.closed:
+            try:
+                self._writer.close()
+            except Exception:
+                pass
+        super().discard()
+
+
+class ResultExport:
+    """
+    Export einer Ergebnismenge als CSV und/oder JSON (bzw. JSONL/Parquet)
+    
+    Artikel werden beim Eintreffen in alle Dateien geschrieben (auch
+    seitenweise, z.B. aus adapter.async_search_iter()) und dabei gezählt.
+    Die Dateien erscheinen erst mit close() (Umbenennen).
+    """
+    
+    def __init__(self, output_path: Path, database: str, json_query: Optional[str], csv: bool = True):
+        """
+        Args:
+            output_path: Pfad zum Output-Verzeichnis
+            database: Name der Datenbank (Präfix der Dateinamen)
+            json_query: Query-String für die Metadaten der Ergebnisdatei (None = keine)
+            csv: CSV schreiben
+        """
+        # Timestamp für Dateiname (ISO-Format für bessere Lesbarkeit)
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        
+        self.count = 0
+        self.csv_writer = None
+        self.json_writer = None
+        self.writers: List[_AtomicFileWriter] = []
+        try:
+            if csv:
+                self.csv_writer = CsvStreamWriter(
+                    Exporter.output_file(output_path / "csv", f"{database}_{timestamp}.csv"),
+                    Exporter.CSV_COLUMNS)
+                self.writers.append(self.csv_writer)
+            
+            if json_query is not None:
+                self.json_writer = Exporter.result_writer(output_path, f"{database}_{timestamp}", {
+                    "database": database,
+                    "query": json_query,
+                    "timestamp": None,  # beim Abschluss gesetzt
+                    "total_results": 0,
+                    "version": "1.0.0"
+                })
+                self.writers.append(self.json_writer)
+        except Exception:
+            self.discard()
+            raise
+    
+    def write(self, article: Dict[str, Any]) -> None:
+        """Schreibt einen Artikel in alle Dateien"""
+        for writer in self.writers:
+            writer.write(article)
+        self.count += 1
+    
+    def write_all(self, articles: Iterable[Dict[str, Any]]) -> None:
+        """Schreibt mehrere Artikel (z.B. eine Seite oder einen ganzen Stream)"""
+        for article in articles:
+            self.write(article)
+    
+    def close(self) -> Tuple[Optional[Path], Optional[Path]]:
+        """
+        Schließt alle Dateien ab
+        
+        Returns:
+            (csv_path, json_path) - jeweils None wenn nicht geschrieben
+            (ohne Artikel wird nichts geschrieben)
+        """
+        paths = [writer.close() for writer in self.writers]
+        if not any(paths):
+            return None, None
+        
+        csv_file = self.csv_writer.path if self.csv_writer else None
+        json_file = self.json_writer.path if self.json_writer else None
+        
+        for path in (csv_file, json_file):
+            if path:
+                print(f"✓ {Exporter.format_label(path)} exportiert: {path}")
+                print(f"  Größe: {path.stat().st_size / 1024:.1f} KB")
+        
+        return csv_file, json_file
+    
+    def discard(self) -> None:
+        """Verwirft den Export (temporäre Dateien löschen)"""
+        for writer in self.writers:
+            writer.discard()
 
 
 class Exporter:
     """Klasse für Export-Operationen"""
     
+    CSV_COLUMNS = ['authors', 'title', 'year', 'doi', 'url', 'abstract']
+    
+    @staticmethod
+    def result_writer(output_path: Path, stem: str, metadata: Dict[str, Any],
+                      output_format: Optional[str] = None) -> _AtomicFileWriter:
+        """
+        Öffnet den Writer für die Ergebnisdatei im konfigurierten Format
+        
+        Args:
+            output_path: Pfad zum Output-Verzeichnis
+            stem: Dateiname ohne Endung (z.B. "pubmed_2026-01-14_10-00-00")
+            metadata: Metadaten (total_results und timestamp werden ergänzt)
+            output_format: "json", "jsonl" oder "parquet" (None = Settings.OUTPUT_FORMAT)
+        
+        Ohne pyarrow wird statt Parquet JSON geschrieben.
+        """
+        output_format = output_format or Settings.OUTPUT_FORMAT
+        if output_format == 'parquet' and pa is None:
+            print("⚠ Parquet benötigt pyarrow (pip install pyarrow) - Export als JSON")
+            output_format = 'json'
+        
+        if output_format == 'parquet':
+            writer = ParquetStreamWriter(output_path / "parquet" / f"{stem}.parquet",
+                                         FileHandler.resolve_compression(Settings.OUTPUT_COMPRESSION),
+                                         Settings.OUTPUT_COMPRESSION_LEVEL)
+        elif output_format == 'jsonl':
+            writer = JsonLinesStreamWriter(Exporter.output_file(output_path / "jsonl", f"{stem}.jsonl"))
+        else:
+            writer = JsonStreamWriter(Exporter.output_file(output_path / "json", f"{stem}.json"))
+        writer.metadata = metadata
+        return writer
+    
     @staticmethod
-    def export_to_csv(results: List[Dict[str, Any]], output_path: Path, database: str) -> Path:
+    def open_stream(output_path: Path, database: str, json_query: Optional[str],
+                    csv: bool = True) -> ResultExport:
+        """
+        Öffnet einen Export, der Artikel beim Eintreffen schreibt (siehe ResultExport)
+        
+        Args:
+            output_path: Pfad zum Output-Verzeichnis
+            database: Name der Datenbank (Präfix der Dateinamen)
+            json_query: Query-String für die Metadaten der Ergebnisdatei (None = keine)
+            csv: CSV schreiben
+        """
+        return ResultExport(output_path, database, json_query, csv)
+    
+    @staticmethod
+    def output_file(directory: Path, filename: str) -> Path:
+        """
+        Pfad einer Exportdatei, bei aktivierter Komprimierung mit .gz/.zst
+        
+        Args:
+            directory: Zielverzeichnis
+            filename: Dateiname ohne Komprimierungs-Endung (z.B. "pubmed_<ts>.csv")
+        """
+        compression = FileHandler.resolve_compression(Settings.OUTPUT_COMPRESSION)
+        for suffix, name in FileHandler.COMPRESSION_SUFFIXES.items():
+            if name == compression:
+                return directory / f"{filename}{suffix}"
+        return directory / filename
+    
+    @staticmethod
+    def format_label(path: Path) -> str:
+        """Formatbezeichnung für Ausgaben, z.B. CSV oder JSON (gzip)"""
+        label = FileHandler.strip_compression(path).suffix[1:].upper()
+        compression = FileHandler.compression_of(path)
+        return f"{label} ({compression})" if compression else label
+    
+    @staticmethod
+    def export_to_csv(results: Iterable[Dict[str, Any]], output_path: Path, database: str) -> Path:
         """
         Exportiert Ergebnisse als CSV-Datei
         
         Args:
-            results: Liste von Artikeln (Dictionaries)
+            results: Artikel (Liste oder Stream, z.B. adapter.search_iter())
             output_path: Pfad zum Output-Verzeichnis
             database: Name der Datenbank
             
         Returns:
             Path zur CSV-Datei oder None bei Fehler
         """
-        if not results:
-            print("Keine Ergebnisse zum Exportieren.")
-            return None
-        
-        try:
-            # Timestamp für Dateiname (ISO-Format für bessere Lesbarkeit)
-            timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-            
-            # CSV-Unterverzeichnis erstellen
-            csv_dir = output_path / "csv"
-            csv_dir.mkdir(parents=True, exist_ok=True)
-            csv_file = csv_dir / f"{database}_{timestamp}.csv"
-            
-            # CSV schreiben mit selektivem Quoting (title und abstract immer mit "", rest ohne)
-            with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-                # Header schreiben
-                f.write('authors,title,year,doi,url,abstract\n')
-                
-                # Daten schreiben mit selektivem Quoting
-                for article in results:
-                    authors = article.get('authors', 'N/A')
-                    title = article.get('title', 'N/A')
-                    year = article.get('year', 'N/A')
-                    doi = article.get('doi', 'N/A')
-                    url = article.get('url', 'N/A')
-                    abstract = article.get('abstract', 'N/A')
-                    
-                    # Escape quotes in title and abstract (double them)
-                    title_quoted = '"' + str(title).replace('"', '""') + '"'
-                    abstract_quoted = '"' + str(abstract).replace('"', '""') + '"'
-                    
-                    # Authors mit Quoting wenn nötig (enthält oft Kommas)
-                    if ',' in str(authors) or '"' in str(authors) or '\n' in str(authors):
-                        authors_quoted = '"' + str(authors).replace('"', '""') + '"'
-                    else:
-                        authors_quoted = str(authors)
-                    
-                    # Zeile zusammenbauen
-                    line = f'{authors_quoted},{title_quoted},{year},{doi},{url},{abstract_quoted}\n'
-                    f.write(line)
-            
-            file_size = csv_file.stat().st_size / 1024
-            print(f"✓ CSV exportiert: {csv_file}")
-            print(f"  Größe: {file_size:.1f} KB")
-            return csv_file
-            
-        except Exception as e:
-            print(f"Fehler beim CSV-Export: {e}")
-            return None
+        csv_file, _ = Exporter.export_stream(results, output_path, database, json_query=None)
+        return csv_file
     
     @staticmethod
-    def export_to_json(results: List[Dict[str, Any]], output_path: Path, 
+    def export_to_json(results: Iterable[Dict[str, Any]], output_path: Path,
                       database: str, query: str) -> Path:
         """
         Exportiert Ergebnisse als JSON-Datei
         
         Args:
-            results: Liste von Artikeln (Dictionaries)
+            results: Artikel (Liste oder Stream)
             output_path: Pfad zum Output-Verzeichnis
             database: Name der Datenbank
             query: Original Query-String
@@ -88,40 +429,44 @@ class Exporter:
         Returns:
             Path zur JSON-Datei oder None bei Fehler
         """
-        if not results:
-            print("Keine Ergebnisse zum Exportieren.")
-            return None
+        _, json_file = Exporter.export_stream(results, output_path, database, json_query=query,
+                                              csv=False)
+        return json_file
+    
+    @staticmethod
+    def export_stream(results: Iterable[Dict[str, Any]], output_path: Path, database: str,
+                      json_query: Optional[str], csv: bool = True) -> Tuple[Optional[Path], Optional[Path]]:
+        """
+        Exportiert Ergebnisse in einem Durchlauf als CSV und/oder JSON (bzw. JSONL/Parquet)
         
-        try:
-            # Timestamp für Dateiname (ISO-Format für bessere Lesbarkeit)
-            timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-            
-            # JSON-Unterverzeichnis erstellen
-            json_dir = output_path / "json"
-            json_dir.mkdir(parents=True, exist_ok=True)
-            json_file = json_dir / f"{database}_{timestamp}.json"
-            
-            # JSON-Struktur erstellen
-            data = {
-                "metadata": {
-                    "database": database,
-                    "query": query,
-                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    "total_results": len(results),
-                    "version": "1.0.0"
-                },
-                "articles": results
-            }
-            
-            # JSON schreiben
-            with open(json_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            
-            file_size = json_file.stat().st_size / 1024
-            print(f"✓ JSON exportiert: {json_file}")
-            print(f"  Größe: {file_size:.1f} KB")
-            return json_file
+        Jeder Artikel wird sofort geschrieben und nicht im Speicher gehalten;
+        ein Stream (z.B. adapter.search_iter()) wird genau einmal durchlaufen.
+        Die Dateien erscheinen erst nach vollständigem Schreiben (Umbenennen).
+        
+        Args:
+            results: Artikel (Liste oder Stream)
+            output_path: Pfad zum Output-Verzeichnis
+            database: Name der Datenbank
+            json_query: Query-String für die Metadaten der Ergebnisdatei (None = keine)
+            csv: CSV schreiben
             
+        Returns:
+            (csv_path, json_path) - jeweils None wenn nicht geschrieben oder bei Fehler
+        """
+        export = None
+        try:
+            export = ResultExport(output_path, database, json_query, csv)
+            export.write_all(results)
+            csv_file, json_file = export.close()
+        
         except Exception as e:
-            print(f"Fehler beim JSON-Export: {e}")
-            return None
+            if export:
+                export.discard()
+            print(f"Fehler beim Export: {e}")
+            return None, None
+        
+        if not (csv_file or json_file):
+            print("Keine Ergebnisse zum Exportieren.")
+            return None, None
+        
+        return csv_file, json_file
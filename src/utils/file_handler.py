@@ -1,13 +1,151 @@
-"""Datei-Handling für Query-Dateien"""
+"""Datei-Handling für Query- und Ergebnisdateien"""
 
+import gzip
+import io
+import json
+import re
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Iterator, Dict, Any, List, IO
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet optional
+    pq = None
+
+try:
+    import zstandard
+except ImportError:  # zstd optional, gzip ist immer verfügbar
+    zstandard = None
+
 from src.config.settings import Settings
+from src.utils.json_codec import JsonCodec
+
+
+class _JsonStreamReader:
+    """
+    Liest die Elemente eines Arrays in einem JSON-Objekt inkrementell
+    
+    Der Text wird chunkweise gelesen, jedes Element einzeln mit
+    json.JSONDecoder.raw_decode dekodiert. Im Speicher liegt nur der
+    aktuelle Chunk, nie das ganze Dokument.
+    """
+    
+    WHITESPACE = re.compile(r'[ \t\n\r]*')
+    NUMBER_TAIL = re.compile(r'[0-9.eE+-]*')
+    CHUNK_SIZE = 1024 * 1024
+    
+    # Größter erlaubter Einzelwert (Artikel); bei ungültigem JSON wird nur
+    # so weit vorausgelesen, nicht die restliche Datei in den Puffer
+    MAX_VALUE_SIZE = 16 * 1024 * 1024
+    
+    def __init__(self, f: IO[str]):
+        self._file = f
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+    
+    def iter_items(self, key: str) -> Iterator[Any]:
+        """
+        Liefert die Elemente von ``key`` im obersten Objekt
+        
+        Andere Schlüssel (z.B. "metadata") werden dekodiert und verworfen.
+        
+        Raises:
+            ValueError: Ungültiges JSON
+        """
+        self._expect('{')
+        if self._peek() == '}':
+            return
+        
+        while True:
+            name = self._value()
+            self._expect(':')
+            if name == key and self._peek() == '[':
+                self._pos += 1
+                if self._peek() == ']':
+                    self._pos += 1
+                else:
+                    while True:
+                        yield self._value()
+                        if self._next() == ']':
+                            break
+            else:
+                self._value()
+            
+            if self._next() == '}':
+                return
+    
+    def _fill(self) -> bool:
+        """Hängt den nächsten Chunk an den Puffer (False am Dateiende)"""
+        if self._eof:
+            return False
+        chunk = self._file.read(self.CHUNK_SIZE)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+    
+    def _peek(self) -> str:
+        """Nächstes Zeichen nach Leerraum ('' am Dateiende), ohne es zu verbrauchen"""
+        while True:
+            self._pos = self.WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ''
+    
+    def _next(self) -> str:
+        """Verbraucht ein Trennzeichen (',' oder schließende Klammer)"""
+        char = self._peek()
+        if char not in (',', ']', '}'):
+            raise ValueError(f"Ungültiges JSON: ',' oder Klammer erwartet, '{char}' gefunden")
+        self._pos += 1
+        return char
+    
+    def _expect(self, char: str) -> None:
+        if self._peek() != char:
+            raise ValueError(f"Ungültiges JSON: '{char}' erwartet")
+        self._pos += 1
+    
+    def _value(self) -> Any:
+        """
+        Dekodiert den nächsten Wert, liest bei Bedarf weitere Chunks nach
+        
+        Raises:
+            ValueError: Ungültiges JSON, auch wenn der Wert nach
+                        MAX_VALUE_SIZE Zeichen noch nicht dekodierbar ist
+        """
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as e:
+                if len(self._buffer) - self._pos > self.MAX_VALUE_SIZE:
+                    raise ValueError(f"Ungültiges JSON: Wert nach {self.MAX_VALUE_SIZE} Zeichen "
+                                     f"nicht dekodierbar ({e.msg})") from e
+                if self._fill():
+                    continue
+                raise
+            # Zahl am Pufferende könnte abgeschnitten sein ("89." → 89, "1e" → 1)
+            if self.NUMBER_TAIL.fullmatch(self._buffer, end) and self._fill():
+                continue
+            self._pos = end
+            return value
 
 
 class FileHandler:
     """Klasse für Datei-I/O Operationen"""
     
+    # Dateiendung → Komprimierungsverfahren
+    COMPRESSION_SUFFIXES = {'.gz': 'gzip', '.zst': 'zstd'}
+    _zstd_warned = False
+    
+    # JSON-Dateien ab dieser Größe (und komprimierte) inkrementell lesen
+    JSON_STREAM_THRESHOLD = Settings.JSON_STREAM_THRESHOLD_MB * 1024 * 1024
+    
     @staticmethod
     def read_query_file(filename: str) -> Optional[str]:
         """
@@ -53,3 +191,135 @@ class FileHandler:
         output_path = Settings.OUTPUT_DIR / database
         output_path.mkdir(parents=True, exist_ok=True)
         return output_path
+    
+    @staticmethod
+    def compression_of(path: Path) -> Optional[str]:
+        """Komprimierungsverfahren anhand der Endung ("gzip", "zstd" oder None)"""
+        return FileHandler.COMPRESSION_SUFFIXES.get(Path(path).suffix)
+    
+    @staticmethod
+    def strip_compression(path: Path) -> Path:
+        """Pfad ohne Komprimierungs-Endung (z.B. x.jsonl.gz → x.jsonl)"""
+        path = Path(path)
+        return path.with_suffix('') if FileHandler.compression_of(path) else path
+    
+    @staticmethod
+    def resolve_compression(compression: str) -> Optional[str]:
+        """
+        Prüft ein konfiguriertes Verfahren auf Verfügbarkeit
+        
+        Returns:
+            "gzip", "zstd" oder None (keine Komprimierung); zstd ohne
+            zstandard-Paket fällt auf gzip zurück
+        """
+        if compression == 'zstd' and zstandard is None:
+            if not FileHandler._zstd_warned:
+                print("⚠ zstd benötigt zstandard (pip install zstandard) - komprimiere mit gzip")
+                FileHandler._zstd_warned = True
+            return 'gzip'
+        return compression if compression in ('gzip', 'zstd') else None
+    
+    @staticmethod
+    def open_text_reader(path: Path) -> IO[str]:
+        """Öffnet eine Textdatei zum Lesen, .gz/.zst werden beim Lesen entpackt"""
+        compression = FileHandler.compression_of(path)
+        if compression == 'gzip':
+            return gzip.open(path, 'rt', encoding='utf-8')
+        if compression == 'zstd':
+            if zstandard is None:
+                raise ImportError("zstd-Dateien benötigen zstandard (pip install zstandard)")
+            reader = zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
+            return io.TextIOWrapper(reader, encoding='utf-8')
+        return open(path, 'r', encoding='utf-8')
+    
+    @staticmethod
+    def open_text_writer(path: Path, compression: Optional[str] = None, level: int = 0) -> IO[str]:
+        """
+        Öffnet eine Textdatei zum Schreiben, optional komprimierend (Stream)
+        
+        Args:
+            path: Zieldatei
+            compression: "gzip", "zstd" oder None
+            level: Komprimierungsstufe (0 = Standard des Verfahrens)
+        """
+        if compression == 'gzip':
+            return gzip.open(path, 'wt', compresslevel=level or 6, encoding='utf-8', newline='')
+        if compression == 'zstd':
+            writer = zstandard.ZstdCompressor(level=level or 3).stream_writer(open(path, 'wb'), closefd=True)
+            return io.TextIOWrapper(writer, encoding='utf-8', newline='')
+        return open(path, 'w', newline='', encoding='utf-8')
+    
+    @staticmethod
+    def is_result_file(path: Path) -> bool:
+        """
+        Prüft, ob eine Datei ein Ergebnis-Export ist (JSON, JSONL oder Parquet)
+        
+        JSON und JSONL dürfen komprimiert sein (.gz/.zst). Nicht dazu gehören
+        JSONL-Begleitdateien (*.meta.json) sowie Checkpoints und
+        Delta-Watermarks in output/<db>/.
+        """
+        name = FileHandler.strip_compression(path).name
+        if name.endswith('.meta.json') or name.startswith(('checkpoint_', 'watermark_')):
+            return False
+        if name.endswith('.parquet'):
+            return name == path.name
+        return name.endswith(('.json', '.jsonl'))
+    
+    @staticmethod
+    def iter_result_articles(path: Path, columns: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Liefert die Artikel einer Ergebnisdatei
+        
+        JSONL wird zeilenweise gelesen (Speicherbedarf unabhängig von der
+        Dateigröße), JSON als Dokument mit "articles"-Liste - große und
+        komprimierte JSON-Dateien inkrementell Artikel für Artikel, ohne
+        das Dokument vollständig zu laden. Parquet wird in Batches gelesen,
+        dabei nur die angeforderten Spalten. Komprimierte Dateien
+        (.gz/.zst) werden beim Lesen entpackt.
+        
+        Args:
+            path: Pfad zur .json-, .jsonl- oder .parquet-Datei
+            columns: Nur diese Felder laden (None = alle)
+            
+        Yields:
+            Artikel-Dictionaries
+        """
+        if path.suffix == '.parquet':
+            yield from FileHandler._iter_parquet_articles(path, columns)
+            return
+        
+        with FileHandler.open_text_reader(path) as f:
+            if FileHandler.strip_compression(path).suffix == '.jsonl':
+                for line in f:
+                    if line.strip():
+                        yield FileHandler._project(JsonCodec.loads(line), columns)
+                return
+            if FileHandler.compression_of(path) or path.stat().st_size > FileHandler.JSON_STREAM_THRESHOLD:
+                for article in _JsonStreamReader(f).iter_items('articles'):
+                    yield FileHandler._project(article, columns)
+                return
+            data = JsonCodec.load(f)
+        for article in data.get('articles', []):
+            yield FileHandler._project(article, columns)
+    
+    @staticmethod
+    def _project(article: Dict[str, Any], columns: Optional[List[str]]) -> Dict[str, Any]:
+        """Reduziert einen Artikel auf die angeforderten Felder"""
+        if columns is None:
+            return article
+        return {column: article[column] for column in columns if column in article}
+    
+    @staticmethod
+    def _iter_parquet_articles(path: Path, columns: Optional[List[str]]) -> Iterator[Dict[str, Any]]:
+        """Liest eine Parquet-Datei batchweise (null-Felder werden weggelassen)"""
+        if pq is None:
+            raise ImportError("Parquet-Dateien benötigen pyarrow (pip install pyarrow)")
+        
+        parquet_file = pq.ParquetFile(path)
+        if columns is not None:
+            available = set(parquet_file.schema_arrow.names)
+            columns = [column for column in columns if column in available]
+        
+        for batch in parquet_file.iter_batches(batch_size=10000, columns=columns):
+            for row in batch.to_pylist():
+                yield {key: value for key, value in row.items() if value is not None}
@@ -0,0 +1,81 @@
+"""JSON-Codec: schnelles Backend (orjson) mit Fallback auf die Standardbibliothek"""
+
+import json
+from typing import Any, IO, Union
+
+try:
+    import orjson
+except ImportError:  # orjson optional
+    orjson = None
+
+from src.config.settings import Settings
+
+
+class JsonCodec:
+    """
+    Kodiert und dekodiert JSON für API-Responses, Ergebnisdateien und Checkpoints
+    
+    Ist orjson installiert (und JSON_BACKEND nicht "json"), wird es verwendet,
+    sonst das Modul json der Standardbibliothek. Die Ausgabe ist in beiden
+    Fällen gleichwertig: UTF-8 ohne ASCII-Escapes, eingerückt mit 2 Leerzeichen
+    oder kompakt ohne Leerzeichen.
+    """
+    
+    BACKENDS = ('orjson', 'json')
+    
+    backend = 'json'
+    
+    @classmethod
+    def use(cls, backend: str = 'auto') -> str:
+        """
+        Wählt das Backend
+        
+        Args:
+            backend: "auto" (orjson wenn installiert), "orjson" oder "json"
+            
+        Returns:
+            Name des aktiven Backends
+        """
+        if backend not in cls.BACKENDS or (backend == 'orjson' and orjson is None):
+            backend = 'orjson' if orjson is not None else 'json'
+        cls.backend = backend
+        return backend
+    
+    @classmethod
+    def loads(cls, data: Union[str, bytes]) -> Any:
+        """Dekodiert JSON aus str oder bytes (z.B. response.content)"""
+        if cls.backend == 'orjson':
+            return orjson.loads(data)
+        return json.loads(data)
+    
+    @classmethod
+    def load(cls, f: IO) -> Any:
+        """Dekodiert eine geöffnete JSON-Datei"""
+        return cls.loads(f.read())
+    
+    @classmethod
+    def dumps(cls, obj: Any, indent: bool = False) -> str:
+        """
+        Kodiert ein Objekt als JSON-String
+        
+        Args:
+            obj: Zu kodierendes Objekt
+            indent: Mit 2 Leerzeichen einrücken (sonst kompakt, für maschinell
+                    gelesene Dateien)
+        """
+        if cls.backend == 'orjson':
+            try:
+                return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode('utf-8')
+            except TypeError:
+                pass  # z.B. Ganzzahlen > 64 Bit - Standardbibliothek übernimmt
+        if indent:
+            return json.dumps(obj, indent=2, ensure_ascii=False)
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+    
+    @classmethod
+    def dump(cls, obj: Any, f: IO, indent: bool = False) -> None:
+        """Schreibt ein Objekt als JSON in eine geöffnete Textdatei"""
+        f.write(cls.dumps(obj, indent))
+
+
+JsonCodec.use(Settings.JSON_BACKEND)
@@ -1,15 +1,21 @@
 """Merger für AND-Queries: Kombiniert zwei Ergebnismengen"""
 
-import json
 import csv
 from pathlib import Path
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Iterable, Iterator, Optional
 from datetime import datetime
 
+from src.config.settings import Settings
+from src.utils.exporter import Exporter
+from src.utils.file_handler import FileHandler
+
 
 class ResultMerger:
     """Merged zwei Ergebnismengen mit AND-Logik"""
     
+    # Von B wird nur der Vergleichsschlüssel benötigt
+    MATCH_COLUMNS = ['title', 'authors']
+    
     def __init__(self, logger):
         self.logger = logger
     
@@ -24,8 +30,8 @@ class ResultMerger:
         Merged zwei Ergebnisdateien mit AND-Logik
         
         Args:
-            file_a: Ergebnisse von Gruppe A (JSON)
-            file_b: Ergebnisse von Gruppe B (JSON)
+            file_a: Ergebnisse von Gruppe A (JSON, JSONL oder Parquet, auch .gz/.zst)
+            file_b: Ergebnisse von Gruppe B (JSON, JSONL oder Parquet, auch .gz/.zst)
             terms_a: Begriffe aus Gruppe A (für Validierung)
             terms_b: Begriffe aus Gruppe B (für Validierung)
             output_dir: Output-Verzeichnis
@@ -36,14 +42,40 @@ class ResultMerger:
         """
         self.logger.info(f"Merge gestartet: {file_a.name} AND {file_b.name}")
         
-        # Load results
-        results_a = self._load_json(file_a)
-        results_b = self._load_json(file_b)
+        return self.merge_articles(self._load_json(file_a),
+                                   self._load_json(file_b, columns=self.MATCH_COLUMNS),
+                                   terms_a, terms_b, output_dir, database)
+    
+    def merge_articles(self,
+                       articles_a: Iterable[Dict],
+                       articles_b: Iterable[Dict],
+                       terms_a: List[str],
+                       terms_b: List[str],
+                       output_dir: Path,
+                       database: str) -> Tuple[Path, Path]:
+        """
+        Merged zwei Artikel-Streams mit AND-Logik
         
-        self.logger.info(f"Geladen: {len(results_a)} Artikel aus A, {len(results_b)} aus B")
+        Beide Eingaben werden genau einmal durchlaufen (z.B. direkt aus
+        adapter.search_iter()). Von B wird nur der Vergleichsschlüssel
+        gehalten, von A nur die übereinstimmenden Artikel.
         
+        Args:
+            articles_a: Artikel von Gruppe A (Liste oder Stream)
+            articles_b: Artikel von Gruppe B (Liste oder Stream)
+            terms_a: Begriffe aus Gruppe A (für Validierung)
+            terms_b: Begriffe aus Gruppe B (für Validierung)
+            output_dir: Output-Verzeichnis
+            database: Datenbankname
+            
+        Returns:
+            (csv_path, json_path) tuple
+        """
         # Step 1: Find matching articles (by title + authors)
-        matched_articles = self._find_matches(results_a, results_b)
+        counts = {'a': 0, 'b': 0}
+        matched_articles = self._find_matches(self._counted(articles_a, counts, 'a'),
+                                              self._counted(articles_b, counts, 'b'))
+        self.logger.info(f"Geladen: {counts['a']} Artikel aus A, {counts['b']} aus B")
         self.logger.info(f"Schritt 1: {len(matched_articles)} übereinstimmende Artikel gefunden")
         
         # Step 2: Validate content (terms from both groups in title OR abstract)
@@ -67,40 +99,42 @@ class ResultMerger:
             self.logger.warning("Keine Artikel erfüllen die AND-Bedingungen")
             return (None, None)
     
-    def _load_json(self, filepath: Path) -> List[Dict[str, Any]]:
-        """Lädt Artikel aus JSON-Datei"""
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return data.get('articles', [])
+    def _load_json(self, filepath: Path, columns: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Lädt Artikel aus JSON-Datei (JSONL zeilenweise, Parquet nur angeforderte Spalten)"""
+        return FileHandler.iter_result_articles(filepath, columns)
+    
+    @staticmethod
+    def _counted(articles: Iterable[Dict], counts: Dict[str, int], key: str) -> Iterator[Dict]:
+        """Zählt die durchlaufenen Artikel eines Streams in counts[key]"""
+        for article in articles:
+            counts[key] += 1
+            yield article
+    
+    @staticmethod
+    def _match_key(article: Dict) -> Tuple[str, str]:
+        """Vergleichsschlüssel (title, authors), normalisiert"""
+        return ((article.get('title') or '').lower().strip(),
+                (article.get('authors') or '').lower().strip())
     
     def _find_matches(self, 
-                     results_a: List[Dict],
-                     results_b: List[Dict]) -> List[Dict]:
+                     results_a: Iterable[Dict],
+                     results_b: Iterable[Dict]) -> List[Dict]:
         """
         Findet übereinstimmende Artikel (Title + Authors)
         
+        B wird einmal in eine Schlüsselmenge überführt, A dagegen
+        abgeglichen (Hash-Lookup statt Vergleich aller Paare).
+        
         Returns:
             Liste von Artikeln die in BEIDEN Listen vorkommen
         """
-        matched = []
+        keys_b = {self._match_key(article_b) for article_b in results_b}
         
-        for article_a in results_a:
-            title_a = (article_a.get('title') or '').lower().strip()
-            authors_a = (article_a.get('authors') or '').lower().strip()
-            
-            for article_b in results_b:
-                title_b = (article_b.get('title') or '').lower().strip()
-                authors_b = (article_b.get('authors') or '').lower().strip()
-                
-                # Match by title AND authors
-                if title_a == title_b and authors_a == authors_b:
-                    matched.append(article_a)
-                    break
-        
-        return matched
+        # Match by title AND authors
+        return [article_a for article_a in results_a if self._match_key(article_a) in keys_b]
     
     def _validate_content(self,
-                         articles: List[Dict],
+                         articles: Iterable[Dict],
                          terms_a: List[str],
                          terms_b: List[str]) -> List[Dict]:
         """
@@ -129,7 +163,7 @@ class ResultMerger:
         
         return validated
     
-    def _deduplicate(self, articles: List[Dict]) -> List[Dict]:
+    def _deduplicate(self, articles: Iterable[Dict]) -> List[Dict]:
         """
         Entfernt Duplikate basierend auf (authors, title)
         
@@ -164,18 +198,14 @@ class ResultMerger:
         # Ensure output directory exists
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        # CSV- und JSON-Unterverzeichnisse erstellen
+        # CSV-Unterverzeichnis erstellen
         csv_dir = output_dir / "csv"
-        json_dir = output_dir / "json"
         csv_dir.mkdir(parents=True, exist_ok=True)
-        json_dir.mkdir(parents=True, exist_ok=True)
+        csv_file = Exporter.output_file(csv_dir, f"{database}_{timestamp}.csv")
         
-        # File paths
-        csv_file = csv_dir / f"{database}_{timestamp}.csv"
-        json_file = json_dir / f"{database}_{timestamp}.json"
-        
-        # Export CSV
-        with open(csv_file, 'w', newline='', encoding='utf-8') as f:
+        # Export CSV (komprimiert nach Settings.OUTPUT_COMPRESSION)
+        with FileHandler.open_text_writer(csv_file, FileHandler.compression_of(csv_file),
+                                          Settings.OUTPUT_COMPRESSION_LEVEL) as f:
             fieldnames = ['authors', 'title', 'year', 'doi', 'url', 'abstract']
             writer = csv.DictWriter(f, fieldnames=fieldnames)
             writer.writeheader()
@@ -190,25 +220,22 @@ class ResultMerger:
                     'abstract': article.get('abstract', 'N/A')
                 })
         
-        # Export JSON
-        data = {
-            "metadata": {
-                "database": database,
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "total_results": len(articles),
-                "query_type": "AND merge",
-                "version": "1.0.0"
-            },
-            "articles": articles
-        }
-        
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # Export JSON/JSONL/Parquet (Format nach Settings.OUTPUT_FORMAT)
+        with Exporter.result_writer(output_dir, f"{database}_{timestamp}", {
+            "database": database,
+            "timestamp": None,  # beim Abschluss gesetzt
+            "total_results": 0,
+            "query_type": "AND merge",
+            "version": "1.0.0"
+        }) as json_writer:
+            for article in articles:
+                json_writer.write(article)
+        json_file = json_writer.path
         
         csv_size = csv_file.stat().st_size / 1024
         json_size = json_file.stat().st_size / 1024
         
-        self.logger.info(f"✓ CSV exportiert: {csv_file} ({csv_size:.1f} KB)")
-        self.logger.info(f"✓ JSON exportiert: {json_file} ({json_size:.1f} KB)")
+        self.logger.info(f"✓ {Exporter.format_label(csv_file)} exportiert: {csv_file} ({csv_size:.1f} KB)")
+        self.logger.info(f"✓ {Exporter.format_label(json_file)} exportiert: {json_file} ({json_size:.1f} KB)")
         
         return (csv_file, json_file)
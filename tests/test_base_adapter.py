@@ -0,0 +1,74 @@
+"""Tests für Retries mit Retry-After (src/databases/base_adapter.py)"""
+
+import asyncio
+import logging
+
+import pytest
+import requests
+
+from src.config.settings import Settings
+from src.databases.base_adapter import BaseAdapter
+
+
+class DummyAdapter(BaseAdapter):
+    """Adapter ohne Rate Limit, nur für _with_retries"""
+
+    def _iter_pages(self, query, limit, checkpoint=None):
+        return iter(())
+
+    def delta_query(self, query, since):
+        return query
+
+    def _parse_response(self, response):
+        return []
+
+
+def rate_limited(retry_after):
+    response = requests.Response()
+    response.status_code = 429
+    response.headers['Retry-After'] = retry_after
+    return requests.HTTPError("429 Too Many Requests", response=response)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(asyncio, 'sleep', fake_sleep)
+    return delays
+
+
+def run_with_errors(adapter, errors):
+    calls = []
+
+    def request():
+        calls.append(1)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return 'ok'
+
+    return asyncio.run(adapter._with_retries('https://example.org/api', request)), len(calls)
+
+
+def test_retry_after_is_honoured_beyond_backoff_max(monkeypatch, sleeps):
+    monkeypatch.setattr(Settings, 'HTTP_BACKOFF_MAX', 60.0)
+    monkeypatch.setattr(Settings, 'HTTP_RETRY_AFTER_MAX', 300.0)
+    adapter = DummyAdapter(logging.getLogger('test_base_adapter'))
+
+    assert run_with_errors(adapter, [rate_limited('120')]) == ('ok', 2)
+    assert sleeps == [120.0]
+    assert adapter.retry_stats['backoff_seconds'] == 120.0
+
+
+def test_retry_after_above_limit_fails_without_retry(monkeypatch, sleeps):
+    monkeypatch.setattr(Settings, 'HTTP_RETRY_AFTER_MAX', 300.0)
+    adapter = DummyAdapter(logging.getLogger('test_base_adapter'))
+
+    with pytest.raises(requests.HTTPError):
+        run_with_errors(adapter, [rate_limited('3600')])
+
+    assert sleeps == []
+    assert adapter.retry_stats == {'retries': 0, 'backoff_seconds': 0.0, 'failed_requests': 1}
@@ -0,0 +1,180 @@
+"""Tests für die Deduplizierung (src/utils/deduplicator.py)"""
+
+import logging
+
+import pytest
+
+from src.utils.deduplicator import Deduplicator
+
+
+def make_article(authors='N/A', title='N/A', year='2020', doi='N/A', url='N/A',
+                 abstract='N/A', source_database='pubmed'):
+    return {'authors': authors, 'title': title, 'year': year, 'doi': doi, 'url': url,
+            'abstract': abstract, 'source_database': source_database}
+
+
+@pytest.fixture
+def deduplicator(tmp_path):
+    return Deduplicator(tmp_path, logging.getLogger('test_deduplicator'))
+
+
+def urls(articles):
+    return sorted(article['url'] for article in articles)
+
+
+# --- Unscharfe Duplikate (MinHash/LSH) ---
+
+def test_fuzzy_merges_erratum_pair(deduplicator):
+    a = make_article('Smith', 'Erratum', url='u1')
+    a2 = make_article('Smith John', 'Erratum', doi='10.1/x', url='u2')
+
+    assert len(deduplicator.deduplicate([a, a2], fuzzy=True)) == 1
+
+
+def test_fuzzy_unrelated_record_does_not_break_chain(deduplicator):
+    # U sortiert zwischen A und A' - darf deren Zusammenführung nicht verhindern
+    a = make_article('Smith', 'Erratum', url='u1')
+    unrelated = make_article('Zhang', 'Erratum', url='u3')
+    a2 = make_article('Smith John', 'Erratum', doi='10.1/x', url='u2')
+
+    result = deduplicator.deduplicate([a, unrelated, a2], fuzzy=True)
+
+    assert len(result) == 2
+    assert 'u3' in urls(result)
+
+
+def test_fuzzy_large_bucket_merges_within_author_groups(deduplicator):
+    # Großer Bucket (über FUZZY_FULL_BUCKET_SIZE): je zwei Artikel pro Autor
+    count = 4 * Deduplicator.FUZZY_FULL_BUCKET_SIZE
+    articles = [make_article(f"Author{i % (count // 2)} {'X' if i < count // 2 else 'Y'}", 'Erratum', url=f"u{i}")
+                for i in range(count)]
+
+    assert len(deduplicator.deduplicate(articles, fuzzy=True)) == count // 2
+
+
+# --- Identifikatoren (DOI/PMID/PMCID) ---
+
+def test_pmid_join_between_pubmed_and_europepmc_urls(deduplicator):
+    # Autoren-Schreibweise unterscheidet sich zwischen den Datenbanken
+    pubmed = make_article('Smith J', 'A study.', url='https://pubmed.ncbi.nlm.nih.gov/12345678/')
+    europepmc = make_article('Smith, John', 'A Study', url='https://europepmc.org/article/MED/12345678',
+                             source_database='europepmc')
+    other = make_article('Smith J', 'Another study', url='https://pubmed.ncbi.nlm.nih.gov/87654321/')
+
+    result = deduplicator.deduplicate([europepmc, pubmed, other])
+
+    assert urls(result) == ['https://pubmed.ncbi.nlm.nih.gov/12345678/',
+                            'https://pubmed.ncbi.nlm.nih.gov/87654321/']
+
+
+def test_pmcid_join_between_pmc_and_europepmc_urls(deduplicator):
+    pmc = make_article('Smith J', 'A', url='https://www.ncbi.nlm.nih.gov/pmc/articles/PMC555/')
+    europepmc = make_article('Smith, John', 'B', url='https://europepmc.org/article/PMC/PMC555',
+                             source_database='europepmc')
+
+    assert len(deduplicator.deduplicate([pmc, europepmc])) == 1
+
+
+def test_identifier_join_never_merges_two_dois(deduplicator):
+    # B (ohne DOI) teilt die PMID mit A und C - A und C haben verschiedene DOIs
+    a = make_article('Smith', 'A', doi='10.1/a', url='https://pubmed.ncbi.nlm.nih.gov/1/')
+    b = make_article('Smith, J', 'B', url='https://europepmc.org/article/MED/1', source_database='europepmc')
+    c = make_article('Smith J', 'C', doi='10.1/b', url='https://europepmc.org/abstract/MED/1',
+                     source_database='europepmc')
+
+    result = deduplicator.deduplicate([a, b, c])
+
+    assert sorted(article['doi'] for article in result) == ['10.1/a', '10.1/b']
+
+
+# --- Jahr-Konflikte (DOI → URL → Abstract) ---
+
+ABSTRACT = 'alpha beta gamma delta epsilon zeta eta theta iota kappa lambda mu'
+ABSTRACT_SIMILAR = 'alpha beta gamma delta epsilon zeta eta theta iota kappa lambda nu'  # Jaccard 0.85
+ABSTRACT_OTHER = 'alpha beta gamma delta epsilon zeta omicron pi rho sigma tau upsilon'
+
+
+def baseline_are_duplicates(article1, article2):
+    """Regel der ursprünglichen _are_duplicates_despite_year_difference"""
+    doi1, doi2 = (article1.get('doi') or '').strip(), (article2.get('doi') or '').strip()
+    if doi1 and doi2 and doi1 != 'N/A' and doi2 != 'N/A':
+        return doi1.lower() == doi2.lower()
+
+    url1, url2 = (article1.get('url') or '').strip(), (article2.get('url') or '').strip()
+    if url1 and url2 and url1 != 'N/A' and url2 != 'N/A':
+        return url1.lower() == url2.lower()
+
+    abstract1 = Deduplicator.normalize_abstract(article1.get('abstract') or '')
+    abstract2 = Deduplicator.normalize_abstract(article2.get('abstract') or '')
+    if abstract1 and abstract2:
+        return Deduplicator.text_similarity(abstract1, abstract2) > 0.80
+    return False
+
+
+def test_year_conflict_pairs_match_baseline_rule(deduplicator):
+    variants = [make_article('Smith', 'T', doi=doi, url=url, abstract=abstract)
+                for doi in ('N/A', '', '10.1/A', '10.1/a', '10.1/b')
+                for url in ('N/A', 'u1', 'U1 ', 'u2')
+                for abstract in ('N/A', ABSTRACT, ABSTRACT_SIMILAR, ABSTRACT_OTHER)]
+    pairs = [(left, right) for left in variants for right in variants]
+
+    # Alle Paare in einem Aufruf (gemeinsamer Abstract-Batch über alle Gruppen)
+    clusters = deduplicator._cluster_year_conflicts([[dict(left, year='2020'), dict(right, year='2021')]
+                                                     for left, right in pairs])
+
+    mismatches = [(left, right) for (left, right), cluster in zip(pairs, clusters)
+                  if (cluster.find(0) == cluster.find(1)) != baseline_are_duplicates(left, right)]
+    assert not mismatches
+
+
+def test_year_conflict_rule_order(deduplicator):
+    def is_duplicate(left, right):
+        cluster, = deduplicator._cluster_year_conflicts([[dict(left, year='2020'), dict(right, year='2021')]])
+        return cluster.find(0) == cluster.find(1)
+
+    # DOI entscheidet vor URL und Abstract
+    assert is_duplicate(make_article(doi='10.1/a', url='u1'), make_article(doi='10.1/A', url='u2'))
+    assert not is_duplicate(make_article(doi='10.1/a', url='u1', abstract=ABSTRACT),
+                            make_article(doi='10.1/b', url='u1', abstract=ABSTRACT))
+    # URL entscheidet vor Abstract (eine Seite ohne DOI)
+    assert is_duplicate(make_article(doi='10.1/a', url='u1'), make_article(url='U1'))
+    assert not is_duplicate(make_article(url='u1', abstract=ABSTRACT), make_article(url='u2', abstract=ABSTRACT))
+    # Abstract nur, wenn weder DOI noch URL auf beiden Seiten vorhanden sind
+    assert is_duplicate(make_article(doi='10.1/a', abstract=ABSTRACT), make_article(url='u1', abstract=ABSTRACT_SIMILAR))
+    assert not is_duplicate(make_article(abstract=ABSTRACT), make_article(abstract=ABSTRACT_OTHER))
+
+
+def test_year_conflict_transitive_chain(deduplicator):
+    # A ~ B über die URL (A ohne DOI), B ~ C über die DOI, A und C direkt nicht
+    a = make_article('Smith', 'T', year='2020', url='u1')
+    b = make_article('Smith', 'T', year='2021', doi='10.1/a', url='u1')
+    c = make_article('Smith', 'T', year='2022', doi='10.1/a', url='u2')
+    assert not baseline_are_duplicates(a, c)
+
+    cluster, = deduplicator._cluster_year_conflicts([[a, b, c]])
+
+    assert cluster.find(0) == cluster.find(1) == cluster.find(2)
+
+
+def test_year_conflict_chain_through_record_without_doi(deduplicator):
+    # B (ohne DOI) ist Duplikat von A und C - A und C haben verschiedene DOIs
+    a = make_article('Smith', 'T', year='2020', doi='10.1/a', url='u1', abstract=ABSTRACT)
+    b = make_article('Smith', 'T', year='2021', url='u1', abstract=ABSTRACT)
+    c = make_article('Smith', 'T', year='2022', doi='10.1/b', url='u1', abstract=ABSTRACT)
+
+    cluster, = deduplicator._cluster_year_conflicts([[a, b, c]])
+    assert cluster.find(0) != cluster.find(2)
+
+    result = deduplicator.deduplicate([a, b, c])
+    assert sorted(article['doi'] for article in result) == ['10.1/a', '10.1/b']
+
+
+def test_union_find_keeps_labelled_sets_apart():
+    from src.utils.deduplicator import _UnionFind
+
+    clusters = _UnionFind(4, ['doi:a', '', 'doi:b', 'doi:a'])
+
+    assert clusters.union(0, 1)
+    assert not clusters.union(1, 2)  # Label von {0, 1} ist doi:a
+    assert clusters.union(3, 1)
+    assert clusters.find(0) == clusters.find(3) != clusters.find(2)
@@ -0,0 +1,101 @@
+"""Tests für das inkrementelle Lesen von JSON-Ergebnisdateien (src/utils/file_handler.py)"""
+
+import io
+import json
+
+import pytest
+
+from src.utils.file_handler import _JsonStreamReader
+
+
+ARTICLES = [
+    {'title': 'Quote " and backslash \\ inside', 'year': '2020'},
+    {'title': 'Unicode éè and emoji \U0001F600', 'abstract': 'Line\nbreak\ttab'},
+    {'numbers': [0, -1, 12345678901234567890, 3.14159, -2.5e-10, 1E+3], 'flags': [True, False, None]},
+    {'nested': {'authors': ['A', 'B'], 'empty': {}, 'list': []}},
+    12345,
+    'plain string',
+]
+
+
+def read_items(text, key='articles', chunk_size=None, monkeypatch=None):
+    if chunk_size is not None:
+        monkeypatch.setattr(_JsonStreamReader, 'CHUNK_SIZE', chunk_size)
+    return list(_JsonStreamReader(io.StringIO(text)).iter_items(key))
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 64])
+@pytest.mark.parametrize('indent', [None, 2])
+def test_chunk_boundaries_inside_strings_numbers_and_escapes(monkeypatch, chunk_size, indent):
+    # ensure_ascii=True erzeugt \uXXXX-Escapes (inkl. Surrogatpaare), die über Chunks verteilt werden
+    for ensure_ascii in (True, False):
+        text = json.dumps({'metadata': {'total_results': 6}, 'articles': ARTICLES, 'after': [1.5, 'x']},
+                          indent=indent, ensure_ascii=ensure_ascii)
+        assert read_items(text, chunk_size=chunk_size, monkeypatch=monkeypatch) == ARTICLES
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 1024])
+def test_number_at_end_of_chunk_is_not_cut(monkeypatch, chunk_size):
+    text = '{"articles":[1234567,89.0125,-3e5]}'
+    assert read_items(text, chunk_size=chunk_size, monkeypatch=monkeypatch) == [1234567, 89.0125, -3e5]
+
+
+@pytest.mark.parametrize('text', [
+    '{"articles": []}',
+    '{"articles":[ ] , "metadata": {"total_results": 0}}',
+    '{}',
+    '{"metadata": {"total_results": 0}}',
+    '{"metadata": {}, "other": [1, 2]}',
+])
+def test_empty_array_or_missing_key(text):
+    assert read_items(text) == []
+
+
+def test_key_with_non_array_value_is_skipped():
+    assert read_items('{"articles": {"a": 1}, "x": 2}') == []
+
+
+@pytest.mark.parametrize('chunk_size', [1, 5, 1024])
+def test_truncated_file_raises(monkeypatch, chunk_size):
+    text = json.dumps({'articles': ARTICLES[:3], 'metadata': {'total_results': 3}})
+    for end in range(len(text)):
+        with pytest.raises(ValueError):
+            read_items(text[:end], chunk_size=chunk_size, monkeypatch=monkeypatch)
+
+
+@pytest.mark.parametrize('text', [
+    '[1, 2]',
+    '{"articles": [1 2]}',
+    '{"articles": [1,, 2]}',
+    '{"articles" [1]}',
+    '{"articles": [{"title": "x"]}',
+])
+def test_invalid_json_raises(text):
+    with pytest.raises(ValueError):
+        read_items(text)
+
+
+class CountingReader(io.StringIO):
+    """StringIO, das die Anzahl gelesener Zeichen zählt"""
+
+    def __init__(self, text):
+        super().__init__(text)
+        self.chars_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.chars_read += len(data)
+        return data
+
+
+def test_invalid_value_stops_after_bounded_look_ahead(monkeypatch):
+    monkeypatch.setattr(_JsonStreamReader, 'CHUNK_SIZE', 1024)
+    monkeypatch.setattr(_JsonStreamReader, 'MAX_VALUE_SIZE', 16 * 1024)
+    # Unterminierter String, danach viel weiterer Inhalt
+    text = '{"articles": [{"title": "unterminated' + 'x' * (1024 * 1024)
+    f = CountingReader(text)
+
+    with pytest.raises(ValueError):
+        list(_JsonStreamReader(f).iter_items('articles'))
+
+    assert f.chars_read < 64 * 1024
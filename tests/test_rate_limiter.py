@@ -0,0 +1,65 @@
+"""Tests für das prozessübergreifende Rate Limiting (src/databases/rate_limiter.py)"""
+
+import multiprocessing
+import time
+
+import pytest
+
+from src.databases import rate_limiter
+from src.databases.rate_limiter import TokenBucketLimiter
+
+
+RATE = 5.0  # Requests pro Sekunde → Slots im Abstand von 0.2 s
+RESERVATIONS = 5
+
+
+def reserve_slots(number, state_dir, rate, start, queue):
+    """Reserviert RESERVATIONS Tokens und meldet die gebuchten Startzeitpunkte"""
+    limiter = TokenBucketLimiter('eutils.ncbi.nlm.nih.gov|key', rate, state_dir=state_dir)
+    start.wait()
+    queue.put((number, [time.time() + limiter.reserve() for _ in range(RESERVATIONS)]))
+
+
+def run_processes(state_dir, rates):
+    context = multiprocessing.get_context('spawn')
+    start, queue = context.Event(), context.Queue()
+    processes = [context.Process(target=reserve_slots, args=(number, state_dir, rate, start, queue))
+                 for number, rate in enumerate(rates)]
+    for process in processes:
+        process.start()
+    start.set()
+    slots = dict(queue.get(timeout=30) for _ in processes)  # Reihenfolge der Fertigstellung
+    for process in processes:
+        process.join(timeout=30)
+        assert process.exitcode == 0
+    return [slots[number] for number in range(len(processes))]
+
+
+@pytest.mark.skipif(rate_limiter.fcntl is None, reason="Zustandsdatei braucht fcntl")
+def test_two_processes_share_one_budget(tmp_path):
+    slots = sorted(slot for process_slots in run_processes(tmp_path, [RATE, RATE])
+                   for slot in process_slots)
+
+    # Ein gemeinsamer Bucket: alle 2 * RESERVATIONS Slots im Abstand von 1/RATE
+    gaps = [right - left for left, right in zip(slots, slots[1:])]
+    assert min(gaps) >= 1.0 / RATE - 0.01
+    assert len(list(tmp_path.glob('*.bucket'))) == 1
+
+
+@pytest.mark.skipif(rate_limiter.fcntl is None, reason="Zustandsdatei braucht fcntl")
+def test_processes_with_different_rates_use_separate_buckets(tmp_path):
+    fast, slow = run_processes(tmp_path, [2 * RATE, RATE])
+
+    # Jeder Prozess hält nur seine eigene Rate ein
+    assert [round(right - left, 2) for left, right in zip(fast, fast[1:])] == [1.0 / (2 * RATE)] * (RESERVATIONS - 1)
+    assert [round(right - left, 2) for left, right in zip(slow, slow[1:])] == [1.0 / RATE] * (RESERVATIONS - 1)
+    assert len(list(tmp_path.glob('*.bucket'))) == 2
+
+
+def test_state_file_depends_on_rate_and_burst(tmp_path):
+    key = 'api.openalex.org|mail@example.org'
+    files = {TokenBucketLimiter(key, rate, burst, state_dir=tmp_path).state_file
+             for rate, burst in [(10.0, 1.0), (3.0, 1.0), (10.0, 4.0)]}
+
+    assert len(files) == 3
+    assert TokenBucketLimiter(key, 10.0, 1.0, state_dir=tmp_path).state_file in files